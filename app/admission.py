@@ -0,0 +1,125 @@
+"""
+Admission control - Job Interview Management System
+
+Each limited route has its own concurrency limit and a bounded wait queue.
+A request that finds the queue full, or that waits longer than
+``ADMISSION_MAX_WAIT_SECONDS``, is rejected at once with 503 and a
+``Retry-After`` header instead of piling up on the event loop and the
+database connection.
+
+Routes belong to a class:
+- ``READ``: expensive reads such as the full candidate listing. Small
+  limits, so a burst of them can't take over the worker.
+- ``WRITE``: inserts and updates. Generous limits of their own, so they are
+  never queued behind expensive reads.
+Health checks and cheap point lookups are not limited at all.
+
+Queue depths and rejection counts are exposed at GET /admin/admission.
+"""
+import asyncio
+from collections import deque
+from typing import AsyncGenerator, Callable, Deque, Dict
+
+from fastapi import HTTPException, status
+
+from app import config
+
+READ = "read"
+WRITE = "write"
+
+
+class Overloaded(Exception):
+    """The route's wait queue is full or the wait took too long"""
+
+
+class Limiter:
+    """Concurrency limit with a bounded FIFO queue of waiting requests"""
+
+    def __init__(self, name: str, kind: str, max_concurrency: int, max_queue: int):
+        self.name = name
+        self.kind = kind
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float) -> None:
+        if self.active < self.max_concurrency and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded(self.name)
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            # A released slot is handed over by resolving the future
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._remove(future)
+            self.rejected += 1
+            raise Overloaded(self.name)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                self._remove(future)
+            raise
+        self.admitted += 1
+
+    def release(self) -> None:
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                # The slot goes straight to the next waiter
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def _remove(self, future: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(future)
+        except ValueError:
+            pass
+
+
+limiters: Dict[str, Limiter] = {}
+
+
+def _limits(kind: str):
+    if kind == WRITE:
+        return config.ADMISSION_WRITE_CONCURRENCY, config.ADMISSION_WRITE_QUEUE
+    return config.ADMISSION_READ_CONCURRENCY, config.ADMISSION_READ_QUEUE
+
+
+# Dependency factory for FastAPI routes: dependencies=[Depends(admission("name", READ))]
+def admission(route: str, kind: str = READ) -> Callable[[], AsyncGenerator[None, None]]:
+    limiter = limiters[route] = Limiter(route, kind, *_limits(kind))
+
+    async def admit() -> AsyncGenerator[None, None]:
+        if not config.ADMISSION_ENABLED:
+            yield
+            return
+        try:
+            await limiter.acquire(config.ADMISSION_MAX_WAIT_SECONDS)
+        except Overloaded:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry",
+                headers={"Retry-After": str(config.ADMISSION_RETRY_AFTER_SECONDS)}
+            )
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    return admit
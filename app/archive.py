@@ -0,0 +1,113 @@
+"""
+Hot/cold tiering of candidates - Job Interview Management System
+
+HIRED and REJECTED candidates whose status hasn't changed for
+``ARCHIVE_AFTER_DAYS`` are moved out of the hot tables (candidates,
+interviews, feedback, candidate_timelines) into ``archived_candidates``. Each
+archived candidate is one row holding the full detail document: interviews,
+feedback and timeline. The hot tables, their indexes and the listing's
+selectinload IN-lists then grow with the active pipeline only.
+
+- GET /candidates reads the cold tier only with ``include_archived=true``.
+- GET /candidates/{id} falls back to the archive, so links keep working.
+- Archived candidates are read-only; updates and deletes answer 404.
+- Their emails stay taken: creating a candidate checks both tiers.
+- Archiving records a ``candidate.archived`` change for downstream syncs.
+
+Archival runs as a maintenance job (app/maintenance.py) in one worker, one
+``run_write`` transaction per batch, and on POST /admin/archive.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.changes import record_change
+from app.db import run_write
+from app.existence import CANDIDATES, record_deleted
+from app.models.archive import ArchivedCandidate
+from app.models.candidate import Candidate, CandidateStatus
+from app.models.feedback import Feedback
+from app.models.interview import Interview
+from app.models.timeline import CandidateTimeline
+from app.schemas.candidate import CandidateDetailResponse, CandidateResponse
+
+CLOSED_STATUSES = (CandidateStatus.HIRED, CandidateStatus.REJECTED)
+
+
+async def delete_candidate_rows(db: AsyncSession, candidate_id: uuid.UUID) -> None:
+    """Delete a candidate's feedback, interviews and timeline, then the candidate"""
+    interview_ids = select(Interview.id).where(Interview.candidate_id == candidate_id)
+    await db.execute(delete(Feedback).where(Feedback.interview_id.in_(interview_ids)))
+    await db.execute(delete(Interview).where(Interview.candidate_id == candidate_id))
+    await db.execute(delete(CandidateTimeline).where(CandidateTimeline.candidate_id == candidate_id))
+    await db.execute(delete(Candidate).where(Candidate.id == candidate_id))
+    record_deleted(db, CANDIDATES, candidate_id)
+
+
+async def _archive_batch(db: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+    result = await db.execute(
+        select(Candidate)
+        .where(Candidate.status.in_(CLOSED_STATUSES), Candidate.updated_at < cutoff)
+        .options(selectinload(Candidate.interviews).selectinload(Interview.feedback))
+        .order_by(Candidate.updated_at)
+        .limit(batch_size)
+    )
+    candidates = result.scalars().all()
+    if not candidates:
+        return 0
+
+    result = await db.execute(
+        select(CandidateTimeline)
+        .where(CandidateTimeline.candidate_id.in_([candidate.id for candidate in candidates]))
+    )
+    documents = {timeline.candidate_id: timeline.document for timeline in result.scalars()}
+
+    for candidate in candidates:
+        document = documents.get(candidate.id)
+        if document is None:
+            # Candidate from before timelines existed: keep what the tables know
+            document = CandidateDetailResponse.model_validate(candidate).model_dump_json()
+        db.add(ArchivedCandidate(
+            candidate_id=candidate.id,
+            email=candidate.email,
+            status=candidate.status,
+            created_at=candidate.created_at,
+            document=document
+        ))
+        await delete_candidate_rows(db, candidate.id)
+        record_change(db, "candidate.archived", candidate.id, {"id": str(candidate.id)})
+
+    return len(candidates)
+
+
+async def archive_closed_candidates(db: AsyncSession, older_than_days: float, batch_size: int = 500) -> int:
+    """Move closed candidates into the cold tier, one transaction per batch; returns how many moved"""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    total = 0
+    while True:
+        moved = await run_write(db, lambda session: _archive_batch(session, cutoff, batch_size))
+        total += moved
+        if moved < batch_size:
+            return total
+
+
+async def load_archived(db: AsyncSession, candidate_id: uuid.UUID) -> Optional[str]:
+    """Detail document of an archived candidate, or None"""
+    archived = await db.get(ArchivedCandidate, candidate_id)
+    return archived.document if archived is not None else None
+
+
+async def list_archived(db: AsyncSession) -> List[Tuple[datetime, CandidateResponse]]:
+    """Archived candidates, oldest first, with their creation time as stored in the table"""
+    result = await db.execute(
+        select(ArchivedCandidate.created_at, ArchivedCandidate.document)
+        .order_by(ArchivedCandidate.created_at)
+    )
+    return [
+        (created_at, CandidateResponse.model_validate_json(document))
+        for created_at, document in result.all()
+    ]
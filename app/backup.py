@@ -0,0 +1,329 @@
+"""
+Online backups - Job Interview Management System
+
+Copying ``candidates.db`` while it is being written can produce a corrupt
+copy. Backups therefore go through SQLite itself, on a pooled connection,
+while the service keeps running:
+
+- ``backup`` uses SQLite's online backup API and copies
+  ``BACKUP_PAGES_PER_STEP`` pages at a time. It pauses
+  ``BACKUP_STEP_PAUSE_MS`` between steps so writers can take the lock in
+  between. File databases are copied through a connection and thread of
+  their own, so neither the event loop nor a pooled connection waits for the
+  copy. SQLite restarts the copy if another connection writes during it, so
+  the file is always a consistent snapshot.
+- ``snapshot`` runs ``VACUUM INTO``, which writes a compacted copy without
+  free pages. It takes longer on a busy database but gives the smallest file,
+  which is useful for seeding benchmarks (``benchmarks.write_queue --snapshot``).
+
+Files are written to ``BACKUP_DIR`` (``BACKUP_DIR/tenants/<tenant>`` for
+tenant databases) as ``candidates-<time>-<id>.db``. They get their final
+name only once they are complete, and the newest ``BACKUP_KEEP`` files per
+directory are kept. Jobs run in the background; their progress is at
+GET /admin/backups/{id}, which reports the file name but not the server's
+directory. The scheduled backup runs in one worker only.
+
+Job state lives in ``BACKUP_DIR/jobs/<id>.json`` and a running job holds
+``BACKUP_DIR/backup.lock``, so every worker sees every job and only one
+backup runs at a time across workers. A lock or a running job left behind
+by a process that died is ignored (and the job reported as failed).
+"""
+import asyncio
+import glob
+import json
+import os
+import re
+import sqlite3
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional, Set
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app import config
+
+BACKUP = "backup"
+SNAPSHOT = "snapshot"
+
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Job state files kept
+MAX_JOBS = 20
+
+# How often a running job's progress is written for other workers
+PROGRESS_SAVE_SECONDS = 0.5
+
+JOB_ID = re.compile(r"^[0-9a-f]{8}$")
+
+
+class BackupInProgress(Exception):
+    """Another backup job is still running"""
+
+
+@dataclass
+class BackupJob:
+    kind: str
+    path: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+    status: str = RUNNING
+    pages_total: int = 0
+    pages_remaining: int = 0
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    # Process running the job
+    pid: int = field(default_factory=os.getpid)
+
+    @property
+    def file(self) -> str:
+        """Name of the backup file inside its backup directory"""
+        return os.path.basename(self.path)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of pages copied (snapshots only report 0 or 1)"""
+        if self.status == DONE:
+            return 1.0
+        if not self.pages_total:
+            return 0.0
+        return (self.pages_total - self.pages_remaining) / self.pages_total
+
+
+# Keeps running jobs' tasks referenced until they finish
+_tasks: Set[asyncio.Task] = set()
+
+
+def _jobs_dir() -> str:
+    return os.path.join(config.BACKUP_DIR, "jobs")
+
+
+def _lock_path() -> str:
+    return os.path.join(config.BACKUP_DIR, "backup.lock")
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _save(job: BackupJob) -> None:
+    """Write the job's state file; readers never see a partial one"""
+    state = asdict(job)
+    for name in ("started_at", "finished_at"):
+        if state[name] is not None:
+            state[name] = state[name].isoformat()
+    path = os.path.join(_jobs_dir(), f"{job.id}.json")
+    with open(path + ".tmp", "w") as file:
+        json.dump(state, file)
+    os.replace(path + ".tmp", path)
+
+
+def _load(path: str) -> Optional[BackupJob]:
+    try:
+        with open(path) as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return None
+    for name in ("started_at", "finished_at"):
+        if state[name] is not None:
+            state[name] = datetime.fromisoformat(state[name])
+    job = BackupJob(**state)
+    if job.status == RUNNING and not _alive(job.pid):
+        job.status = FAILED
+        job.error = "Interrupted"
+    return job
+
+
+def _acquire_lock(job: BackupJob) -> None:
+    """Take the cross-worker backup lock for ``job``; raises BackupInProgress"""
+    for _ in range(2):
+        try:
+            fd = os.open(_lock_path(), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                with open(_lock_path()) as file:
+                    pid = int(file.read().split()[0])
+            except (OSError, ValueError, IndexError):
+                # Being written by the worker that just took it
+                raise BackupInProgress()
+            if _alive(pid):
+                raise BackupInProgress()
+            # Left behind by a worker that died mid-backup
+            try:
+                os.remove(_lock_path())
+            except FileNotFoundError:
+                pass
+            continue
+        with os.fdopen(fd, "w") as file:
+            file.write(f"{job.pid} {job.id}")
+        return
+    raise BackupInProgress()
+
+
+def _release_lock() -> None:
+    try:
+        os.remove(_lock_path())
+    except FileNotFoundError:
+        pass
+
+
+def _copy_file(database: str, path: str, pages: int, progress) -> None:
+    # Both connections are used on this thread only
+    source = sqlite3.connect(database)
+    target = sqlite3.connect(path)
+    try:
+        source.backup(target, pages=pages, progress=progress)
+    finally:
+        target.close()
+        source.close()
+
+
+async def backup_database(
+    engine: AsyncEngine,
+    path: str,
+    job: Optional[BackupJob] = None,
+    pages_per_step: int = 256,
+    pause_seconds: float = 0.005,
+) -> None:
+    """Copy the database behind ``engine`` to ``path`` with the online backup API"""
+    database = make_url(str(engine.url)).database
+    on_file = bool(database) and database != ":memory:" and not database.startswith("file:")
+
+    def step(status: int, remaining: int, total: int) -> None:
+        # Called on the copying thread after every step
+        if job is not None:
+            job.pages_remaining = remaining
+            job.pages_total = total
+        # Only the backup's own thread and connection wait here
+        if on_file and remaining and pause_seconds:
+            time.sleep(pause_seconds)
+
+    if on_file:
+        await asyncio.to_thread(_copy_file, database, path, pages_per_step, step)
+        return
+    # An in-memory database is only reachable through the pool's connection;
+    # it is small, so it is copied without pauses
+    target = sqlite3.connect(path, check_same_thread=False)
+    try:
+        async with engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.backup(target, pages=pages_per_step, progress=step)
+    finally:
+        target.close()
+
+
+async def snapshot_database(engine: AsyncEngine, path: str) -> None:
+    """Write a compacted copy of the database behind ``engine`` to ``path``"""
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.execute("VACUUM INTO ?", (path,))
+
+
+def _prune(directory: str, keep: int) -> None:
+    for old in sorted(glob.glob(os.path.join(directory, "candidates-*.db")))[:-keep]:
+        os.remove(old)
+
+
+async def _report_progress(job: BackupJob) -> None:
+    while True:
+        await asyncio.sleep(PROGRESS_SAVE_SECONDS)
+        _save(job)
+
+
+async def _run(job: BackupJob, engine: AsyncEngine) -> None:
+    partial = job.path + ".partial"
+    reporter = asyncio.create_task(_report_progress(job))
+    try:
+        if os.path.exists(partial):
+            os.remove(partial)
+        if job.kind == SNAPSHOT:
+            await snapshot_database(engine, partial)
+        else:
+            await backup_database(
+                engine,
+                partial,
+                job,
+                pages_per_step=config.BACKUP_PAGES_PER_STEP,
+                pause_seconds=config.BACKUP_STEP_PAUSE_MS / 1000,
+            )
+        os.replace(partial, job.path)
+        job.status = DONE
+    except Exception as exc:
+        job.status = FAILED
+        job.error = str(exc)
+        if os.path.exists(partial):
+            os.remove(partial)
+    finally:
+        reporter.cancel()
+        job.finished_at = datetime.now(timezone.utc)
+        _save(job)
+        _release_lock()
+
+    if job.status == DONE and config.BACKUP_KEEP > 0:
+        _prune(os.path.dirname(job.path), config.BACKUP_KEEP)
+
+
+def start_backup(engine: AsyncEngine, kind: str = BACKUP, tenant: Optional[str] = None) -> BackupJob:
+    """Start a backup job in the background; one at a time across workers"""
+    directory = config.BACKUP_DIR if tenant is None else os.path.join(config.BACKUP_DIR, "tenants", tenant)
+    os.makedirs(directory, exist_ok=True)
+    os.makedirs(_jobs_dir(), exist_ok=True)
+    job = BackupJob(kind=kind, path="")
+    stamp = job.started_at.strftime("%Y%m%d-%H%M%S")
+    job.path = os.path.join(directory, f"candidates-{stamp}-{job.id}.db")
+
+    _acquire_lock(job)
+    try:
+        _save(job)
+        for old in _job_files()[MAX_JOBS:]:
+            os.remove(old)
+    except Exception:
+        _release_lock()
+        raise
+
+    task = asyncio.get_running_loop().create_task(_run(job, engine))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+async def run_scheduled_backups(interval_seconds: float) -> None:
+    """Back up the default database every ``interval_seconds`` until cancelled"""
+    from app import db
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            start_backup(db.engine)
+        except BackupInProgress:
+            pass
+
+
+def _job_files() -> List[str]:
+    """State files, newest first"""
+    paths = glob.glob(os.path.join(_jobs_dir(), "*.json"))
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+
+def get_job(job_id: str) -> Optional[BackupJob]:
+    """A job started by any worker, or None when it is unknown"""
+    if not JOB_ID.match(job_id):
+        return None
+    return _load(os.path.join(_jobs_dir(), f"{job_id}.json"))
+
+
+def recent_jobs() -> List[BackupJob]:
+    """Jobs still remembered, newest first"""
+    jobs = [_load(path) for path in _job_files()[:MAX_JOBS]]
+    jobs = [job for job in jobs if job is not None]
+    return sorted(jobs, key=lambda job: job.started_at, reverse=True)
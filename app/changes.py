@@ -0,0 +1,145 @@
+"""
+Change log - Job Interview Management System
+
+Every write route calls ``record_change`` inside its transaction, so the
+``changes`` outbox row commits or rolls back together with the write. That
+gives downstream systems a gap-free, ordered log to sync from
+(GET /changes?since=<seq>).
+
+GET /events is fed from the same table: while a worker has subscribers it
+tails the outbox, so they get every worker's changes in commit order. A
+commit in this worker wakes the tail right away; other workers' changes are
+read within ``EVENTS_POLL_SECONDS``. Event ids are the sequence numbers, so a
+client can resume from any worker.
+
+Changes older than ``CHANGES_RETENTION_DAYS`` are compacted away by a
+maintenance job (app/maintenance.py) every ``CHANGES_COMPACT_HOURS``.
+"""
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, event, func, inspect, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app import config
+from app.db import run_write
+from app.events import Event, EventHub, Subscription, existing_hub
+from app.models.change import Change
+from app.tenancy import session_tenant
+
+logger = logging.getLogger("app.changes")
+
+_PENDING = "pending_changes"
+
+
+def record_change(db: AsyncSession, change_type: str, entity_id: Any, payload: Dict[str, Any]) -> Change:
+    """Append a change to the outbox in the current transaction"""
+    change = Change(type=change_type, entity_id=str(entity_id), payload=json.dumps(payload))
+    db.add(change)
+    db.sync_session.info.setdefault(_PENDING, []).append(change)
+    return change
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_event_feed(session: Session) -> None:
+    pending = session.info.pop(_PENDING, ())
+    hub = existing_hub(session_tenant(session))
+    # Changes of a rolled back savepoint (a failed group commit operation) are gone
+    if hub is not None and any(inspect(change).persistent for change in pending):
+        hub.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_changes(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+async def _read_outbox(
+    session_maker: async_sessionmaker, last_event_id: Optional[str], limit: int
+) -> Tuple[int, Optional[List[Event]]]:
+    """The newest sequence number and up to ``limit`` events after ``last_event_id``
+
+    The events are None when ``last_event_id`` isn't a sequence number of
+    this outbox or the changes after it were compacted away.
+    """
+    async with session_maker() as db:
+        oldest, latest = (await db.execute(select(func.min(Change.seq), func.max(Change.seq)))).one()
+        latest = latest or 0
+        if not last_event_id or not last_event_id.isdigit():
+            return latest, None
+        after = int(last_event_id)
+        if after > latest or (oldest is not None and after + 1 < oldest):
+            return latest, None
+        result = await db.execute(
+            select(Change.seq, Change.type, Change.payload)
+            .where(Change.seq > after)
+            .order_by(Change.seq)
+            .limit(limit)
+        )
+        return latest, [
+            Event(id=str(seq), type=change_type, data=json.loads(payload))
+            for seq, change_type, payload in result
+        ]
+
+
+async def _tail_changes(hub: EventHub, session_maker: async_sessionmaker) -> None:
+    """Publish new outbox rows to ``hub`` until its last subscriber leaves"""
+    while hub.subscriber_count:
+        try:
+            async with session_maker() as db:
+                result = await db.execute(
+                    select(Change.seq, Change.type, Change.payload)
+                    .where(Change.seq > hub.sequence)
+                    .order_by(Change.seq)
+                    .limit(config.EVENTS_POLL_BATCH)
+                )
+                rows = result.all()
+        except OperationalError as exc:
+            logger.warning("Reading the change outbox failed: %s", exc)
+            rows = []
+        for seq, change_type, payload in rows:
+            hub.publish(seq, change_type, json.loads(payload))
+        if len(rows) < config.EVENTS_POLL_BATCH:
+            await hub.wait(config.EVENTS_POLL_SECONDS)
+
+
+async def subscribe_changes(
+    hub: EventHub, session_maker: async_sessionmaker, last_event_id: Optional[str] = None
+) -> Subscription:
+    """Subscribe to ``hub``, starting its outbox tail if nobody was following it
+
+    Events the hub no longer remembers (or never saw, when the client was
+    connected to another worker) are replayed from the outbox.
+    """
+    if hub.following and (not last_event_id or hub.can_replay(last_event_id)):
+        return hub.subscribe(last_event_id)
+    latest, backlog = await _read_outbox(session_maker, last_event_id, hub.buffer_size)
+    # Another subscriber may have started the tail meanwhile
+    if not hub.following:
+        hub.restart(latest)
+        hub.follow(_tail_changes(hub, session_maker))
+    return hub.subscribe(last_event_id, backlog)
+
+
+async def oldest_retained_seq(db: AsyncSession) -> int:
+    """Lowest sequence number still in the log (0 when it is empty)"""
+    result = await db.execute(select(func.min(Change.seq)))
+    return result.scalar() or 0
+
+
+async def compact_changes(db: AsyncSession, retention_days: float) -> int:
+    """Delete changes older than the retention period; returns rows removed
+
+    The newest change is always kept so clients can tell a compacted log from
+    an empty one.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    newest = select(func.max(Change.seq)).scalar_subquery()
+    result = await run_write(db, lambda session: session.execute(
+        delete(Change).where(Change.created_at < cutoff, Change.seq < newest)
+    ))
+    return result.rowcount
@@ -0,0 +1,186 @@
+"""
+Response compression - Job Interview Management System
+
+Responses above a size threshold are compressed with the best encoding the
+client accepts: zstd, brotli or gzip. zstd and brotli are used only when the
+optional ``zstandard`` and ``brotli`` packages are installed; gzip is always
+available.
+
+Compressed bodies are kept in a small LRU cache keyed by a digest of the
+uncompressed body and the encoding. Hot responses, such as an unchanged
+candidate listing or a stored timeline document, are therefore compressed
+once; later hits only cost the hash. Streaming responses (GET /events) are
+passed through untouched.
+"""
+import gzip
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_CACHE_ENTRIES,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MIN_SIZE,
+    COMPRESSION_ZSTD_LEVEL,
+)
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+Compressor = Callable[[bytes], bytes]
+
+
+def available_encodings(
+    gzip_level: int = COMPRESSION_GZIP_LEVEL,
+    brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+    zstd_level: int = COMPRESSION_ZSTD_LEVEL,
+) -> Dict[str, Compressor]:
+    """Compressors by content-coding, in order of preference"""
+    encodings: Dict[str, Compressor] = {}
+    if zstandard is not None:
+        encodings["zstd"] = zstandard.ZstdCompressor(level=zstd_level).compress
+    if brotli is not None:
+        encodings["br"] = lambda body: brotli.compress(body, quality=brotli_quality)
+    encodings["gzip"] = lambda body: gzip.compress(body, compresslevel=gzip_level, mtime=0)
+    return encodings
+
+
+def choose_encoding(accept_encoding: str, encodings: Dict[str, Compressor]) -> Optional[str]:
+    """Pick the preferred encoding that ``Accept-Encoding`` allows, if any"""
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    for coding in encodings:
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False
+    return media_type.startswith("text/") or media_type.endswith(("json", "javascript", "xml"))
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by (digest of the body, encoding)"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[bytes, str], bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def compress(self, body: bytes, encoding: str, compressor: Compressor) -> bytes:
+        if self.max_entries <= 0:
+            return compressor(body)
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        compressed = self._entries.get(key)
+        if compressed is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return compressed
+        self.misses += 1
+        compressed = compressor(body)
+        self._entries[key] = compressed
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return compressed
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+compressed_body_cache = CompressedBodyCache(COMPRESSION_CACHE_ENTRIES)
+
+
+class CompressionMiddleware:
+    """Negotiated compression of complete (non-streaming) response bodies"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        encodings: Optional[Dict[str, Compressor]] = None,
+        cache: Optional[CompressedBodyCache] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = encodings if encodings is not None else available_encodings()
+        self.cache = cache if cache is not None else compressed_body_cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or not is_compressible(headers.get("content-type", "")):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Wait for the body to decide
+                    start = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            body = message.get("body", b"")
+            passthrough = True
+
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streaming or small: send as is
+                await send(start)
+                await send(message)
+                return
+
+            compressed = self.cache.compress(body, encoding, self.encodings[encoding])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
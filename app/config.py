@@ -0,0 +1,161 @@
+"""
+Application settings
+
+Values are read from environment variables once, at import time, so every
+worker process started from the same environment sees the same configuration.
+"""
+import os
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag such as ``1``/``true``/``yes`` from the environment"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return default if value is None else int(value)
+
+
+def env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return default if value is None else float(value)
+
+
+# Database
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./candidates.db")
+
+# Run create_all() in the lifespan. Multi-worker launchers do it once in the
+# parent process and switch this off for the workers.
+CREATE_TABLES_ON_STARTUP = env_bool("CREATE_TABLES_ON_STARTUP", True)
+
+# SQLite tuning, applied to every new connection of a file database
+SQLITE_WAL = env_bool("SQLITE_WAL", True)
+SQLITE_BUSY_TIMEOUT_MS = env_int("SQLITE_BUSY_TIMEOUT_MS", 5000)
+# Only on the engines serving requests (app/existence.py relies on it);
+# migrations run with foreign keys off
+SQLITE_FOREIGN_KEYS = env_bool("SQLITE_FOREIGN_KEYS", True)
+
+# Write transactions that still hit SQLITE_BUSY are retried with backoff
+SQLITE_BUSY_RETRIES = env_int("SQLITE_BUSY_RETRIES", 5)
+SQLITE_BUSY_BACKOFF_SECONDS = env_float("SQLITE_BUSY_BACKOFF_SECONDS", 0.01)
+
+# Group commit for interview and feedback inserts (app/write_queue.py)
+WRITE_QUEUE_ENABLED = env_bool("WRITE_QUEUE_ENABLED", False)
+WRITE_QUEUE_WINDOW_MS = env_float("WRITE_QUEUE_WINDOW_MS", 2.0)
+WRITE_QUEUE_MAX_BATCH = env_int("WRITE_QUEUE_MAX_BATCH", 100)
+
+# Change feed for GET /events (app/events.py)
+EVENTS_HISTORY_SIZE = env_int("EVENTS_HISTORY_SIZE", 1000)
+EVENTS_SUBSCRIBER_BUFFER = env_int("EVENTS_SUBSCRIBER_BUFFER", 256)
+EVENTS_KEEPALIVE_SECONDS = env_float("EVENTS_KEEPALIVE_SECONDS", 15.0)
+# How often the outbox is checked for other workers' changes, and how many
+# changes are read at a time
+EVENTS_POLL_SECONDS = env_float("EVENTS_POLL_SECONDS", 0.5)
+EVENTS_POLL_BATCH = env_int("EVENTS_POLL_BATCH", 500)
+
+# Outbox for GET /changes (app/changes.py)
+CHANGES_RETENTION_DAYS = env_float("CHANGES_RETENTION_DAYS", 30.0)
+# Compaction runs after startup and then this often, in the maintenance worker
+CHANGES_COMPACT_HOURS = env_float("CHANGES_COMPACT_HOURS", 1.0)
+
+# Interviews of the same interviewer closer than this are double bookings
+# (0 disables the check)
+INTERVIEW_DURATION_MINUTES = env_int("INTERVIEW_DURATION_MINUTES", 60)
+
+# Response compression (app/compression.py); brotli and zstd need the
+# optional brotli / zstandard packages
+COMPRESSION_ENABLED = env_bool("COMPRESSION_ENABLED", True)
+COMPRESSION_MIN_SIZE = env_int("COMPRESSION_MIN_SIZE", 1024)
+COMPRESSION_GZIP_LEVEL = env_int("COMPRESSION_GZIP_LEVEL", 6)
+COMPRESSION_BROTLI_QUALITY = env_int("COMPRESSION_BROTLI_QUALITY", 4)
+COMPRESSION_ZSTD_LEVEL = env_int("COMPRESSION_ZSTD_LEVEL", 3)
+COMPRESSION_CACHE_ENTRIES = env_int("COMPRESSION_CACHE_ENTRIES", 256)
+
+# Admission control (app/admission.py): per-route concurrency limits and wait
+# queues; requests beyond them get 503 with Retry-After
+ADMISSION_ENABLED = env_bool("ADMISSION_ENABLED", True)
+ADMISSION_READ_CONCURRENCY = env_int("ADMISSION_READ_CONCURRENCY", 4)
+ADMISSION_READ_QUEUE = env_int("ADMISSION_READ_QUEUE", 32)
+ADMISSION_WRITE_CONCURRENCY = env_int("ADMISSION_WRITE_CONCURRENCY", 64)
+ADMISSION_WRITE_QUEUE = env_int("ADMISSION_WRITE_QUEUE", 512)
+ADMISSION_MAX_WAIT_SECONDS = env_float("ADMISSION_MAX_WAIT_SECONDS", 2.0)
+ADMISSION_RETRY_AFTER_SECONDS = env_int("ADMISSION_RETRY_AFTER_SECONDS", 1)
+
+# Idempotency-Key support for POST endpoints (app/idempotency.py)
+IDEMPOTENCY_TTL_HOURS = env_float("IDEMPOTENCY_TTL_HOURS", 24.0)
+# Expired keys are purged after startup and then this often, in the maintenance worker
+IDEMPOTENCY_PURGE_HOURS = env_float("IDEMPOTENCY_PURGE_HOURS", 1.0)
+IDEMPOTENCY_CACHE_ENTRIES = env_int("IDEMPOTENCY_CACHE_ENTRIES", 10000)
+
+# Hot/cold tiering (app/archive.py): closed candidates move to the archive
+# after this many days without a status change
+ARCHIVE_AFTER_DAYS = env_float("ARCHIVE_AFTER_DAYS", 90.0)
+ARCHIVE_BATCH_SIZE = env_int("ARCHIVE_BATCH_SIZE", 500)
+# Archival runs after startup and then this often, in the maintenance worker
+ARCHIVE_INTERVAL_HOURS = env_float("ARCHIVE_INTERVAL_HOURS", 6.0)
+
+# Columnar exports (app/export.py): rows read and encoded per batch
+EXPORT_BATCH_SIZE = env_int("EXPORT_BATCH_SIZE", 10000)
+
+# Admin routes that write files, move or expose data (backups, archive,
+# tenants) need X-Admin-Token: <ADMIN_TOKEN>; they answer 403 while it is unset
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Online backups (app/backup.py); BACKUP_INTERVAL_HOURS=0 disables the
+# scheduled backup of the default database
+BACKUP_DIR = os.getenv("BACKUP_DIR", "./backups")
+BACKUP_PAGES_PER_STEP = env_int("BACKUP_PAGES_PER_STEP", 256)
+BACKUP_STEP_PAUSE_MS = env_float("BACKUP_STEP_PAUSE_MS", 5.0)
+BACKUP_INTERVAL_HOURS = env_float("BACKUP_INTERVAL_HOURS", 0.0)
+BACKUP_KEEP = env_int("BACKUP_KEEP", 7)
+
+# Request profiling (app/profiling.py): requests sending X-Profile: 1 with
+# the token, plus a random PROFILING_SAMPLE_RATE share, are profiled
+PROFILING_ENABLED = env_bool("PROFILING_ENABLED", False)
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+PROFILING_SAMPLE_RATE = env_float("PROFILING_SAMPLE_RATE", 0.0)
+PROFILING_INTERVAL_MS = env_float("PROFILING_INTERVAL_MS", 5.0)
+PROFILING_BUFFER_SIZE = env_int("PROFILING_BUFFER_SIZE", 20)
+
+# Slow-query log (app/slow_queries.py); SQL_ECHO logs every statement
+SQL_ECHO = env_bool("SQL_ECHO", True)
+SLOW_QUERY_ENABLED = env_bool("SLOW_QUERY_ENABLED", True)
+SLOW_QUERY_MS = env_float("SLOW_QUERY_MS", 100.0)
+SLOW_QUERY_MAX_FINGERPRINTS = env_int("SLOW_QUERY_MAX_FINGERPRINTS", 200)
+
+# Parent-existence cache for the nested routes (app/existence.py)
+EXISTENCE_CACHE_SIZE = env_int("EXISTENCE_CACHE_SIZE", 100000)
+EXISTENCE_NEGATIVE_TTL_SECONDS = env_float("EXISTENCE_NEGATIVE_TTL_SECONDS", 5.0)
+
+# Background database maintenance (app/maintenance.py); an interval of 0
+# disables that job
+MAINTENANCE_ENABLED = env_bool("MAINTENANCE_ENABLED", True)
+MAINTENANCE_CHECKPOINT_SECONDS = env_float("MAINTENANCE_CHECKPOINT_SECONDS", 60.0)
+MAINTENANCE_WAL_TRUNCATE_MB = env_float("MAINTENANCE_WAL_TRUNCATE_MB", 64.0)
+MAINTENANCE_OPTIMIZE_HOURS = env_float("MAINTENANCE_OPTIMIZE_HOURS", 6.0)
+MAINTENANCE_ANALYSIS_LIMIT = env_int("MAINTENANCE_ANALYSIS_LIMIT", 1000)
+MAINTENANCE_VACUUM_HOURS = env_float("MAINTENANCE_VACUUM_HOURS", 1.0)
+MAINTENANCE_VACUUM_PAGES = env_int("MAINTENANCE_VACUUM_PAGES", 1024)
+MAINTENANCE_VACUUM_PAUSE_MS = env_float("MAINTENANCE_VACUUM_PAUSE_MS", 20.0)
+MAINTENANCE_BUSY_RETRY_SECONDS = env_float("MAINTENANCE_BUSY_RETRY_SECONDS", 30.0)
+
+# Compiled statements kept per engine (app/queries.py)
+SQL_QUERY_CACHE_SIZE = env_int("SQL_QUERY_CACHE_SIZE", 1200)
+
+# Per-tenant databases (app/tenancy.py): requests pick a tenant with the
+# X-Tenant-ID header or a /t/<tenant>/ path prefix
+TENANCY_ENABLED = env_bool("TENANCY_ENABLED", False)
+TENANT_DATABASE_URL = os.getenv("TENANT_DATABASE_URL", "sqlite+aiosqlite:///./tenants/{tenant}.db")
+TENANT_MAX_OPEN_ENGINES = env_int("TENANT_MAX_OPEN_ENGINES", 32)
+# Comma-separated tenants whose database is created on first request; others
+# need POST /admin/tenants/{tenant} first
+TENANT_ALLOWLIST = [tenant.strip() for tenant in os.getenv("TENANT_ALLOWLIST", "").split(",") if tenant.strip()]
+
+# Multi-process launcher (python -m app.serve)
+HOST = os.getenv("HOST", "127.0.0.1")
+PORT = env_int("PORT", 8000)
+WEB_CONCURRENCY = env_int("WEB_CONCURRENCY", os.cpu_count() or 1)
@@ -1,29 +1,162 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from typing import AsyncGenerator
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable, TypeVar
+import asyncio
+
+from app.config import (
+    DATABASE_URL,
+    SQL_ECHO,
+    SQL_QUERY_CACHE_SIZE,
+    SQLITE_WAL,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_FOREIGN_KEYS,
+    SQLITE_BUSY_RETRIES,
+    SQLITE_BUSY_BACKOFF_SECONDS,
+)
+
+T = TypeVar("T")
 
 # Database URLs
-DATABASE_URL = "sqlite+aiosqlite:///./candidates.db"
 TEST_DATABASE_URL = "sqlite+aiosqlite:///./test_candidates.db"
 
+
+def _is_file_database(url: str) -> bool:
+    database = make_url(url).database
+    return bool(database) and database != ":memory:" and not database.startswith("file::memory:")
+
+
+def make_engine(url: str, foreign_keys: bool = False, **kwargs) -> AsyncEngine:
+    """Create an async engine with per-connection SQLite pragmas installed
+
+    ``foreign_keys`` enables ``PRAGMA foreign_keys`` on its connections; the
+    engines serving requests pass ``SQLITE_FOREIGN_KEYS``.
+    """
+    kwargs.setdefault("query_cache_size", SQL_QUERY_CACHE_SIZE)
+    new_engine = create_async_engine(url, future=True, **kwargs)
+    use_wal = SQLITE_WAL and _is_file_database(url)
+
+    @event.listens_for(new_engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # Lets app.maintenance return freed pages; only takes effect for a new
+        # database, and has to come before the WAL switch writes the header
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        # WAL lets readers in every worker run while one writer commits
+        if use_wal:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        # Wait for the write lock instead of failing immediately with SQLITE_BUSY
+        cursor.execute(f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT_MS)}")
+        # Inserts under a parent that no longer exists fail instead of dangling
+        # (app.existence relies on it when another worker deleted the parent)
+        if foreign_keys:
+            cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    return new_engine
+
+
 # Create async engine
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+engine = make_engine(DATABASE_URL, foreign_keys=SQLITE_FOREIGN_KEYS, echo=SQL_ECHO)
 
 # Session factory
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+
+def init_engine() -> AsyncEngine:
+    """Replace the engine with a fresh one owned by the current process
+
+    Pooled SQLite connections (and aiosqlite's worker threads) must not be
+    shared across fork(), so each worker calls this after it starts.
+    """
+    global engine
+    engine = make_engine(DATABASE_URL, foreign_keys=SQLITE_FOREIGN_KEYS, echo=engine.echo)
+    async_session_maker.configure(bind=engine)
+    return engine
+
+
 # Dependency for FastAPI endpoints
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_maker() as session:
+    from app.tenancy import session_maker_for_request
+    session_maker = await session_maker_for_request()
+    async with session_maker() as session:
         try:
             yield session
         finally:
             await session.close()
 
-# Create tables for production
+
+def is_sqlite_busy(exc: OperationalError) -> bool:
+    """True for SQLITE_BUSY / SQLITE_LOCKED errors that are worth retrying"""
+    message = str(exc.orig).lower()
+    return "database is locked" in message or "database table is locked" in message
+
+
+# Run a write transaction and commit it
+async def run_write(db: AsyncSession, op: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    """Run ``op`` inside the session's transaction and commit
+
+    The whole operation is replayed when SQLite reports the database as busy,
+    which happens when a read transaction cannot be upgraded to a write while
+    another process holds the lock. Any other error rolls back and propagates.
+    """
+    attempt = 0
+    while True:
+        try:
+            result = await op(db)
+            await db.commit()
+            return result
+        except OperationalError as exc:
+            await db.rollback()
+            if not is_sqlite_busy(exc) or attempt >= SQLITE_BUSY_RETRIES:
+                raise
+            await asyncio.sleep(SQLITE_BUSY_BACKOFF_SECONDS * 2 ** attempt)
+            attempt += 1
+        except Exception:
+            await db.rollback()
+            raise
+
+
+@asynccontextmanager
+async def savepoint(db: AsyncSession) -> AsyncIterator[None]:
+    """``db.begin_nested()`` that is safe as the first statement of a transaction
+
+    The SQLite driver only opens a transaction before DML, so a SAVEPOINT
+    issued first would start one of its own and commit it on release.
+    """
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    if not raw.driver_connection.in_transaction:
+        await conn.exec_driver_sql("BEGIN")
+    async with db.begin_nested():
+        yield
+
+
+async def apply_schema(target: AsyncEngine) -> None:
+    """Create missing tables and apply pending migrations on ``target``
+
+    Migrations rewrite tables that may hold rows from before foreign keys were
+    enforced, so they run with enforcement off, as SQLite recommends for
+    schema changes. The pragma only changes outside a transaction; it is
+    restored after the commit, before the connection returns to the pool.
+    """
+    from app.migrations import prepare_schema
+    async with target.connect() as conn:
+        enforced = (await conn.exec_driver_sql("PRAGMA foreign_keys")).scalar()
+        await conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        await conn.run_sync(prepare_schema)
+        await conn.commit()
+        if enforced:
+            await conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+            await conn.commit()
+
+
+# Create tables for production and apply pending migrations
 async def create_tables():
-    from app.models import Base
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await apply_schema(engine)
 
 # Create tables for testing
 async def create_test_tables():
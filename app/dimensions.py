@@ -0,0 +1,93 @@
+"""
+Interned interviewer and position names - Job Interview Management System
+
+Interviewer and position names are stored once, in the ``interviewers`` and
+``positions`` lookup tables, and interviews and candidates reference them by
+integer id. The models still expose the name (as a read-only column
+property), so request and response schemas are unchanged.
+
+The write routes turn names into ids with ``resolve_id``. Ids come from an
+in-process cache; a miss costs one lookup on the unique name index and, for
+a name never seen before, one insert in the caller's transaction. An id
+inserted by a transaction enters the cache only after that transaction has
+committed, so an insert that was rolled back (including a failed savepoint in
+a group commit) is never handed out. When a concurrent request inserts the
+same new name first, the insert's savepoint is rolled back and that row's id
+is used. Lookup rows are never deleted, so cached ids don't go stale. Each tenant database has its own ids, so the cache is
+keyed by tenant too.
+"""
+from typing import Dict, Optional, Tuple, Type, Union
+
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import queries
+from app.db import savepoint
+from app.models.dimension import Interviewer, Position
+from app.tenancy import session_tenant
+
+Dimension = Union[Type[Interviewer], Type[Position]]
+
+_PENDING = "pending_dimensions"
+
+# (tenant, table, name) -> id of committed lookup rows
+_ids: Dict[Tuple[Optional[str], str, str], int] = {}
+
+
+def clear_cache() -> None:
+    """Forget all cached ids (needed when the lookup tables are recreated)"""
+    _ids.clear()
+
+
+async def lookup_id(db: AsyncSession, model: Dimension, name: str) -> Optional[int]:
+    """Id of ``name`` in the lookup table, or None if it was never stored"""
+    key = (session_tenant(db.sync_session), model.__tablename__, name)
+    if key in _ids:
+        return _ids[key]
+
+    # Inserted earlier in this, still uncommitted, transaction
+    for row in db.sync_session.info.get(_PENDING, ()):
+        if isinstance(row, model) and row.name == name and inspect(row).persistent:
+            return row.id
+
+    result = await db.execute(queries.DIMENSION_ID[model], {"name": name})
+    id = result.scalar_one_or_none()
+    if id is not None:
+        # Not inserted by this transaction, so it is already committed
+        _ids[key] = id
+    return id
+
+
+async def resolve_id(db: AsyncSession, model: Dimension, name: str) -> int:
+    """Id of ``name``, inserting it into the lookup table in the current transaction if needed"""
+    id = await lookup_id(db, model, name)
+    if id is not None:
+        return id
+
+    row = model(name=name)
+    try:
+        async with savepoint(db):
+            db.add(row)
+    except IntegrityError:
+        # Another transaction committed the same name since the lookup
+        id = await lookup_id(db, model, name)
+        if id is None:
+            raise
+        return id
+    db.sync_session.info.setdefault(_PENDING, []).append(row)
+    return row.id
+
+
+@event.listens_for(Session, "after_commit")
+def _cache_committed_ids(session: Session) -> None:
+    tenant = session_tenant(session)
+    for row in session.info.pop(_PENDING, ()):
+        if inspect(row).persistent:
+            _ids[(tenant, row.__tablename__, row.name)] = row.id
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_ids(session: Session) -> None:
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,192 @@
+"""
+Change fan-out - Job Interview Management System
+
+GET /events streams the ``changes`` outbox (app/changes.py) to subscribers as
+Server-Sent Events. Each worker tails the outbox while it has subscribers, so
+they see the writes of every worker, in commit order.
+
+- Event ids are the outbox sequence numbers, which are the same in every
+  worker and survive restarts.
+- Every subscriber has a bounded buffer. A subscriber that falls behind is
+  dropped and told to resync instead of slowing down the feed.
+- A reconnecting client sends ``Last-Event-ID`` and receives only what it
+  missed, from the recent events kept in memory or else from the outbox
+  itself, on any worker. Only ids compacted out of the outbox need a resync.
+- A worker's own commits wake its tail immediately; other workers' commits
+  are picked up within ``EVENTS_POLL_SECONDS``.
+"""
+import asyncio
+import json
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Coroutine, Deque, Dict, List, Optional, Set
+
+from app.config import EVENTS_HISTORY_SIZE, EVENTS_SUBSCRIBER_BUFFER
+
+# Sent when the client must refetch state instead of relying on the stream
+RESYNC = "resync"
+
+
+@dataclass(frozen=True)
+class Event:
+    id: str
+    type: str
+    data: Dict[str, Any]
+
+    def encode(self) -> str:
+        """Format as one Server-Sent Events message"""
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data)}\n\n"
+
+
+class Subscription:
+    """One subscriber's bounded buffer of pending events"""
+
+    def __init__(self, buffer_size: int):
+        self.queue: "asyncio.Queue[Event]" = asyncio.Queue(maxsize=buffer_size)
+        self.overflowed = False
+
+    async def get(self) -> Event:
+        return await self.queue.get()
+
+    def _overflow(self, resync: Event) -> None:
+        """Replace the pending events with a final resync"""
+        self.overflowed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(resync)
+
+
+class EventHub:
+    """Publish events to all current subscribers and keep a replay history"""
+
+    def __init__(self, history_size: int = 1000, buffer_size: int = 256):
+        self.history: Deque[Event] = deque(maxlen=history_size)
+        self.buffer_size = buffer_size
+        self._subscribers: Set[Subscription] = set()
+        # Outbox sequence number of the last published event
+        self._sequence = 0
+        # Task tailing the outbox (app/changes.py), while there are subscribers
+        self.feed: Optional["asyncio.Task[None]"] = None
+        self._wake = asyncio.Event()
+
+    @property
+    def sequence(self) -> int:
+        return self._sequence
+
+    @property
+    def following(self) -> bool:
+        return self.feed is not None and not self.feed.done()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def restart(self, sequence: int) -> None:
+        """Continue from outbox position ``sequence``, forgetting history before a gap"""
+        if sequence != self._sequence:
+            self.history.clear()
+            self._sequence = sequence
+
+    def follow(self, feed: Coroutine[Any, Any, None]) -> None:
+        """Run ``feed`` as the task that publishes to this hub"""
+        self._wake = asyncio.Event()
+        self.feed = asyncio.create_task(feed)
+
+    def notify(self) -> None:
+        """Wake the feed: this worker committed new changes"""
+        self._wake.set()
+
+    async def wait(self, timeout: float) -> None:
+        """Sleep until ``notify`` or for ``timeout`` seconds"""
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    def publish(self, sequence: int, event_type: str, data: Dict[str, Any]) -> Event:
+        self._sequence = sequence
+        event = Event(id=str(sequence), type=event_type, data=data)
+        self.history.append(event)
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._subscribers.discard(subscription)
+                subscription._overflow(self._resync())
+        return event
+
+    def can_replay(self, last_event_id: str) -> bool:
+        """Whether the history holds every event after ``last_event_id``"""
+        return self._replay_after(last_event_id) is not None
+
+    def subscribe(self, last_event_id: Optional[str] = None, backlog: Optional[List[Event]] = None) -> Subscription:
+        """Register a subscriber, replaying events after ``last_event_id``
+
+        ``backlog`` holds the events after ``last_event_id`` read from the
+        outbox, for ids older than the history.
+        """
+        subscription = Subscription(self.buffer_size)
+        replay = self._replay_after(last_event_id) if last_event_id else []
+        if replay is None and backlog is not None:
+            replay = self._join(last_event_id, backlog)
+        if replay is None or len(replay) >= self.buffer_size:
+            replay = [self._resync()]
+        for event in replay:
+            subscription.queue.put_nowait(event)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def _resync(self) -> Event:
+        # Carries the current id so the next reconnect resumes from here
+        return Event(id=str(self._sequence), type=RESYNC, data={})
+
+    def _join(self, last_event_id: str, backlog: List[Event]) -> Optional[List[Event]]:
+        """The backlog up to this hub's position, then the history after it"""
+        known = [event for event in backlog if int(event.id) <= self._sequence]
+        rest = self._replay_after(known[-1].id if known else last_event_id)
+        return None if rest is None else known + rest
+
+    def _replay_after(self, last_event_id: str) -> Optional[List[Event]]:
+        """Events newer than ``last_event_id``; None when they are no longer known"""
+        if not last_event_id.isdigit():
+            return None
+        sequence = int(last_event_id)
+        if sequence > self._sequence:
+            return None
+        if sequence == self._sequence:
+            return []
+        if not self.history or sequence < int(self.history[0].id) - 1:
+            return None
+        return [event for event in self.history if int(event.id) > sequence]
+
+
+event_hub = EventHub(history_size=EVENTS_HISTORY_SIZE, buffer_size=EVENTS_SUBSCRIBER_BUFFER)
+
+# Hubs of tenant databases (app/tenancy.py); the default database uses event_hub
+_tenant_hubs: Dict[str, EventHub] = {}
+
+
+def existing_hub(tenant: Optional[str]) -> Optional[EventHub]:
+    """The hub of a tenant's database if anything subscribed to it"""
+    return event_hub if tenant is None else _tenant_hubs.get(tenant)
+
+
+def discard_hub(tenant: str) -> None:
+    """Forget a closed tenant's hub and stop its feed"""
+    hub = _tenant_hubs.pop(tenant, None)
+    if hub is not None and hub.feed is not None:
+        hub.feed.cancel()
+
+
+def hub_for(tenant: Optional[str]) -> EventHub:
+    """Event hub of a tenant's database, or of the default one for None"""
+    if tenant is None:
+        return event_hub
+    hub = _tenant_hubs.get(tenant)
+    if hub is None:
+        hub = _tenant_hubs[tenant] = EventHub(history_size=EVENTS_HISTORY_SIZE, buffer_size=EVENTS_SUBSCRIBER_BUFFER)
+    return hub
@@ -0,0 +1,194 @@
+"""
+Parent-existence cache - Job Interview Management System
+
+The nested routes (POST/GET /candidates/{id}/interviews, POST/GET
+/interviews/{id}/feedback) only need to know whether the parent exists before
+they touch its children. ``candidate_exists`` and ``interview_candidate_id``
+answer from an in-process cache:
+
+- Ids known to exist are kept in an LRU of ``EXISTENCE_CACHE_SIZE`` entries
+  per kind (interviews keep their candidate id, which feedback needs for the
+  timeline). Rows created by a transaction enter it only once that
+  transaction has committed, like interned dimension ids.
+- Ids that answered 404 are remembered for ``EXISTENCE_NEGATIVE_TTL_SECONDS``,
+  so a client hammering a bad id doesn't reach SQLite each time.
+- ``delete_candidate_rows`` evicts the candidate and its interviews at once
+  and marks them missing after the delete has committed.
+
+The cache belongs to one process and other workers can still delete a
+parent it knows. Inserts then fail on the foreign key
+(``PRAGMA foreign_keys=ON``), which the routes turn into a 404 and evict.
+An empty child list from a cached parent is confirmed against the table
+before it is returned.
+"""
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple, Union
+
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import config, queries
+from app.models.candidate import Candidate
+from app.models.interview import Interview
+from app.tenancy import session_tenant
+
+CANDIDATES = Candidate.__tablename__
+INTERVIEWS = Interview.__tablename__
+
+_PENDING = "pending_existence"
+_REMOVED = "removed_existence"
+
+# (tenant, table, id)
+Key = Tuple[Optional[str], str, Any]
+
+# Key -> value of committed rows (True for candidates, the candidate id for interviews)
+_known: "OrderedDict[Key, Any]" = OrderedDict()
+# Candidate key -> keys of its interviews in _known, so evicting a candidate
+# doesn't scan the whole cache
+_interviews_of: Dict[Key, Set[Key]] = {}
+# Key -> monotonic time until which the id counts as missing
+_missing: "OrderedDict[Key, float]" = OrderedDict()
+
+
+def clear_cache() -> None:
+    """Forget everything (needed when the tables are recreated)"""
+    _known.clear()
+    _interviews_of.clear()
+    _missing.clear()
+
+
+def is_foreign_key_violation(exc: IntegrityError) -> bool:
+    return "foreign key constraint failed" in str(exc.orig).lower()
+
+
+def _key(session: Session, table: str, id: Any) -> Key:
+    return (session_tenant(session), table, id)
+
+
+def _candidate_key(interview_key: Key, candidate_id: Any) -> Key:
+    return (interview_key[0], CANDIDATES, candidate_id)
+
+
+def _discard(key: Key) -> None:
+    """Drop one entry of _known, keeping the interview index in step"""
+    value = _known.pop(key, None)
+    if value is not None and key[1] == INTERVIEWS:
+        parent = _candidate_key(key, value)
+        siblings = _interviews_of.get(parent)
+        if siblings is not None:
+            siblings.discard(key)
+            if not siblings:
+                del _interviews_of[parent]
+
+
+def _remember(key: Key, value: Any) -> None:
+    _missing.pop(key, None)
+    _discard(key)
+    _known[key] = value
+    if key[1] == INTERVIEWS:
+        _interviews_of.setdefault(_candidate_key(key, value), set()).add(key)
+    while len(_known) > config.EXISTENCE_CACHE_SIZE:
+        _discard(next(iter(_known)))
+
+
+def _remember_missing(key: Key) -> None:
+    if config.EXISTENCE_NEGATIVE_TTL_SECONDS <= 0:
+        return
+    _missing[key] = time.monotonic() + config.EXISTENCE_NEGATIVE_TTL_SECONDS
+    _missing.move_to_end(key)
+    while len(_missing) > config.EXISTENCE_CACHE_SIZE:
+        _missing.popitem(last=False)
+
+
+def _row_value(row: Union[Candidate, Interview]) -> Any:
+    return row.candidate_id if isinstance(row, Interview) else True
+
+
+def _evict(key: Key) -> None:
+    _discard(key)
+    if key[1] == CANDIDATES:
+        # The candidate's interviews go with it
+        for interview in _interviews_of.pop(key, ()):
+            _known.pop(interview, None)
+
+
+async def _lookup(db: AsyncSession, table: str, id: Any, query, params: Dict[str, Any], fresh: bool) -> Any:
+    session = db.sync_session
+    key = _key(session, table, id)
+
+    # Created earlier in this, still uncommitted, transaction
+    for row in session.info.get(_PENDING, ()):
+        if row.__tablename__ == table and row.id == id and inspect(row).persistent:
+            return _row_value(row)
+
+    if not fresh:
+        if key in _known:
+            _known.move_to_end(key)
+            return _known[key]
+        expires = _missing.get(key)
+        if expires is not None:
+            if expires > time.monotonic():
+                return None
+            del _missing[key]
+
+    value = (await db.execute(query, params)).scalar_one_or_none()
+    if value is None:
+        _discard(key)
+        _remember_missing(key)
+    else:
+        _remember(key, value)
+    return value
+
+
+async def candidate_exists(db: AsyncSession, candidate_id: uuid.UUID, fresh: bool = False) -> bool:
+    """Whether the candidate exists; ``fresh`` skips the cache"""
+    params = {"candidate_id": candidate_id}
+    return await _lookup(db, CANDIDATES, candidate_id, queries.CANDIDATE_ID, params, fresh) is not None
+
+
+async def interview_candidate_id(db: AsyncSession, interview_id: int, fresh: bool = False) -> Optional[uuid.UUID]:
+    """Candidate id of the interview, or None if the interview doesn't exist"""
+    params = {"interview_id": interview_id}
+    return await _lookup(db, INTERVIEWS, interview_id, queries.INTERVIEW_CANDIDATE_ID, params, fresh)
+
+
+def record_created(db: AsyncSession, row: Union[Candidate, Interview]) -> None:
+    """Remember a flushed candidate or interview once its transaction commits"""
+    session = db.sync_session
+    _missing.pop(_key(session, row.__tablename__, row.id), None)
+    session.info.setdefault(_PENDING, []).append(row)
+
+
+def record_deleted(db: AsyncSession, table: str, id: Any) -> None:
+    """Evict a deleted row now, and mark it missing once the delete commits"""
+    session = db.sync_session
+    key = _key(session, table, id)
+    _evict(key)
+    session.info.setdefault(_REMOVED, []).append(key)
+
+
+def forget(db: AsyncSession, table: str, id: Any) -> None:
+    """Drop a cached id that the database no longer has (a foreign key failed)"""
+    _evict(_key(db.sync_session, table, id))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed(session: Session) -> None:
+    tenant = session_tenant(session)
+    for row in session.info.pop(_PENDING, ()):
+        if inspect(row).persistent:
+            _remember((tenant, row.__tablename__, row.id), _row_value(row))
+    for key in session.info.pop(_REMOVED, ()):
+        # Evict again in case a concurrent lookup cached it before the commit
+        _evict(key)
+        _remember_missing(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+    session.info.pop(_REMOVED, None)
@@ -0,0 +1,282 @@
+"""
+Columnar exports - Job Interview Management System
+
+GET /export/{candidates,interviews,feedback} returns flat tables for
+analysis. It skips the nested response models that the listing builds:
+
+- Rows come from plain Core selects, read in partitions of
+  ``EXPORT_BATCH_SIZE`` rows. Each partition is encoded and sent before the
+  next one is fetched, so memory is bounded by the batch size, not the table.
+- ``csv`` is always available. ``arrow`` (Arrow IPC stream) and ``parquet``
+  need the optional ``pyarrow`` package, which is imported on the first such
+  export rather than at startup. Each partition becomes one record batch or
+  row group.
+- Timestamps are written as naive UTC, the way the tables store them;
+  archived candidates' timestamps are converted to the same form.
+- With ``include_archived=true`` the candidates export also includes archived
+  candidates, after the hot ones, as the listing does.
+"""
+import csv
+import enum
+import importlib.util
+import io
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Sequence, Tuple
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
+
+from app.models.archive import ArchivedCandidate
+from app.models.candidate import Candidate
+from app.models.dimension import Interviewer, Position
+from app.models.feedback import Feedback
+from app.models.interview import Interview
+from app.schemas.candidate import CandidateResponse
+
+# Column types
+STRING = "string"
+INTEGER = "integer"
+TIMESTAMP = "timestamp"
+
+Rows = Sequence[Sequence[Any]]
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    expression: ColumnElement
+    type: str
+
+
+class ExportTable(str, enum.Enum):
+    CANDIDATES = "candidates"
+    INTERVIEWS = "interviews"
+    FEEDBACK = "feedback"
+
+
+class ExportFormat(str, enum.Enum):
+    CSV = "csv"
+    ARROW = "arrow"
+    PARQUET = "parquet"
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.ARROW: "application/vnd.apache.arrow.stream",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+FILE_EXTENSIONS = {
+    ExportFormat.CSV: "csv",
+    ExportFormat.ARROW: "arrows",
+    ExportFormat.PARQUET: "parquet",
+}
+
+
+@lru_cache(maxsize=None)
+def _has_pyarrow() -> bool:
+    # Looks for the optional dependency without paying for its import
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def available_formats() -> List[ExportFormat]:
+    formats = [ExportFormat.CSV]
+    if _has_pyarrow():
+        formats += [ExportFormat.ARROW, ExportFormat.PARQUET]
+    return formats
+
+
+CANDIDATE_COLUMNS = [
+    Column("id", Candidate.id, STRING),
+    Column("name", Candidate.name, STRING),
+    Column("email", Candidate.email, STRING),
+    Column("position", Position.name, STRING),
+    Column("status", Candidate.status, STRING),
+    Column("created_at", Candidate.created_at, TIMESTAMP),
+    Column("updated_at", Candidate.updated_at, TIMESTAMP),
+]
+
+INTERVIEW_COLUMNS = [
+    Column("id", Interview.id, INTEGER),
+    Column("candidate_id", Interview.candidate_id, STRING),
+    Column("interviewer", Interviewer.name, STRING),
+    Column("scheduled_at", Interview.scheduled_at, TIMESTAMP),
+    Column("result", Interview.result, STRING),
+]
+
+FEEDBACK_COLUMNS = [
+    Column("id", Feedback.id, INTEGER),
+    Column("interview_id", Feedback.interview_id, INTEGER),
+    Column("rating", Feedback.rating, INTEGER),
+    Column("comment", Feedback.comment, STRING),
+]
+
+
+def _select(columns: List[Column]) -> Select:
+    return select(*[column.expression.label(column.name) for column in columns])
+
+
+# Table -> (columns, query); names are joined in instead of read per row
+TABLES: Dict[ExportTable, Tuple[List[Column], Select]] = {
+    ExportTable.CANDIDATES: (
+        CANDIDATE_COLUMNS,
+        _select(CANDIDATE_COLUMNS)
+        .join_from(Candidate, Position, Candidate.position_id == Position.id)
+        .order_by(Candidate.created_at)
+    ),
+    ExportTable.INTERVIEWS: (
+        INTERVIEW_COLUMNS,
+        _select(INTERVIEW_COLUMNS)
+        .join_from(Interview, Interviewer, Interview.interviewer_id == Interviewer.id)
+        .order_by(Interview.id)
+    ),
+    ExportTable.FEEDBACK: (
+        FEEDBACK_COLUMNS,
+        _select(FEEDBACK_COLUMNS).order_by(Feedback.id)
+    ),
+}
+
+
+def _text(value: Any) -> Any:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, enum.Enum):
+        return value.value
+    return str(value)  # UUIDs
+
+
+def _naive_utc(value: Any) -> Any:
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _column_values(columns: List[Column], rows: Rows) -> List[List[Any]]:
+    """Transpose a partition into one list per column, with UUIDs and enums as
+    text and timestamps as naive UTC"""
+    values = []
+    for index, column in enumerate(columns):
+        if column.type == STRING:
+            values.append([_text(row[index]) for row in rows])
+        elif column.type == TIMESTAMP:
+            values.append([_naive_utc(row[index]) for row in rows])
+        else:
+            values.append([row[index] for row in rows])
+    return values
+
+
+async def _partitions(db: AsyncSession, statement: Select, batch_size: int) -> AsyncIterator[Rows]:
+    result = await db.stream(statement.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        yield partition
+
+
+async def _archived_partitions(db: AsyncSession, columns: List[Column], batch_size: int) -> AsyncIterator[Rows]:
+    statement = select(ArchivedCandidate.document).order_by(ArchivedCandidate.created_at)
+    async for partition in _partitions(db, statement, batch_size):
+        candidates = [CandidateResponse.model_validate_json(document) for document, in partition]
+        yield [[getattr(candidate, column.name) for column in columns] for candidate in candidates]
+
+
+async def _encode_csv(columns: List[Column], partitions: AsyncIterator[Rows]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in columns])
+    async for rows in partitions:
+        values = _column_values(columns, rows)
+        for index, column in enumerate(columns):
+            if column.type == TIMESTAMP:
+                values[index] = [value.isoformat() if isinstance(value, datetime) else value
+                                 for value in values[index]]
+        writer.writerows(zip(*values))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header of an empty table
+        yield buffer.getvalue().encode()
+
+
+class _Chunks:
+    """Write-only file that hands out what was written since the last take()"""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _encode_arrow(
+    columns: List[Column],
+    partitions: AsyncIterator[Rows],
+    export_format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    import pyarrow
+    import pyarrow.ipc
+
+    types = {STRING: pyarrow.string(), INTEGER: pyarrow.int64(), TIMESTAMP: pyarrow.timestamp("us")}
+    schema = pyarrow.schema([(column.name, types[column.type]) for column in columns])
+    sink = _Chunks()
+    if export_format == ExportFormat.PARQUET:
+        import pyarrow.parquet
+
+        writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    else:
+        writer = pyarrow.ipc.new_stream(sink, schema)
+
+    try:
+        async for rows in partitions:
+            arrays = [
+                pyarrow.array(values, type=field.type)
+                for values, field in zip(_column_values(columns, rows), schema)
+            ]
+            writer.write_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.take()
+    finally:
+        writer.close()
+    # Parquet footer / end-of-stream marker
+    yield sink.take()
+
+
+async def export_table(
+    db: AsyncSession,
+    table: ExportTable,
+    export_format: ExportFormat,
+    include_archived: bool = False,
+    batch_size: int = 10000,
+) -> AsyncIterator[bytes]:
+    """Encoded chunks of ``table``, one per partition of ``batch_size`` rows"""
+    columns, statement = TABLES[table]
+
+    async def partitions() -> AsyncIterator[Rows]:
+        async for rows in _partitions(db, statement, batch_size):
+            yield rows
+        if table == ExportTable.CANDIDATES and include_archived:
+            async for rows in _archived_partitions(db, columns, batch_size):
+                yield rows
+
+    if export_format == ExportFormat.CSV:
+        chunks = _encode_csv(columns, partitions())
+    else:
+        chunks = _encode_arrow(columns, partitions(), export_format)
+    async for chunk in chunks:
+        if chunk:
+            yield chunk
@@ -0,0 +1,231 @@
+"""
+Idempotency keys for POST endpoints - Job Interview Management System
+
+Clients may send an ``Idempotency-Key`` header with POST /candidates/,
+POST /candidates/{id}/interviews and POST /interviews/{id}/feedback. The
+first successful response for a key is stored in the ``idempotency_keys``
+table in the same transaction as the write itself, so either both commit or
+neither does. A retry with the same key gets the stored response back
+(marked with ``Idempotent-Replayed: true``) without running the handler's
+queries again.
+
+- Stored responses live in an in-memory LRU in front of the table, so most
+  replays don't touch the database. An entry is added to the LRU only after
+  its transaction commits.
+- Keys are scoped to the tenant database the request went to.
+- Keys expire after ``IDEMPOTENCY_TTL_HOURS``. Expired keys are never
+  replayed, and a maintenance job (app/maintenance.py) deletes their rows
+  after startup and then every ``IDEMPOTENCY_PURGE_HOURS``.
+- The stored record is checked again inside the write transaction, and the
+  key is claimed there before the handler's own write. A concurrent request
+  with the same key that is retried on SQLITE_BUSY therefore gets the first
+  request's response instead of running the write again (and failing, e.g.
+  with the duplicate-email 409).
+- Reusing a key with a different request is rejected with 422. A second
+  request with a key that is still being processed gets 409 and can retry.
+- Errors are not stored: the write was rolled back, so retrying is safe.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar, Union
+
+from fastapi import Depends, Header, HTTPException, Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy import delete, event, inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import queries
+from app.config import IDEMPOTENCY_CACHE_ENTRIES, IDEMPOTENCY_TTL_HOURS
+from app.db import get_db_session, run_write
+from app.models.idempotency import IdempotencyRecord
+from app.tenancy import session_tenant
+
+T = TypeVar("T")
+
+# (tenant, idempotency key)
+CacheKey = Tuple[Optional[str], str]
+
+_PENDING = "pending_idempotency_records"
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    body: str
+    expires_at: float  # time.time()
+
+    def to_response(self) -> Response:
+        return Response(
+            content=self.body,
+            status_code=self.status_code,
+            media_type="application/json",
+            headers={"Idempotent-Replayed": "true"}
+        )
+
+
+class ResponseCache:
+    """LRU of stored responses by tenant and idempotency key"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, StoredResponse]" = OrderedDict()
+
+    def get(self, key: CacheKey) -> Optional[StoredResponse]:
+        stored = self._entries.get(key)
+        if stored is None:
+            return None
+        if stored.expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return stored
+
+    def put(self, key: CacheKey, stored: StoredResponse) -> None:
+        self._entries[key] = stored
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+response_cache = ResponseCache(IDEMPOTENCY_CACHE_ENTRIES)
+
+
+def _ttl() -> timedelta:
+    return timedelta(hours=IDEMPOTENCY_TTL_HOURS)
+
+
+def _cutoff() -> datetime:
+    """Responses stored before this have expired"""
+    return datetime.now(timezone.utc) - _ttl()
+
+
+def _stored(record: IdempotencyRecord) -> StoredResponse:
+    created_at = record.created_at.replace(tzinfo=timezone.utc)
+    return StoredResponse(
+        request_hash=record.request_hash,
+        status_code=record.status_code,
+        body=record.body,
+        expires_at=(created_at + _ttl()).timestamp()
+    )
+
+
+class Idempotency:
+    """Idempotency state of one request; a no-op when no key was sent"""
+
+    def __init__(self, key: Optional[str] = None, request_hash: str = "", replay: Optional[Response] = None):
+        self.key = key
+        self.request_hash = request_hash
+        # Stored response to return instead of running the handler
+        self.replay = replay
+
+    def wrap(
+        self,
+        op: Callable[[AsyncSession], Awaitable[T]],
+        response_model: Type[BaseModel],
+        status_code: int,
+    ) -> Callable[[AsyncSession], Awaitable[Union[T, Response]]]:
+        """Make ``op`` also store its response, in the same transaction
+
+        The wrapped op returns the stored response instead of running ``op``
+        when another request with the key committed in the meantime.
+        """
+        if self.key is None:
+            return op
+
+        async def op_with_record(db: AsyncSession) -> Union[T, Response]:
+            # An expired response may still be stored under the same key
+            await db.execute(
+                delete(IdempotencyRecord)
+                .where(IdempotencyRecord.key == self.key, IdempotencyRecord.created_at < _cutoff())
+            )
+            result = await db.execute(queries.IDEMPOTENCY_RECORD, {"key": self.key, "cutoff": _cutoff()})
+            existing = result.scalar_one_or_none()
+            if existing is not None:
+                return _replay(_stored(existing), self.request_hash)
+
+            # Claimed before the write, so a duplicate never runs it
+            record = IdempotencyRecord(key=self.key, request_hash=self.request_hash, status_code=status_code, body="")
+            db.add(record)
+            try:
+                await db.flush()
+            except IntegrityError as exc:
+                if "idempotency_keys.key" not in str(exc.orig):
+                    raise
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is already being processed"
+                )
+            result = await op(db)
+            record.body = response_model.model_validate(result).model_dump_json()
+            db.sync_session.info.setdefault(_PENDING, []).append(record)
+            return result
+
+        return op_with_record
+
+
+def _replay(stored: StoredResponse, request_hash: str) -> Response:
+    """The stored response, if it was stored for the same request"""
+    if stored.request_hash != request_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used for a different request"
+        )
+    return stored.to_response()
+
+
+# Dependency for FastAPI endpoints
+async def get_idempotency(
+    request: Request,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    db: AsyncSession = Depends(get_db_session)
+) -> Idempotency:
+    if idempotency_key is None:
+        return Idempotency()
+
+    digest = hashlib.sha256()
+    digest.update(f"{request.method} {request.url.path}\n".encode())
+    digest.update(await request.body())
+    request_hash = digest.hexdigest()
+
+    cache_key = (session_tenant(db.sync_session), idempotency_key)
+    stored = response_cache.get(cache_key)
+    if stored is None:
+        result = await db.execute(queries.IDEMPOTENCY_RECORD, {"key": idempotency_key, "cutoff": _cutoff()})
+        record = result.scalar_one_or_none()
+        if record is not None:
+            stored = _stored(record)
+            response_cache.put(cache_key, stored)
+
+    if stored is None:
+        return Idempotency(idempotency_key, request_hash)
+    return Idempotency(idempotency_key, request_hash, replay=_replay(stored, request_hash))
+
+
+@event.listens_for(Session, "after_commit")
+def _cache_committed_responses(session: Session) -> None:
+    tenant = session_tenant(session)
+    for record in session.info.pop(_PENDING, ()):
+        if inspect(record).persistent:
+            response_cache.put((tenant, record.key), _stored(record))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_responses(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+async def purge_expired_keys(db: AsyncSession) -> int:
+    """Delete stored responses older than the TTL; returns rows removed"""
+    result = await run_write(db, lambda session: session.execute(
+        delete(IdempotencyRecord).where(IdempotencyRecord.created_at < _cutoff())
+    ))
+    return result.rowcount
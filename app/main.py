@@ -1,17 +1,45 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import Depends, FastAPI, Response, status
 from contextlib import asynccontextmanager
-from app.db import create_tables
-from app.routers import candidates, interviews, feedback
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import config
+from app.backup import run_scheduled_backups
+from app.compression import CompressionMiddleware
+from app.db import create_tables, get_db_session
+from app.maintenance import database_status, is_maintenance_worker, jobs as maintenance_jobs, run_maintenance
+from app.profiling import ProfilingMiddleware
+from app.slow_queries import QueryContextMiddleware
+from app.tenancy import TenantMiddleware, tenant_registry
+from app.schemas.admin import ReadinessResponse
+from app.routers import admin, batch, candidates, interviews, interviewers, feedback, events, changes, export, search
+from app.write_queue import write_queue
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
-    # Startup: Create database tables
-    from app.models import candidate, interview, feedback
-    await create_tables()
+    # Startup: Create database tables (skipped when a launcher already did it)
+    if config.CREATE_TABLES_ON_STARTUP:
+        await create_tables()
+    # Periodic online backup of the default database, by one worker
+    backups = None
+    if config.BACKUP_INTERVAL_HOURS > 0 and is_maintenance_worker():
+        backups = asyncio.create_task(run_scheduled_backups(config.BACKUP_INTERVAL_HOURS * 3600))
+    # Checkpoints, statistics, vacuum, archival and retention purges, off the request path
+    maintenance = None
+    if config.MAINTENANCE_ENABLED and is_maintenance_worker():
+        maintenance = asyncio.create_task(run_maintenance())
     yield
-    # Shutdown: cleanup if needed
+    # /ready answers 503 from now on, so load balancers stop sending requests
+    app.state.shutting_down = True
+    for task in (backups, maintenance):
+        if task is not None:
+            task.cancel()
+    # Shutdown: commit writes still waiting in the group-commit queue
+    await write_queue.drain()
+    # ...and those of tenant databases, then close them
+    await tenant_registry.close_all()
 
 
 # Create FastAPI app instance
@@ -22,10 +50,26 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Innermost, so it sees the route the router matches
+app.add_middleware(QueryContextMiddleware)
+if config.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+# Profiles include compression time
+app.add_middleware(ProfilingMiddleware)
+# Outermost, so the /t/<tenant> prefix is stripped before routing
+app.add_middleware(TenantMiddleware)
+
 # Include routers
 app.include_router(candidates.router)
 app.include_router(interviews.router)
+app.include_router(interviewers.router)
 app.include_router(feedback.router)
+app.include_router(batch.router)
+app.include_router(search.router)
+app.include_router(events.router)
+app.include_router(changes.router)
+app.include_router(export.router)
+app.include_router(admin.router)
 
 # Basic health check endpoint
 @app.get("/health")
@@ -33,6 +77,26 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "message": "Candidate Management API is running"}
 
+# Readiness check: unlike /health it touches the database
+@app.get("/ready", response_model=ReadinessResponse)
+async def readiness_check(response: Response, db: AsyncSession = Depends(get_db_session)):
+    """Readiness check with database and maintenance status"""
+    try:
+        conn = await db.connection()
+        await conn.exec_driver_sql("SELECT 1")
+        database = {"reachable": True, **await database_status(conn)}
+    except SQLAlchemyError as exc:
+        database = {"reachable": False, "error": str(exc.orig if hasattr(exc, "orig") else exc)}
+
+    if not database["reachable"] or getattr(app.state, "shutting_down", False):
+        readiness = "unavailable"
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    elif any(job.last_error for job in maintenance_jobs):
+        readiness = "degraded"
+    else:
+        readiness = "ready"
+    return {"status": readiness, "database": database, "maintenance": maintenance_jobs}
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -41,5 +105,6 @@ async def root():
         "message": "Welcome to Candidate Management API",
         "version": "1.0.0",
         "docs": "/docs",
-        "health": "/health"
+        "health": "/health",
+        "ready": "/ready"
     }
@@ -0,0 +1,266 @@
+"""
+Background database maintenance - Job Interview Management System
+
+SQLite does no housekeeping of its own. A background task started in the
+lifespan does it for the default database and every tenant database on disk
+(closed tenants are opened just for the run), each job on its own cadence:
+
+- ``checkpoint`` (every ``MAINTENANCE_CHECKPOINT_SECONDS``) copies the WAL
+  back into the database with ``PRAGMA wal_checkpoint(PASSIVE)``, which never
+  waits for readers or writers. Under constant reads a passive checkpoint
+  can't reset the WAL, so once it is larger than
+  ``MAINTENANCE_WAL_TRUNCATE_MB`` a ``TRUNCATE`` checkpoint shrinks the file
+  to zero. That checkpoint waits up to the busy timeout for readers to finish.
+- ``optimize`` (every ``MAINTENANCE_OPTIMIZE_HOURS``) keeps the planner's
+  statistics current: a full ``ANALYZE`` the first time, then
+  ``PRAGMA optimize``, which re-analyzes only tables that changed a lot. Both
+  are bounded by ``MAINTENANCE_ANALYSIS_LIMIT`` rows per index.
+- ``vacuum`` (every ``MAINTENANCE_VACUUM_HOURS``) returns pages freed by
+  deletes to the file system with ``PRAGMA incremental_vacuum``,
+  ``MAINTENANCE_VACUUM_PAGES`` pages per write transaction, once more than
+  that many pages are free. This needs ``auto_vacuum=INCREMENTAL``, which new
+  databases get from ``make_engine``. An older database keeps
+  ``auto_vacuum=NONE`` (reported by GET /ready) until it has been converted
+  once with ``PRAGMA auto_vacuum=INCREMENTAL; VACUUM``.
+- ``archive`` (right after startup, then every ``ARCHIVE_INTERVAL_HOURS``)
+  moves long-closed candidates to the cold tier (app/archive.py).
+- ``compact_changes`` (right after startup, then every
+  ``CHANGES_COMPACT_HOURS``) drops outbox rows older than
+  ``CHANGES_RETENTION_DAYS`` (app/changes.py).
+- ``purge_idempotency_keys`` (right after startup, then every
+  ``IDEMPOTENCY_PURGE_HOURS``) deletes stored responses of expired
+  idempotency keys (app/idempotency.py).
+
+Jobs run one at a time, on a pooled connection, off the request path. Jobs
+that change rows get a session of the database instead, and commit through
+``run_write``. All jobs but ``checkpoint`` are postponed while requests are
+queueing for admission. Only the process started with ``APP_WORKER_ID=0``
+runs them (``app.serve`` sets it for its first worker), so several workers
+never maintain the same files. GET /ready reports the last run of every job.
+"""
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker
+
+from app import config
+
+logger = logging.getLogger("app.maintenance")
+
+# auto_vacuum pragma values
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+@dataclass
+class MaintenanceJob:
+    name: str
+    interval: Callable[[], float]
+    # Called with an AsyncConnection in autocommit mode, or an AsyncSession
+    # for session jobs, and the database's file path
+    run: Callable[[Any, Optional[str]], Awaitable[str]]
+    # Postponed while requests are queueing
+    heavy: bool = False
+    # Changes rows: runs in a session of the database
+    session: bool = False
+    # First run right after startup instead of after one interval
+    at_startup: bool = False
+    # Also runs on tenants that no worker has open
+    closed_tenants: bool = True
+    runs: int = 0
+    failures: int = 0
+    last_started_at: Optional[datetime] = None
+    last_duration_ms: Optional[float] = None
+    last_error: Optional[str] = None
+    # Database ("default" or the tenant) -> outcome of the last run
+    results: Dict[str, str] = field(default_factory=dict)
+    # time.monotonic() of the next run; 0 while the scheduler isn't running
+    next_run: float = 0.0
+
+    @property
+    def next_run_at(self) -> Optional[datetime]:
+        if not self.next_run or self.interval() <= 0:
+            return None
+        return datetime.now(timezone.utc) + timedelta(seconds=max(self.next_run - time.monotonic(), 0))
+
+
+def _wal_size(path: Optional[str]) -> int:
+    try:
+        return os.path.getsize(f"{path}-wal") if path else 0
+    except OSError:
+        return 0
+
+
+async def checkpoint(conn: AsyncConnection, path: Optional[str]) -> str:
+    """Checkpoint the WAL, truncating it when it has grown too large"""
+    mode = "TRUNCATE" if _wal_size(path) > config.MAINTENANCE_WAL_TRUNCATE_MB * 1024 * 1024 else "PASSIVE"
+    busy, frames, checkpointed = (await conn.exec_driver_sql(f"PRAGMA wal_checkpoint({mode})")).one()
+    if frames < 0:
+        return "not in WAL mode"
+    return f"{mode.lower()}: {checkpointed}/{frames} frames" + (" (busy)" if busy else "")
+
+
+async def optimize(conn: AsyncConnection, path: Optional[str]) -> str:
+    """Refresh the query planner's statistics"""
+    await conn.exec_driver_sql(f"PRAGMA analysis_limit={int(config.MAINTENANCE_ANALYSIS_LIMIT)}")
+    analyzed = (await conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+    )).first()
+    if analyzed is None:
+        await conn.exec_driver_sql("ANALYZE")
+        return "analyzed"
+    await conn.exec_driver_sql("PRAGMA optimize")
+    return "optimized"
+
+
+async def _pragma(conn: AsyncConnection, name: str) -> int:
+    return (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar_one()
+
+
+async def incremental_vacuum(conn: AsyncConnection, path: Optional[str]) -> str:
+    """Release free pages to the file system in small steps"""
+    if await _pragma(conn, "auto_vacuum") != 2:
+        return "skipped: auto_vacuum is not incremental"
+    pages = config.MAINTENANCE_VACUUM_PAGES
+    initial = free = await _pragma(conn, "freelist_count")
+    raw = await conn.get_raw_connection()
+    while free > pages:
+        # Python's sqlite3 steps a plain execute() only once, which frees a
+        # single page; executescript() runs the pragma to completion
+        await raw.driver_connection.executescript(f"PRAGMA incremental_vacuum({pages})")
+        # Let writers have the lock between steps
+        await asyncio.sleep(config.MAINTENANCE_VACUUM_PAUSE_MS / 1000)
+        free = await _pragma(conn, "freelist_count")
+    return f"freed {initial - free} pages, {free} free"
+
+
+async def archive(session: AsyncSession, path: Optional[str]) -> str:
+    """Move long-closed candidates to the archive"""
+    from app.archive import archive_closed_candidates
+
+    moved = await archive_closed_candidates(session, config.ARCHIVE_AFTER_DAYS, config.ARCHIVE_BATCH_SIZE)
+    return f"archived {moved} candidates"
+
+
+async def compact(session: AsyncSession, path: Optional[str]) -> str:
+    """Drop outbox changes past their retention"""
+    from app.changes import compact_changes
+
+    removed = await compact_changes(session, config.CHANGES_RETENTION_DAYS)
+    return f"removed {removed} changes"
+
+
+async def purge_keys(session: AsyncSession, path: Optional[str]) -> str:
+    """Delete stored responses of expired idempotency keys"""
+    from app.idempotency import purge_expired_keys
+
+    removed = await purge_expired_keys(session)
+    return f"removed {removed} keys"
+
+
+jobs: List[MaintenanceJob] = [
+    # Closing the last connection to a WAL database checkpoints it already
+    MaintenanceJob("checkpoint", lambda: config.MAINTENANCE_CHECKPOINT_SECONDS, checkpoint, closed_tenants=False),
+    MaintenanceJob("optimize", lambda: config.MAINTENANCE_OPTIMIZE_HOURS * 3600, optimize, heavy=True),
+    MaintenanceJob("vacuum", lambda: config.MAINTENANCE_VACUUM_HOURS * 3600, incremental_vacuum, heavy=True),
+    MaintenanceJob(
+        "archive", lambda: config.ARCHIVE_INTERVAL_HOURS * 3600, archive,
+        heavy=True, session=True, at_startup=True
+    ),
+    MaintenanceJob(
+        "compact_changes", lambda: config.CHANGES_COMPACT_HOURS * 3600, compact,
+        heavy=True, session=True, at_startup=True
+    ),
+    MaintenanceJob(
+        "purge_idempotency_keys", lambda: config.IDEMPOTENCY_PURGE_HOURS * 3600, purge_keys,
+        heavy=True, session=True, at_startup=True
+    ),
+]
+
+
+async def _databases(closed_tenants: bool) -> AsyncIterator[Tuple[str, AsyncEngine, async_sessionmaker]]:
+    """The default database, then each tenant database, held open while it is maintained"""
+    from app import db
+    from app.tenancy import tenant_registry
+
+    yield "default", db.engine, db.async_session_maker
+    if not config.TENANCY_ENABLED:
+        return
+    for tenant in tenant_registry.known_tenants():
+        if not closed_tenants and tenant_registry.peek(tenant) is None:
+            continue
+        async with tenant_registry.borrow(tenant) as database:
+            yield tenant, database.engine, database.session_maker
+
+
+def _requests_waiting() -> bool:
+    from app.admission import limiters
+
+    return any(limiter.queued for limiter in limiters.values())
+
+
+async def run_job(job: MaintenanceJob) -> None:
+    """Run one job on every database and record the outcome"""
+    job.last_started_at = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    errors = []
+    async for name, engine, session_maker in _databases(job.closed_tenants):
+        try:
+            if job.session:
+                async with session_maker() as session:
+                    job.results[name] = await job.run(session, engine.url.database)
+            else:
+                async with engine.connect() as conn:
+                    conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                    job.results[name] = await job.run(conn, engine.url.database)
+        except Exception as exc:
+            logger.warning("Maintenance job %s failed on %s database: %s", job.name, name, exc)
+            job.results[name] = f"failed: {exc}"
+            errors.append(f"{name}: {exc}")
+    job.runs += 1
+    job.last_duration_ms = (time.perf_counter() - start) * 1000
+    job.last_error = "; ".join(errors) or None
+    if errors:
+        job.failures += 1
+
+
+def is_maintenance_worker() -> bool:
+    """Only one process per database runs the jobs: the one started with APP_WORKER_ID=0"""
+    return os.environ.get("APP_WORKER_ID") == "0"
+
+
+async def run_maintenance() -> None:
+    """Run the jobs on their cadences until cancelled"""
+    now = time.monotonic()
+    for job in jobs:
+        job.next_run = now if job.at_startup else now + job.interval()
+    while True:
+        now = time.monotonic()
+        for job in jobs:
+            if job.interval() <= 0 or job.next_run > now:
+                continue
+            if job.heavy and _requests_waiting():
+                job.next_run = now + config.MAINTENANCE_BUSY_RETRY_SECONDS
+                continue
+            await run_job(job)
+            job.next_run = time.monotonic() + job.interval()
+        due = [job.next_run for job in jobs if job.interval() > 0]
+        await asyncio.sleep(max(min(due) - time.monotonic(), 0.1) if due else 60)
+
+
+async def database_status(conn: AsyncConnection) -> Dict[str, object]:
+    """File size, free space, WAL size and auto_vacuum mode of the connection's database"""
+    page_size = await _pragma(conn, "page_size")
+    pages = await _pragma(conn, "page_count")
+    free = await _pragma(conn, "freelist_count")
+    auto_vacuum = await _pragma(conn, "auto_vacuum")
+    return {
+        "size_bytes": page_size * pages,
+        "free_bytes": page_size * free,
+        "wal_bytes": _wal_size(conn.engine.url.database),
+        "auto_vacuum": AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum)),
+    }
@@ -0,0 +1,148 @@
+"""
+Schema migrations for existing SQLite databases
+
+``create_all()`` only creates missing tables; it never changes a table that
+already exists. Changes to existing tables live here as ordered, synchronous
+steps. The number of applied steps is stored in SQLite's ``user_version``
+pragma. A database created from scratch already has the current schema, so it
+is stamped with the latest version without running the steps.
+"""
+import logging
+from typing import Callable, List, Set
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+
+def _unique_feedback_per_interview(conn: Connection) -> None:
+    """Keep the first feedback of every interview, then enforce uniqueness"""
+    result = conn.execute(text(
+        "DELETE FROM feedback WHERE id NOT IN "
+        "(SELECT MIN(id) FROM feedback GROUP BY interview_id)"
+    ))
+    if result.rowcount:
+        logger.warning("Removed %s duplicate feedback rows", result.rowcount)
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_feedback_interview_id ON feedback (interview_id)"
+    ))
+
+
+def _columns(conn: Connection, table: str) -> Set[str]:
+    return {column["name"] for column in inspect(conn).get_columns(table)}
+
+
+def _interviewer_schedule_index(conn: Connection) -> None:
+    # Superseded by the interviewer_id index when the names are interned
+    if "interviewer" not in _columns(conn, "interviews"):
+        return
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_interviews_interviewer_scheduled_at "
+        "ON interviews (interviewer, scheduled_at)"
+    ))
+
+
+def _intern_column(conn: Connection, table: str, column: str, lookup: str, foreign_key: str) -> None:
+    """Replace a text column by an id into a lookup table of distinct values"""
+    if column not in _columns(conn, table):
+        return
+    conn.execute(text(f"INSERT OR IGNORE INTO {lookup} (name) SELECT DISTINCT {column} FROM {table}"))
+    # SQLite can't add a NOT NULL column without a default; the ORM always sets it
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {foreign_key} INTEGER REFERENCES {lookup} (id)"))
+    conn.execute(text(
+        f"UPDATE {table} SET {foreign_key} = (SELECT id FROM {lookup} WHERE name = {table}.{column})"
+    ))
+    conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+
+
+def _intern_interviewers_and_positions(conn: Connection) -> None:
+    conn.execute(text("DROP INDEX IF EXISTS ix_interviews_interviewer_scheduled_at"))
+    _intern_column(conn, "interviews", "interviewer", "interviewers", "interviewer_id")
+    _intern_column(conn, "candidates", "position", "positions", "position_id")
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_interviews_interviewer_id_scheduled_at "
+        "ON interviews (interviewer_id, scheduled_at)"
+    ))
+
+
+def _feedback_full_text_index(conn: Connection) -> None:
+    from app.models.feedback import FEEDBACK_FTS_DDL
+
+    for statement in FEEDBACK_FTS_DDL:
+        conn.execute(text(statement))
+    # Index the comments that already exist
+    conn.execute(text("INSERT INTO feedback_fts (feedback_fts) VALUES ('rebuild')"))
+
+
+def _candidate_feedback_scores(conn: Connection) -> None:
+    """Add the denormalized feedback score columns and fill them from existing feedback"""
+    if "rating_sum" not in _columns(conn, "candidates"):
+        conn.execute(text("ALTER TABLE candidates ADD COLUMN rating_sum INTEGER NOT NULL DEFAULT 0"))
+        conn.execute(text("ALTER TABLE candidates ADD COLUMN rating_count INTEGER NOT NULL DEFAULT 0"))
+        conn.execute(text("ALTER TABLE candidates ADD COLUMN avg_rating FLOAT"))
+    conn.execute(text(
+        "UPDATE candidates SET (rating_sum, rating_count) = "
+        "(SELECT COALESCE(SUM(feedback.rating), 0), COUNT(feedback.id) FROM feedback "
+        "JOIN interviews ON interviews.id = feedback.interview_id "
+        "WHERE interviews.candidate_id = candidates.id)"
+    ))
+    conn.execute(text(
+        "UPDATE candidates SET avg_rating = "
+        "CASE WHEN rating_count > 0 THEN CAST(rating_sum AS FLOAT) / rating_count END"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_candidates_position_id_avg_rating "
+        "ON candidates (position_id, avg_rating, rating_count)"
+    ))
+
+
+def _archived_candidate_emails(conn: Connection) -> None:
+    """Copy archived candidates' emails out of their documents, for duplicate checks"""
+    if "email" not in _columns(conn, "archived_candidates"):
+        # SQLite can't add a NOT NULL column without a default; the ORM always sets it
+        conn.execute(text("ALTER TABLE archived_candidates ADD COLUMN email VARCHAR(100)"))
+    conn.execute(text(
+        "UPDATE archived_candidates SET email = json_extract(document, '$.email') WHERE email IS NULL"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_archived_candidates_email ON archived_candidates (email)"
+    ))
+
+
+# Append new steps at the end; never reorder or remove applied ones
+MIGRATIONS: List[Callable[[Connection], None]] = [
+    _unique_feedback_per_interview,
+    _interviewer_schedule_index,
+    _intern_interviewers_and_positions,
+    _feedback_full_text_index,
+    _candidate_feedback_scores,
+    _archived_candidate_emails,
+]
+
+
+def get_version(conn: Connection) -> int:
+    return conn.execute(text("PRAGMA user_version")).scalar()
+
+
+def _set_version(conn: Connection, version: int) -> None:
+    conn.execute(text(f"PRAGMA user_version = {int(version)}"))
+
+
+def prepare_schema(conn: Connection) -> None:
+    """Create missing tables and bring an existing database up to date"""
+    from app.models import Base
+
+    existing = inspect(conn).has_table("candidates")
+    Base.metadata.create_all(conn)
+
+    if not existing:
+        _set_version(conn, len(MIGRATIONS))
+        return
+
+    for version, step in enumerate(MIGRATIONS, start=1):
+        if version <= get_version(conn):
+            continue
+        logger.info("Applying migration %s: %s", version, step.__name__)
+        step(conn)
+        _set_version(conn, version)
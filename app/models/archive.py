@@ -0,0 +1,24 @@
+from sqlalchemy import DateTime, Enum, String, Text, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from . import Base
+from .candidate import CandidateStatus
+import uuid
+from datetime import datetime, timezone
+
+
+class ArchivedCandidate(Base):
+    """Cold tier: a closed candidate with interviews, feedback and timeline as one document"""
+    
+    __tablename__ = "archived_candidates"
+    
+    candidate_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    # Archived emails stay taken; POST /candidates checks this index too
+    email: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    status: Mapped[CandidateStatus] = mapped_column(Enum(CandidateStatus), nullable=False)
+    
+    # Candidate's own created_at, so archived candidates list in the usual order
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+    
+    # Serialized CandidateDetailResponse
+    document: Mapped[str] = mapped_column(Text, nullable=False)
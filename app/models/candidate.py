@@ -1,11 +1,11 @@
-from typing import TYPE_CHECKING
-from sqlalchemy import String, Enum, DateTime
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from typing import Optional, TYPE_CHECKING
+from sqlalchemy import String, Enum, DateTime, Float, ForeignKey, Index, Integer, UUID, select
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 from . import Base, create_created_at, create_updated_at
+from .dimension import Position
 import enum
 import uuid
 from datetime import datetime
-from sqlalchemy.dialects.postgresql import UUID
 
 if TYPE_CHECKING:
     from .interview import Interview
@@ -20,6 +20,11 @@ class Candidate(Base):
     """Candidate model representing a job applicant."""
     
     __tablename__ = 'candidates'
+    __table_args__ = (
+        # Serves GET /candidates/ranked: a position's best-rated candidates are
+        # read by scanning this index backwards, without aggregating feedback
+        Index("ix_candidates_position_id_avg_rating", "position_id", "avg_rating", "rating_count"),
+    )
     
     # UUID primary key (matching your requirements)
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
@@ -27,9 +32,21 @@ class Candidate(Base):
     # Core fields (matching your requirements exactly)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     email: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
-    position: Mapped[str] = mapped_column(String(100), nullable=False)
+    position_id: Mapped[int] = mapped_column(ForeignKey("positions.id"), nullable=False)
     status: Mapped[CandidateStatus] = mapped_column(Enum(CandidateStatus), default=CandidateStatus.APPLIED)
     
+    # Position name, read through the lookup table; set alongside position_id
+    position: Mapped[str] = column_property(
+        select(Position.name).where(Position.id == position_id).scalar_subquery(),
+        expire_on_flush=False
+    )
+    
+    # Feedback score, kept current by add_feedback in the same transaction;
+    # avg_rating stays NULL until the first feedback
+    rating_sum: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    rating_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    avg_rating: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    
     # Timestamps
     created_at: Mapped[datetime] = create_created_at()
     updated_at: Mapped[datetime] = create_updated_at()
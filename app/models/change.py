@@ -0,0 +1,21 @@
+from sqlalchemy import Integer, String, Text, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from . import Base
+from datetime import datetime, timezone
+
+
+class Change(Base):
+    """Transactional outbox: one row per committed write, in commit order"""
+    
+    __tablename__ = "changes"
+    # AUTOINCREMENT: sequence numbers are never reused, even after compaction
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    
+    # Same names as the /events types, e.g. "candidate.status_changed"
+    type: Mapped[str] = mapped_column(String(50), nullable=False)
+    entity_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)  # JSON delta
+    
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
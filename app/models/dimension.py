@@ -0,0 +1,21 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+from . import Base
+
+
+class Interviewer(Base):
+    """Interned interviewer name, referenced by id from interviews"""
+    
+    __tablename__ = "interviewers"
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+
+
+class Position(Base):
+    """Interned position name, referenced by id from candidates"""
+    
+    __tablename__ = "positions"
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
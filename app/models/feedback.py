@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import DDL, String, Integer, ForeignKey, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from . import Base
 from typing import TYPE_CHECKING
@@ -11,8 +11,8 @@ class Feedback(Base):
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     
-    # Foreign key to interview
-    interview_id: Mapped[int] = mapped_column(Integer, ForeignKey("interviews.id"), nullable=False)
+    # Foreign key to interview (at most one feedback per interview)
+    interview_id: Mapped[int] = mapped_column(Integer, ForeignKey("interviews.id"), nullable=False, unique=True, index=True)
     
     # Feedback details (matching your requirements exactly)
     rating: Mapped[int] = mapped_column(Integer, nullable=False)  # 1-5 rating
@@ -20,3 +20,23 @@ class Feedback(Base):
     
     # Relationships
     interview: Mapped['Interview'] = relationship("Interview", back_populates="feedback")
+
+
+# Full-text index over comments (FTS5, external content: the text is stored
+# once, in feedback). Triggers keep it in sync with every insert, update and
+# delete, including bulk deletes that bypass the ORM.
+FEEDBACK_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS feedback_fts USING fts5("
+    "comment, content='feedback', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS feedback_fts_insert AFTER INSERT ON feedback BEGIN "
+    "INSERT INTO feedback_fts (rowid, comment) VALUES (new.id, new.comment); END",
+    "CREATE TRIGGER IF NOT EXISTS feedback_fts_delete AFTER DELETE ON feedback BEGIN "
+    "INSERT INTO feedback_fts (feedback_fts, rowid, comment) VALUES ('delete', old.id, old.comment); END",
+    "CREATE TRIGGER IF NOT EXISTS feedback_fts_update AFTER UPDATE OF comment ON feedback BEGIN "
+    "INSERT INTO feedback_fts (feedback_fts, rowid, comment) VALUES ('delete', old.id, old.comment); "
+    "INSERT INTO feedback_fts (rowid, comment) VALUES (new.id, new.comment); END",
+]
+
+for statement in FEEDBACK_FTS_DDL:
+    event.listen(Feedback.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Feedback.__table__, "before_drop", DDL("DROP TABLE IF EXISTS feedback_fts").execute_if(dialect="sqlite"))
@@ -0,0 +1,19 @@
+from sqlalchemy import Integer, String, Text, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from . import Base
+from datetime import datetime, timezone
+
+
+class IdempotencyRecord(Base):
+    """Response of a POST that was sent with an Idempotency-Key header"""
+    
+    __tablename__ = "idempotency_keys"
+    
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    
+    # Hash of method, path and body: a key may only be reused for the same request
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[int] = mapped_column(Integer, nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
@@ -1,10 +1,10 @@
-from sqlalchemy import String, DateTime, Text, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DateTime, Text, ForeignKey, Index, UUID, select
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 from . import Base
+from .dimension import Interviewer
 from typing import Optional, TYPE_CHECKING
 from datetime import datetime
 import uuid
-from sqlalchemy.dialects.postgresql import UUID
 
 if TYPE_CHECKING:
     from .candidate import Candidate
@@ -12,6 +12,10 @@ if TYPE_CHECKING:
 
 class Interview(Base):
     __tablename__ = "interviews"
+    __table_args__ = (
+        # Serves interviewer calendars and double-booking checks as range scans
+        Index("ix_interviews_interviewer_id_scheduled_at", "interviewer_id", "scheduled_at"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     
@@ -19,10 +23,16 @@ class Interview(Base):
     candidate_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("candidates.id"), nullable=False)
     
     # Interview details (matching your requirements exactly)
-    interviewer: Mapped[str] = mapped_column(String(100), nullable=False)
+    interviewer_id: Mapped[int] = mapped_column(ForeignKey("interviewers.id"), nullable=False)
     scheduled_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     result: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
+    # Interviewer name, read through the lookup table; set alongside interviewer_id
+    interviewer: Mapped[str] = column_property(
+        select(Interviewer.name).where(Interviewer.id == interviewer_id).scalar_subquery(),
+        expire_on_flush=False
+    )
+    
     # Relationships
     candidate: Mapped['Candidate'] = relationship("Candidate", back_populates="interviews")
     feedback: Mapped[list['Feedback']] = relationship("Feedback", back_populates="interview")
\ No newline at end of file
@@ -0,0 +1,19 @@
+from sqlalchemy import ForeignKey, Text, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from . import Base, create_updated_at
+import uuid
+from datetime import datetime
+
+
+class CandidateTimeline(Base):
+    """Denormalized read model: a candidate's full history as one JSON document"""
+    
+    __tablename__ = "candidate_timelines"
+    
+    # One document per candidate, looked up by primary key
+    candidate_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("candidates.id"), primary_key=True)
+    
+    # Serialized CandidateDetailResponse, returned to clients as-is
+    document: Mapped[str] = mapped_column(Text, nullable=False)
+    
+    updated_at: Mapped[datetime] = create_updated_at()
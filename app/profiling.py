@@ -0,0 +1,225 @@
+"""
+On-demand request profiling - Job Interview Management System
+
+With ``PROFILING_ENABLED=1`` single requests can be profiled in production:
+
+- A request is profiled when it sends ``X-Profile: 1`` together with
+  ``X-Profile-Token: <PROFILING_TOKEN>``, or at random with probability
+  ``PROFILING_SAMPLE_RATE``. The response then carries ``X-Profile-Id``.
+  Open-ended streams (GET /events) are never sampled at random: their
+  profile would only be kept when the client disconnects.
+- A sampling thread records the request's stack every
+  ``PROFILING_INTERVAL_MS``. While the request's task runs, that is the
+  event loop thread's stack. While the task is suspended in an ``await``
+  (for example waiting for a query on the database thread), it is the chain
+  of suspended coroutines, ending in an ``[await]`` frame. The flame graph
+  therefore splits wall time between SQL waits, ORM loading, validation and
+  JSON encoding per handler, and other requests sharing the loop don't
+  appear in it.
+- The last ``PROFILING_BUFFER_SIZE`` profiles are kept in memory. They can be
+  downloaded from GET /admin/profiles/{id} as speedscope JSON
+  (https://www.speedscope.app) or as folded stacks for flamegraph.pl; this
+  needs the same token.
+"""
+import asyncio
+import random
+import secrets
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Header, HTTPException, status
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import config
+
+PROFILE_HEADER = "x-profile"
+TOKEN_HEADER = "x-profile-token"
+
+# (function, file, first line)
+Frame = Tuple[str, str, int]
+Stack = Tuple[Frame, ...]
+
+AWAIT_FRAME: Frame = ("[await]", "", 0)
+
+
+@dataclass
+class Profile:
+    method: str
+    path: str
+    interval_ms: float
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    status_code: int = 0
+    duration_ms: float = 0.0
+    stacks: "Counter[Stack]" = field(default_factory=Counter)
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def folded(self) -> str:
+        """Folded stacks, one ``frame;frame;... count`` line each (flamegraph.pl input)"""
+        return "".join(
+            ";".join(_label(frame) for frame in stack) + f" {count}\n"
+            for stack, count in self.stacks.items()
+        )
+
+    def speedscope(self) -> Dict[str, Any]:
+        """Sampled profile in the speedscope file format"""
+        frames: Dict[Frame, int] = {}
+        samples = []
+        weights = []
+        for stack, count in self.stacks.items():
+            samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+            weights.append(count * self.interval_ms)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.method} {self.path}",
+            "exporter": "candidate-management-api",
+            "shared": {"frames": [
+                {"name": name, "file": file, "line": line} if file else {"name": name}
+                for name, file, line in frames
+            ]},
+            "profiles": [{
+                "type": "sampled",
+                "name": f"{self.method} {self.path}",
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": self.duration_ms,
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+def _label(frame: Frame) -> str:
+    name, file, line = frame
+    return f"{name} ({file}:{line})" if file else name
+
+
+def _frame(frame: FrameType) -> Frame:
+    code = frame.f_code
+    return (code.co_name, code.co_filename, code.co_firstlineno)
+
+
+class Sampler(threading.Thread):
+    """Sample one asyncio task's stack from a background thread"""
+
+    def __init__(self, task: asyncio.Task, profile: Profile):
+        super().__init__(name=f"profiler-{profile.id}", daemon=True)
+        self.task = task
+        self.profile = profile
+        self.loop = task.get_loop()
+        self.thread_id = threading.get_ident()
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        interval = self.profile.interval_ms / 1000
+        while not self._done.wait(interval):
+            stack = self._sample()
+            if stack:
+                self.profile.stacks[stack] += 1
+
+    async def stop(self) -> None:
+        """Stop sampling; waits for the last sample off the event loop"""
+        self._done.set()
+        await asyncio.to_thread(self.join)
+
+    def _sample(self) -> Stack:
+        root = self.task.get_coro().cr_frame
+        if asyncio.current_task(self.loop) is self.task:
+            # Running: the loop thread's stack from the task's coroutine up
+            frames: List[FrameType] = []
+            frame = sys._current_frames().get(self.thread_id)
+            while frame is not None:
+                frames.append(frame)
+                if frame is root:
+                    break
+                frame = frame.f_back
+            return tuple(_frame(frame) for frame in reversed(frames))
+
+        # Suspended: follow the chain of awaited coroutines
+        stack = []
+        awaitable = self.task.get_coro()
+        while awaitable is not None:
+            frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "ag_frame", None)
+            if frame is None:
+                break
+            stack.append(_frame(frame))
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "ag_await", None)
+        if stack:
+            stack.append(AWAIT_FRAME)
+        return tuple(stack)
+
+
+profiles: "OrderedDict[str, Profile]" = OrderedDict()
+
+# Streaming routes that only end when the client goes away
+UNSAMPLED_PATHS = ("/events",)
+
+
+def _remember(profile: Profile) -> None:
+    profiles[profile.id] = profile
+    while len(profiles) > config.PROFILING_BUFFER_SIZE:
+        profiles.popitem(last=False)
+
+
+def token_matches(token: Optional[str]) -> bool:
+    return bool(config.PROFILING_TOKEN) and token is not None and secrets.compare_digest(
+        token.encode(), config.PROFILING_TOKEN.encode()
+    )
+
+
+# Dependency for the profile download routes
+def require_profiling_token(token: Optional[str] = Header(None, alias="X-Profile-Token")) -> None:
+    if not token_matches(token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="A valid X-Profile-Token is required"
+        )
+
+
+class ProfilingMiddleware:
+    """Profile requests that ask for it (with the token) or are sampled"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    def _wanted(self, scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+        if headers.get(PROFILE_HEADER) == "1" and token_matches(headers.get(TOKEN_HEADER)):
+            return True
+        if scope["path"].startswith(UNSAMPLED_PATHS):
+            return False
+        return random.random() < config.PROFILING_SAMPLE_RATE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not config.PROFILING_ENABLED or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(method=scope["method"], path=scope["path"], interval_ms=config.PROFILING_INTERVAL_MS)
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Profile-Id", profile.id)
+            await send(message)
+
+        sampler = Sampler(asyncio.current_task(), profile)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            await sampler.stop()
+            profile.duration_ms = (time.perf_counter() - start) * 1000
+            _remember(profile)
@@ -0,0 +1,216 @@
+"""
+Shared statements of the hot paths - Job Interview Management System
+
+Building ``select(Candidate).where(Candidate.id == candidate_id)`` on every
+request costs Python time twice: constructing the statement, and then
+walking it to compute the cache key SQLAlchemy looks up in the engine's
+compiled cache. The statements here are built once, at import, with named
+``bindparam`` placeholders, and are executed with a parameter dict:
+
+    await db.execute(queries.CANDIDATE_BY_ID, {"candidate_id": candidate_id})
+
+A constant statement memoizes its cache key, so each execution costs one
+dictionary lookup in the compiled cache (``SQL_QUERY_CACHE_SIZE`` entries per
+engine) and no compilation. Parameters are named after what they hold;
+IN-lists use expanding parameters, so lists of any length share one entry.
+
+Compiled-cache hits and misses are counted for GET /admin/query-cache.
+``python -m benchmarks.queries`` compares the per-request overhead with that
+of building the statements inline.
+"""
+from collections import Counter
+from typing import Dict, Tuple
+
+from sqlalchemy import Float, bindparam, cast, column, event, func, literal_column, select, table, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.orm import selectinload
+
+from app.models.archive import ArchivedCandidate
+from app.models.candidate import Candidate
+from app.models.change import Change
+from app.models.dimension import Interviewer, Position
+from app.models.feedback import Feedback
+from app.models.idempotency import IdempotencyRecord
+from app.models.interview import Interview
+
+# Candidates
+
+CANDIDATE_BY_ID = select(Candidate).where(Candidate.id == bindparam("candidate_id"))
+
+CANDIDATE_ID = select(Candidate.id).where(Candidate.id == bindparam("candidate_id"))
+
+CANDIDATE_BY_EMAIL = select(Candidate).where(Candidate.email == bindparam("email"))
+
+# Emails of archived candidates stay taken
+ARCHIVED_EMAIL_TAKEN = (
+    select(ArchivedCandidate.candidate_id)
+    .where(ArchivedCandidate.email == bindparam("email"))
+    .limit(1)
+)
+
+CANDIDATE_WITH_INTERVIEWS = CANDIDATE_BY_ID.options(
+    selectinload(Candidate.interviews).selectinload(Interview.feedback)
+)
+
+CANDIDATE_LIST = (
+    select(Candidate)
+    .options(selectinload(Candidate.interviews).selectinload(Interview.feedback))
+    .order_by(Candidate.created_at)
+)
+
+CANDIDATE_IDS_IN = select(Candidate.id).where(Candidate.id.in_(bindparam("candidate_ids", expanding=True)))
+
+# Best average rating first, then most rated interviews; a backwards range
+# scan of ix_candidates_position_id_avg_rating
+RANKED_CANDIDATES = (
+    select(
+        Candidate.id,
+        Candidate.name,
+        Candidate.email,
+        Candidate.position,
+        Candidate.status,
+        Candidate.avg_rating,
+        Candidate.rating_count,
+    )
+    .where(Candidate.position_id == bindparam("position_id"), Candidate.avg_rating.is_not(None))
+    .order_by(Candidate.avg_rating.desc(), Candidate.rating_count.desc())
+    .limit(bindparam("limit"))
+)
+
+# Adds one feedback rating to the score of the interview's candidate and
+# returns its id. The candidate is read from the interviews table, not a
+# cache, since interview ids can be reused after a delete. SET expressions see
+# the old values
+ADD_CANDIDATE_RATING = (
+    update(Candidate)
+    .where(Candidate.id == (
+        select(Interview.candidate_id).where(Interview.id == bindparam("interview_id")).scalar_subquery()
+    ))
+    .values(
+        rating_sum=Candidate.rating_sum + bindparam("rating"),
+        rating_count=Candidate.rating_count + 1,
+        avg_rating=cast(Candidate.rating_sum + bindparam("rating"), Float) / (Candidate.rating_count + 1),
+        # Not a status change, which is what archiving goes by
+        updated_at=Candidate.updated_at
+    )
+    .returning(Candidate.id)
+    .execution_options(synchronize_session=False)
+)
+
+# Interviews
+
+INTERVIEW_CANDIDATE_ID = select(Interview.candidate_id).where(Interview.id == bindparam("interview_id"))
+
+INTERVIEWS_OF_CANDIDATE = (
+    select(Interview)
+    .where(Interview.candidate_id == bindparam("candidate_id"))
+    .order_by(Interview.scheduled_at)
+)
+
+INTERVIEWS_OF_CANDIDATES = (
+    select(Interview)
+    .where(Interview.candidate_id.in_(bindparam("candidate_ids", expanding=True)))
+    .order_by(Interview.scheduled_at)
+)
+
+INTERVIEW_IDS_IN = select(Interview.id).where(Interview.id.in_(bindparam("interview_ids", expanding=True)))
+
+# An interview of the interviewer starting strictly between after and before
+INTERVIEWER_CONFLICT = (
+    select(Interview.id)
+    .where(
+        Interview.interviewer_id == bindparam("interviewer_id"),
+        Interview.scheduled_at > bindparam("after"),
+        Interview.scheduled_at < bindparam("before")
+    )
+    .limit(1)
+)
+
+
+def _interviewer_schedule(start: bool, end: bool):
+    query = select(Interview).where(Interview.interviewer_id == bindparam("interviewer_id"))
+    if start:
+        query = query.where(Interview.scheduled_at >= bindparam("start"))
+    if end:
+        query = query.where(Interview.scheduled_at < bindparam("end"))
+    return query.order_by(Interview.scheduled_at)
+
+
+# (has start, has end) -> the interviewer's interviews in that range
+INTERVIEWER_SCHEDULE = {
+    (start, end): _interviewer_schedule(start, end)
+    for start in (False, True)
+    for end in (False, True)
+}
+
+# Feedback
+
+FEEDBACK_OF_INTERVIEW = select(Feedback).where(Feedback.interview_id == bindparam("interview_id"))
+
+FEEDBACK_OF_INTERVIEWS = select(Feedback).where(Feedback.interview_id.in_(bindparam("interview_ids", expanding=True)))
+
+feedback_fts = table("feedback_fts", column("rowid"), column("rank"))
+_fts = literal_column("feedback_fts")
+
+# FTS5 ranks the matches itself (rank = bm25)
+FEEDBACK_SEARCH = (
+    select(
+        Feedback.id,
+        Feedback.interview_id,
+        Interview.candidate_id,
+        Feedback.rating,
+        Feedback.comment,
+        func.snippet(_fts, 0, "[", "]", "…", 16).label("snippet"),
+        feedback_fts.c.rank.label("score"),
+    )
+    .select_from(feedback_fts)
+    .join(Feedback, Feedback.id == feedback_fts.c.rowid)
+    .join(Interview, Interview.id == Feedback.interview_id)
+    .where(
+        _fts.op("MATCH")(bindparam("q")),
+        Feedback.rating.between(bindparam("min_rating"), bindparam("max_rating"))
+    )
+    .order_by(feedback_fts.c.rank)
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+
+# Lookups, outbox and idempotency
+
+DIMENSION_ID = {
+    model: select(model.id).where(model.name == bindparam("name"))
+    for model in (Interviewer, Position)
+}
+
+CHANGES_SINCE = (
+    select(Change)
+    .where(Change.seq > bindparam("since"))
+    .order_by(Change.seq)
+    .limit(bindparam("limit"))
+)
+
+IDEMPOTENCY_RECORD = select(IdempotencyRecord).where(
+    IdempotencyRecord.key == bindparam("key"),
+    IdempotencyRecord.created_at >= bindparam("cutoff")
+)
+
+
+# Compiled-cache outcomes of executed statements, counted over all engines
+cache_stats: "Counter[str]" = Counter()
+
+_OUTCOMES: Dict[object, str] = {CACHE_HIT: "hits", CACHE_MISS: "misses"}
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _count_cache_outcome(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Textual SQL and DDL have no cache key; they count as uncached
+    cache_stats[_OUTCOMES.get(getattr(context, "cache_hit", None), "uncached")] += 1
+
+
+def compiled_cache_usage(engine: Engine) -> Tuple[int, int]:
+    """Entries in the engine's compiled cache and its capacity"""
+    cache = engine._compiled_cache
+    if cache is None:
+        return 0, 0
+    return len(cache), cache.capacity
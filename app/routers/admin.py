@@ -0,0 +1,220 @@
+"""
+Admin API Router - Job Interview Management System
+
+Endpoints:
+- GET /admin/admission: Concurrency, queue depth and rejections per limited route
+- POST /admin/archive: Move long-closed candidates to the archive now (needs X-Admin-Token)
+- GET /admin/tenants: Candidate and interview counts of every tenant database (needs X-Admin-Token)
+- POST /admin/tenants/{tenant}: Create a tenant database (needs X-Admin-Token)
+- POST /admin/backups: Start an online backup (or a compacted snapshot) (needs X-Admin-Token)
+- GET /admin/backups: Recent backup jobs (needs X-Admin-Token)
+- GET /admin/backups/{job_id}: Progress of one backup job (needs X-Admin-Token)
+- GET /admin/profiles: Recent request profiles (needs X-Profile-Token)
+- GET /admin/profiles/{profile_id}: Download a profile as speedscope JSON or folded stacks
+- GET /admin/slow-queries: Slowest statement fingerprints by total time, with query plans
+- GET /admin/query-cache: Compiled-statement cache size and hit rate
+"""
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import JSONResponse
+from typing import List, Literal, Optional, Tuple
+import secrets
+
+from app import config
+from app.admission import limiters
+from app.archive import archive_closed_candidates
+from app.backup import BACKUP, SNAPSHOT, BackupInProgress, get_job, recent_jobs, start_backup
+from app.db import get_db_session
+from app.models.candidate import Candidate
+from app.models.interview import Interview
+from app.profiling import profiles, require_profiling_token
+from app.queries import cache_stats, compiled_cache_usage
+from app.schemas.admin import (
+    AdmissionStats,
+    ArchiveResult,
+    BackupJobResponse,
+    ProfileSummary,
+    QueryCacheStats,
+    SlowQueryStats,
+    TenantStats,
+)
+from app.slow_queries import top_queries
+from app.tenancy import TENANT_ID, fan_out, session_tenant, tenant_registry
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+# Dependency for the routes that write files or expose data
+def require_admin_token(token: Optional[str] = Header(None, alias="X-Admin-Token")) -> None:
+    if not (config.ADMIN_TOKEN and token is not None and secrets.compare_digest(
+        token.encode(), config.ADMIN_TOKEN.encode()
+    )):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="A valid X-Admin-Token is required"
+        )
+
+
+@router.get("/admission", response_model=List[AdmissionStats])
+async def get_admission_stats() -> List[AdmissionStats]:
+    """Current load and rejection counts of every admission-controlled route"""
+    
+    return [
+        AdmissionStats(
+            route=limiter.name,
+            kind=limiter.kind,
+            max_concurrency=limiter.max_concurrency,
+            max_queue=limiter.max_queue,
+            active=limiter.active,
+            queued=limiter.queued,
+            admitted=limiter.admitted,
+            rejected=limiter.rejected
+        )
+        for limiter in limiters.values()
+    ]
+
+
+@router.post("/archive", response_model=ArchiveResult, dependencies=[Depends(require_admin_token)])
+async def run_archive(
+    db: AsyncSession = Depends(get_db_session)
+) -> ArchiveResult:
+    """Archive closed candidates older than ARCHIVE_AFTER_DAYS"""
+    
+    archived = await archive_closed_candidates(db, config.ARCHIVE_AFTER_DAYS, config.ARCHIVE_BATCH_SIZE)
+    
+    return ArchiveResult(archived=archived)
+
+
+async def _counts(db: AsyncSession) -> Tuple[int, int]:
+    candidates = await db.scalar(select(func.count()).select_from(Candidate))
+    interviews = await db.scalar(select(func.count()).select_from(Interview))
+    return candidates, interviews
+
+
+@router.get("/tenants", response_model=List[TenantStats], dependencies=[Depends(require_admin_token)])
+async def get_tenant_stats() -> List[TenantStats]:
+    """Query every tenant database concurrently; closed ones are opened only for the report"""
+    
+    was_open = set(tenant_registry.open_tenants)
+    counts = await fan_out(_counts)
+    
+    return [
+        TenantStats(tenant=tenant, open=tenant in was_open, candidates=candidates, interviews=interviews)
+        for tenant, (candidates, interviews) in counts.items()
+    ]
+
+
+@router.post("/tenants/{tenant}", response_model=TenantStats, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(require_admin_token)])
+async def create_tenant(tenant: str) -> TenantStats:
+    """Create the tenant's database (or open an existing one) so its requests are accepted"""
+    if not TENANT_ID.match(tenant):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid tenant id"
+        )
+    
+    await tenant_registry.create(tenant)
+    async with tenant_registry.borrow(tenant) as database, database.session_maker() as db:
+        candidates, interviews = await _counts(db)
+    
+    return TenantStats(tenant=tenant, open=True, candidates=candidates, interviews=interviews)
+
+
+@router.post("/backups", response_model=BackupJobResponse, status_code=status.HTTP_202_ACCEPTED,
+             dependencies=[Depends(require_admin_token)])
+async def create_backup(
+    snapshot: bool = Query(False, description="Write a compacted copy with VACUUM INTO"),
+    db: AsyncSession = Depends(get_db_session)
+) -> BackupJobResponse:
+    """Back up the request's database in the background"""
+    
+    try:
+        job = start_backup(db.bind, SNAPSHOT if snapshot else BACKUP, session_tenant(db.sync_session))
+    except BackupInProgress:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A backup is already running"
+        )
+    
+    return job
+
+
+@router.get("/backups", response_model=List[BackupJobResponse], dependencies=[Depends(require_admin_token)])
+async def list_backups() -> List[BackupJobResponse]:
+    """Recent backup jobs, newest first"""
+    
+    return recent_jobs()
+
+
+@router.get("/backups/{job_id}", response_model=BackupJobResponse, dependencies=[Depends(require_admin_token)])
+async def get_backup(job_id: str) -> BackupJobResponse:
+    """Progress of a backup job"""
+    
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Backup job not found"
+        )
+    
+    return job
+
+
+@router.get("/profiles", response_model=List[ProfileSummary], dependencies=[Depends(require_profiling_token)])
+async def list_profiles() -> List[ProfileSummary]:
+    """Profiles in the ring buffer, newest first"""
+    
+    return list(reversed(profiles.values()))
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_profiling_token)])
+async def get_profile(
+    profile_id: str,
+    profile_format: Literal["speedscope", "folded"] = Query("speedscope", alias="format")
+) -> Response:
+    """Download a profile for speedscope or flamegraph.pl"""
+    
+    profile = profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    if profile_format == "folded":
+        return Response(
+            content=profile.folded(),
+            media_type="text/plain",
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'}
+        )
+    return JSONResponse(
+        content=profile.speedscope(),
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.speedscope.json"'}
+    )
+
+
+@router.get("/slow-queries", response_model=List[SlowQueryStats])
+async def list_slow_queries(
+    limit: int = Query(20, ge=1, le=200)
+) -> List[SlowQueryStats]:
+    """Statements slower than SLOW_QUERY_MS, grouped by fingerprint, by total time"""
+    
+    return top_queries(limit)
+
+
+@router.get("/query-cache", response_model=QueryCacheStats)
+async def get_query_cache_stats(db: AsyncSession = Depends(get_db_session)) -> QueryCacheStats:
+    """Compiled-statement cache of the request's database, and hits since startup"""
+    
+    entries, capacity = compiled_cache_usage(db.bind.sync_engine)
+    hits, misses = cache_stats["hits"], cache_stats["misses"]
+    return QueryCacheStats(
+        entries=entries,
+        capacity=capacity,
+        hits=hits,
+        misses=misses,
+        uncached=cache_stats["uncached"],
+        hit_ratio=hits / (hits + misses) if hits + misses else 0.0
+    )
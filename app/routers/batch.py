@@ -0,0 +1,76 @@
+"""
+Batch lookup API Router - Job Interview Management System
+
+Endpoints:
+- GET /interviews?candidate_id=<id>&candidate_id=<id>...: Interviews of several candidates
+- GET /feedback?interview_id=<id>&interview_id=<id>...: Feedback of several interviews
+
+Views that show several candidates would otherwise call
+GET /candidates/{id}/interviews once per candidate, two queries each. These
+endpoints resolve all ids with one IN query per table, so N parents cost
+two queries. Results are grouped by parent id; ids that don't exist are
+listed in ``missing`` instead of failing the whole request.
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+import uuid
+
+from app import queries
+from app.admission import READ, admission
+from app.db import get_db_session
+from app.schemas.feedback import FeedbackByInterview
+from app.schemas.interview import InterviewsByCandidate
+
+router = APIRouter(tags=["batch"])
+
+# Upper bound on ids per request, keeping the IN lists (and responses) small
+MAX_IDS = 100
+
+
+@router.get("/interviews", response_model=InterviewsByCandidate,
+            dependencies=[Depends(admission("batch_interviews", READ))])
+async def list_interviews_by_candidate(
+    candidate_ids: List[uuid.UUID] = Query(..., alias="candidate_id", min_length=1, max_length=MAX_IDS),
+    db: AsyncSession = Depends(get_db_session)
+) -> InterviewsByCandidate:
+    """List the interviews of several candidates, grouped by candidate"""
+    
+    candidate_ids = list(dict.fromkeys(candidate_ids))
+    
+    result = await db.execute(queries.CANDIDATE_IDS_IN, {"candidate_ids": candidate_ids})
+    found = set(result.scalars().all())
+    
+    result = await db.execute(queries.INTERVIEWS_OF_CANDIDATES, {"candidate_ids": list(found)})
+    interviews = {candidate_id: [] for candidate_id in candidate_ids if candidate_id in found}
+    for interview in result.scalars():
+        interviews[interview.candidate_id].append(interview)
+    
+    return InterviewsByCandidate(
+        interviews=interviews,
+        missing=[candidate_id for candidate_id in candidate_ids if candidate_id not in found]
+    )
+
+
+@router.get("/feedback", response_model=FeedbackByInterview,
+            dependencies=[Depends(admission("batch_feedback", READ))])
+async def list_feedback_by_interview(
+    interview_ids: List[int] = Query(..., alias="interview_id", min_length=1, max_length=MAX_IDS),
+    db: AsyncSession = Depends(get_db_session)
+) -> FeedbackByInterview:
+    """List the feedback of several interviews, grouped by interview"""
+    
+    interview_ids = list(dict.fromkeys(interview_ids))
+    
+    result = await db.execute(queries.INTERVIEW_IDS_IN, {"interview_ids": interview_ids})
+    found = set(result.scalars().all())
+    
+    result = await db.execute(queries.FEEDBACK_OF_INTERVIEWS, {"interview_ids": list(found)})
+    feedback = {interview_id: [] for interview_id in interview_ids if interview_id in found}
+    for item in result.scalars():
+        feedback[item.interview_id].append(item)
+    
+    return FeedbackByInterview(
+        feedback=feedback,
+        missing=[interview_id for interview_id in interview_ids if interview_id not in found]
+    )
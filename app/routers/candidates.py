@@ -4,35 +4,55 @@ Candidate API Router - Job Interview Management System
 Endpoints:
 - POST /candidates: Create a new candidate
 - GET /candidates: List all candidates with their interviews
+- GET /candidates/ranked?position=&limit=: Best-rated candidates for a position
+- GET /candidates/{id}: Get one candidate with interviews, feedback and timeline
 - PATCH /candidates/{id}: Update candidate status
 - DELETE /candidates/{id}: Delete a candidate
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from typing import List
+from pydantic import TypeAdapter
+from typing import List, Optional
+import heapq
 import uuid
 
-from app.db import get_db_session
+from app import queries
+from app.admission import READ, WRITE, admission
+from app.archive import delete_candidate_rows, list_archived, load_archived
+from app.db import get_db_session, run_write
+from app.changes import record_change
+from app.dimensions import lookup_id, resolve_id
+from app.existence import record_created
+from app.idempotency import Idempotency, get_idempotency
 from app.models.candidate import Candidate
+from app.models.dimension import Position
 from app.models.interview import Interview
-from app.models.feedback import Feedback
-from app.schemas.candidate import CandidateCreate, CandidateUpdate, CandidateResponse, CandidateResponseBase
+from app.schemas.candidate import (
+    CandidateCreate,
+    CandidateUpdate,
+    CandidateResponse,
+    CandidateResponseBase,
+    CandidateDetailResponse,
+    RankedCandidate,
+)
+from app.single_flight import read_flights
+from app.tenancy import current_tenant
+from app.timeline import load_timeline, record_candidate_created, record_status_changed
 
 router = APIRouter(prefix="/candidates", tags=["candidates"])
 
+_candidate_list = TypeAdapter(List[CandidateResponse])
 
-@router.post("/", response_model=CandidateResponseBase, status_code=status.HTTP_201_CREATED)
-async def create_candidate(
-    candidate_data: CandidateCreate,
-    db: AsyncSession = Depends(get_db_session)
-) -> CandidateResponseBase:
-    """Create a new candidate"""
+
+async def _insert_candidate(db: AsyncSession, candidate_data: CandidateCreate) -> Candidate:
+    """Insert a candidate inside the caller's transaction"""
     
-    # Check if email already exists
-    result = await db.execute(select(Candidate).where(Candidate.email == candidate_data.email))
+    # Check if email already exists, in the hot tier or the archive
+    result = await db.execute(queries.CANDIDATE_BY_EMAIL, {"email": candidate_data.email})
     existing_candidate = result.scalar_one_or_none()
+    if existing_candidate is None:
+        result = await db.execute(queries.ARCHIVED_EMAIL_TAKEN, {"email": candidate_data.email})
+        existing_candidate = result.scalar_one_or_none()
     
     if existing_candidate:
         raise HTTPException(
@@ -44,47 +64,125 @@ async def create_candidate(
     candidate = Candidate(
         name=candidate_data.name,
         email=candidate_data.email,
+        position_id=await resolve_id(db, Position, candidate_data.position),
         position=candidate_data.position
     )
     
     db.add(candidate)
-    await db.commit()
-    await db.refresh(candidate)
+    await db.flush()
+    record_created(db, candidate)
+    await record_candidate_created(db, candidate)
+    record_change(db, "candidate.created", candidate.id, CandidateResponseBase.model_validate(candidate).model_dump(mode="json"))
+    
+    return candidate
+
+
+@router.post("/", response_model=CandidateResponseBase, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(admission("create_candidate", WRITE))])
+async def create_candidate(
+    candidate_data: CandidateCreate,
+    db: AsyncSession = Depends(get_db_session),
+    idempotency: Idempotency = Depends(get_idempotency)
+) -> CandidateResponseBase:
+    """Create a new candidate"""
+    
+    # Retry of a request that already succeeded
+    if idempotency.replay is not None:
+        return idempotency.replay
+    
+    candidate = await run_write(db, idempotency.wrap(
+        lambda session: _insert_candidate(session, candidate_data),
+        CandidateResponseBase,
+        status.HTTP_201_CREATED
+    ))
     
     return candidate
 
 
-@router.get("/", response_model=List[CandidateResponse])
+@router.get("/", response_model=List[CandidateResponse], dependencies=[Depends(admission("list_candidates", READ))])
 async def list_candidates(
+    include_archived: bool = Query(False, description="Also list archived (closed) candidates"),
     db: AsyncSession = Depends(get_db_session)
 ) -> List[CandidateResponse]:
     """List all candidates with their interviews and feedback"""
     
-    # Use selectinload to eagerly load interviews and their feedback
-    result = await db.execute(
-        select(Candidate)
-        .options(
-            selectinload(Candidate.interviews).selectinload(Interview.feedback)
-        )
-        .order_by(Candidate.created_at)
-    )
-    candidates = result.scalars().all()
+    async def serialize() -> bytes:
+        # Interviews and their feedback are eagerly loaded with selectinload
+        result = await db.execute(queries.CANDIDATE_LIST)
+        candidates = result.scalars().all()
+        
+        # The cold tier is only read when asked for
+        if include_archived:
+            merged = heapq.merge(
+                [(candidate.created_at, candidate) for candidate in candidates],
+                await list_archived(db),
+                # Both are UTC; values loaded from SQLite are naive
+                key=lambda entry: entry[0].replace(tzinfo=None)
+            )
+            candidates = [candidate for _, candidate in merged]
+        
+        # Validated, not dumped from the ORM objects, so timestamps are
+        # serialized like every other candidate response
+        return _candidate_list.dump_json(_candidate_list.validate_python(candidates, from_attributes=True))
     
-    return candidates
+    # Concurrent identical requests share one query and serialization
+    body = await read_flights.do(("list_candidates", current_tenant.get(), include_archived), serialize)
+    
+    return Response(content=body, media_type="application/json")
 
 
-@router.patch("/{candidate_id}", response_model=CandidateResponseBase)
-async def update_candidate_status(
+# Declared before /{candidate_id}, which would otherwise match "ranked"
+@router.get("/ranked", response_model=List[RankedCandidate],
+            dependencies=[Depends(admission("ranked_candidates", READ))])
+async def list_ranked_candidates(
+    position: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_db_session)
+) -> List[RankedCandidate]:
+    """Candidates for a position with feedback, best average rating first"""
+    
+    position_id = await lookup_id(db, Position, position)
+    if position_id is None:
+        return []
+    
+    # Reads the top `limit` entries of the (position_id, avg_rating) index;
+    # the scores are maintained by add_feedback, nothing is aggregated here
+    result = await db.execute(queries.RANKED_CANDIDATES, {"position_id": position_id, "limit": limit})
+    
+    return result.all()
+
+
+@router.get("/{candidate_id}", response_model=CandidateDetailResponse)
+async def get_candidate(
     candidate_id: uuid.UUID,
-    update_data: CandidateUpdate,
     db: AsyncSession = Depends(get_db_session)
-) -> CandidateResponseBase:
-    """Update candidate status"""
+) -> CandidateDetailResponse:
+    """Get a candidate with interviews, feedback and status history"""
+    
+    async def load() -> Optional[str]:
+        document = await load_timeline(db, candidate_id)
+        if document is None:
+            document = await load_archived(db, candidate_id)
+        return document
+    
+    # Single primary-key lookup of the pre-serialized read model (hot tier,
+    # then archive), shared by concurrent requests for the same candidate
+    document = await read_flights.do(("get_candidate", current_tenant.get(), candidate_id), load)
+    
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Candidate not found"
+        )
+    
+    return Response(content=document, media_type="application/json")
+
+
+async def _update_status(db: AsyncSession, candidate_id: uuid.UUID, update_data: CandidateUpdate) -> Candidate:
+    """Change a candidate's status inside the caller's transaction"""
     
     # Find candidate
-    result = await db.execute(
-        select(Candidate).where(Candidate.id == candidate_id)
-    )
+    result = await db.execute(queries.CANDIDATE_BY_ID, {"candidate_id": candidate_id})
     candidate = result.scalar_one_or_none()
     
     if not candidate:
@@ -95,33 +193,54 @@ async def update_candidate_status(
     
     # Update status
     candidate.status = update_data.status
-    await db.commit()
-    await db.refresh(candidate)
+    await db.flush()
+    await record_status_changed(db, candidate)
+    serialized = CandidateResponseBase.model_validate(candidate).model_dump(mode="json")
+    record_change(db, "candidate.status_changed", candidate.id, {
+        key: serialized[key] for key in ("id", "status", "updated_at")
+    })
     
     return candidate
 
 
-@router.delete("/{candidate_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_candidate(
+@router.patch("/{candidate_id}", response_model=CandidateResponseBase,
+              dependencies=[Depends(admission("update_candidate_status", WRITE))])
+async def update_candidate_status(
     candidate_id: uuid.UUID,
+    update_data: CandidateUpdate,
     db: AsyncSession = Depends(get_db_session)
-):
-    """Delete a candidate and all associated interviews and feedback"""
+) -> CandidateResponseBase:
+    """Update candidate status"""
+    
+    candidate = await run_write(db, lambda session: _update_status(session, candidate_id, update_data))
+    
+    return candidate
+
+
+async def _delete_candidate(db: AsyncSession, candidate_id: uuid.UUID) -> None:
+    """Delete a candidate inside the caller's transaction"""
     
     # Find candidate
-    result = await db.execute(
-        select(Candidate).where(Candidate.id == candidate_id)
-    )
-    candidate = result.scalar_one_or_none()
+    result = await db.execute(queries.CANDIDATE_ID, {"candidate_id": candidate_id})
     
-    if not candidate:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Candidate not found"
         )
     
-    # Delete candidate (this will cascade to interviews and feedback due to foreign keys)
-    await db.delete(candidate)
-    await db.commit()
+    await delete_candidate_rows(db, candidate_id)
+    record_change(db, "candidate.deleted", candidate_id, {"id": str(candidate_id)})
+
+
+@router.delete("/{candidate_id}", status_code=status.HTTP_204_NO_CONTENT,
+               dependencies=[Depends(admission("delete_candidate", WRITE))])
+async def delete_candidate(
+    candidate_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Delete a candidate and all associated interviews and feedback"""
+    
+    await run_write(db, lambda session: _delete_candidate(session, candidate_id))
     
     return None
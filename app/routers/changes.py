@@ -0,0 +1,60 @@
+"""
+Changes API Router - Job Interview Management System
+
+Endpoints:
+- GET /changes?since=<seq>&limit=<n>: Changes committed after ``since``, in order
+
+Downstream systems keep the last ``next_since`` they processed and poll from
+there, so a sync costs O(changes) instead of re-reading every candidate.
+Old changes are compacted after ``CHANGES_RETENTION_DAYS``; a client whose
+cursor points into the compacted range gets 410 and must resync from a
+full snapshot (GET /candidates).
+"""
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import queries
+from app.admission import READ, admission
+from app.changes import oldest_retained_seq
+from app.db import get_db_session
+from app.schemas.change import ChangeResponse, ChangesPage
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+@router.get("", response_model=ChangesPage, dependencies=[Depends(admission("list_changes", READ))])
+async def list_changes(
+    since: int = Query(0, ge=0, description="Last sequence number already processed"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db_session)
+) -> ChangesPage:
+    """List changes committed after `since`"""
+    
+    # Range scan on the primary key; one extra row tells whether more remain
+    result = await db.execute(queries.CHANGES_SINCE, {"since": since, "limit": limit + 1})
+    changes = result.scalars().all()
+    
+    if since and (not changes or changes[0].seq != since + 1):
+        oldest = await oldest_retained_seq(db)
+        if oldest > since + 1:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Changes after this sequence number were compacted; resync from a snapshot"
+            )
+    
+    page = changes[:limit]
+    return ChangesPage(
+        changes=[
+            ChangeResponse(
+                seq=change.seq,
+                type=change.type,
+                entity_id=change.entity_id,
+                payload=json.loads(change.payload),
+                created_at=change.created_at
+            )
+            for change in page
+        ],
+        next_since=page[-1].seq if page else since,
+        has_more=len(changes) > limit
+    )
@@ -0,0 +1,69 @@
+"""
+Events API Router - Job Interview Management System
+
+Endpoints:
+- GET /events: Stream changes as Server-Sent Events
+
+Event types: candidate.created, candidate.status_changed, candidate.deleted,
+interview.scheduled, feedback.added and resync. A resync event means the
+client missed changes and should refetch the data it shows.
+
+Event ids are the sequence numbers of GET /changes, so they mean the same
+on every worker. Reconnecting clients resume by sending the ``Last-Event-ID``
+header, which browsers' EventSource does automatically, or the
+``last_event_id`` query parameter.
+"""
+import asyncio
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.changes import subscribe_changes
+from app.config import EVENTS_KEEPALIVE_SECONDS
+from app.events import RESYNC, EventHub, Subscription, event_hub, hub_for
+from app.tenancy import current_tenant, session_maker_for_request
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+async def _stream(request: Request, subscription: Subscription, hub: Optional[EventHub] = None) -> AsyncIterator[str]:
+    hub = hub or event_hub
+    try:
+        # Ask EventSource clients to reconnect after 3 seconds
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), EVENTS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            
+            yield event.encode()
+            if event.type == RESYNC and subscription.overflowed:
+                # Dropped for falling behind; the client refetches and reconnects
+                break
+    finally:
+        hub.unsubscribe(subscription)
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    last_event_id: Optional[str] = Query(None, description="Resume after this event id")
+) -> StreamingResponse:
+    """Stream candidate, interview and feedback changes"""
+    
+    hub = hub_for(current_tenant.get())
+    subscription = await subscribe_changes(
+        hub, await session_maker_for_request(), last_event_id_header or last_event_id
+    )
+    
+    return StreamingResponse(
+        _stream(request, subscription, hub),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,45 @@
+"""
+Export API Router - Job Interview Management System
+
+Endpoints:
+- GET /export/candidates: Flat candidate table
+- GET /export/interviews: Flat interview table
+- GET /export/feedback: Flat feedback table
+
+``format`` is ``csv`` (default), ``arrow`` (Arrow IPC stream) or ``parquet``.
+The last two need the optional pyarrow package. The body is streamed as it
+is read from the database.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import config
+from app.admission import READ, admission
+from app.db import get_db_session
+from app.export import FILE_EXTENSIONS, MEDIA_TYPES, ExportFormat, ExportTable, available_formats, export_table
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+@router.get("/{table}", dependencies=[Depends(admission("export", READ))])
+async def export(
+    table: ExportTable,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    include_archived: bool = Query(False, description="Also export archived candidates"),
+    db: AsyncSession = Depends(get_db_session)
+) -> StreamingResponse:
+    """Stream a table as CSV, Arrow or Parquet"""
+    
+    if export_format not in available_formats():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"The {export_format.value} format needs the pyarrow package"
+        )
+    
+    filename = f"{table.value}.{FILE_EXTENSIONS[export_format]}"
+    return StreamingResponse(
+        export_table(db, table, export_format, include_archived, config.EXPORT_BATCH_SIZE),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -12,48 +12,41 @@ Educational Notes:
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
 
+from app import queries
+from app.admission import WRITE, admission
 from app.db import get_db_session
-from app.models.interview import Interview
+from app.changes import record_change
+from app.existence import INTERVIEWS, forget, interview_candidate_id, is_foreign_key_violation
+from app.idempotency import Idempotency, get_idempotency
 from app.models.feedback import Feedback
 from app.schemas.feedback import FeedbackCreate, FeedbackResponse
+from app.timeline import record_feedback_added
+from app.write_queue import WriteQueue, get_write_queue, submit_write
 
 # Note: We use /interviews prefix since feedback belongs to interviews
 router = APIRouter(prefix="/interviews", tags=["feedback"])
 
 
-# TODO: Implement POST endpoint here
-@router.post("/{interview_id}/feedback", response_model=FeedbackResponse, status_code=status.HTTP_201_CREATED)
-async def add_feedback(
-    interview_id: int,
-    feedback_data: FeedbackCreate,
-    db: AsyncSession = Depends(get_db_session)
-) -> FeedbackResponse:
-    """Add feedback to an interview"""
-    
-    # Step 1: Check if interview exists
-    result = await db.execute(select(Interview).where(Interview.id == interview_id))
-    interview = result.scalar_one_or_none()
-    
-    if not interview:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Interview not found"
-        )
-    
-    # Step 2: Check if feedback already exists (business rule)
-    result = await db.execute(select(Feedback).where(Feedback.interview_id == interview_id))
-    existing_feedback = result.scalar_one_or_none()
+def _interview_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Interview not found"
+    )
+
+
+async def _insert_feedback(db: AsyncSession, interview_id: int, feedback_data: FeedbackCreate) -> Feedback:
+    """Insert feedback inside the caller's transaction"""
     
-    if existing_feedback:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Feedback already exists for this interview"
-        )
+    # Step 1: Check if interview exists (usually answered from the existence cache)
+    candidate_id = await interview_candidate_id(db, interview_id)
+    if candidate_id is None:
+        raise _interview_not_found()
     
-    # Step 3: Create new feedback
+    # Step 2: Create new feedback; the unique index on interview_id enforces
+    # "one feedback per interview" (business rule), even under concurrency
     feedback = Feedback(
         interview_id=interview_id,
         rating=feedback_data.rating,
@@ -61,8 +54,55 @@ async def add_feedback(
     )
     
     db.add(feedback)
-    await db.commit()
-    await db.refresh(feedback)
+    try:
+        await db.flush()
+    except IntegrityError as exc:
+        if is_foreign_key_violation(exc):
+            # Deleted by another process since it was cached
+            forget(db, INTERVIEWS, interview_id)
+            raise _interview_not_found()
+        if "feedback.interview_id" not in str(exc.orig):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Feedback already exists for this interview"
+        )
+    
+    # The candidate's score changes in the same transaction. Its id comes from
+    # the interview row: another worker may have deleted the cached interview
+    # and SQLite reused the id for someone else's
+    result = await db.execute(queries.ADD_CANDIDATE_RATING, {"interview_id": interview_id, "rating": feedback.rating})
+    owner = result.scalar_one()
+    if owner != candidate_id:
+        forget(db, INTERVIEWS, interview_id)
+    await record_feedback_added(db, owner, feedback)
+    record_change(db, "feedback.added", feedback.id, FeedbackResponse.model_validate(feedback).model_dump(mode="json"))
+    
+    return feedback
+
+
+# TODO: Implement POST endpoint here
+@router.post("/{interview_id}/feedback", response_model=FeedbackResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(admission("add_feedback", WRITE))])
+async def add_feedback(
+    interview_id: int,
+    feedback_data: FeedbackCreate,
+    db: AsyncSession = Depends(get_db_session),
+    write_queue: Optional[WriteQueue] = Depends(get_write_queue),
+    idempotency: Idempotency = Depends(get_idempotency)
+) -> FeedbackResponse:
+    """Add feedback to an interview"""
+    
+    # Retry of a request that already succeeded
+    if idempotency.replay is not None:
+        return idempotency.replay
+    
+    # Commits on its own or as part of a group commit when the write queue is on
+    feedback = await submit_write(db, write_queue, idempotency.wrap(
+        lambda session: _insert_feedback(session, interview_id, feedback_data),
+        FeedbackResponse,
+        status.HTTP_201_CREATED
+    ))
     
     return feedback
 
@@ -75,22 +115,16 @@ async def get_interview_feedback(
 ) -> List[FeedbackResponse]:
     """Get feedback for an interview"""
     
-    # Step 1: Check if interview exists
-    result = await db.execute(select(Interview).where(Interview.id == interview_id))
-    interview = result.scalar_one_or_none()
+    # Step 1: Check if interview exists (usually answered from the existence cache)
+    if await interview_candidate_id(db, interview_id) is None:
+        raise _interview_not_found()
     
-    if not interview:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Interview not found"
-        )
-    
-    # Step 2: Get all feedback for this interview
-    result = await db.execute(
-        select(Feedback)
-        .where(Feedback.interview_id == interview_id)
-        .order_by(Feedback.id)
-    )
+    # Step 2: Get the feedback for this interview (point lookup on the unique index)
+    result = await db.execute(queries.FEEDBACK_OF_INTERVIEW, {"interview_id": interview_id})
     feedback_list = result.scalars().all()
     
+    # No feedback could also mean the cached interview was deleted meanwhile
+    if not feedback_list and await interview_candidate_id(db, interview_id, fresh=True) is None:
+        raise _interview_not_found()
+    
     return feedback_list
@@ -0,0 +1,53 @@
+"""
+Interviewers API Router - Job Interview Management System
+
+Endpoints:
+- GET /interviewers/{interviewer}/schedule?from=&to=: An interviewer's interviews, in order
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional
+
+from app import queries
+from app.admission import READ, admission
+from app.db import get_db_session
+from app.dimensions import lookup_id
+from app.models.dimension import Interviewer
+from app.models.interview import Interview
+from app.schemas.interview import InterviewResponse
+
+router = APIRouter(prefix="/interviewers", tags=["interviewers"])
+
+
+@router.get("/{interviewer}/schedule", response_model=List[InterviewResponse],
+            dependencies=[Depends(admission("get_interviewer_schedule", READ))])
+async def get_interviewer_schedule(
+    interviewer: str,
+    start: Optional[datetime] = Query(None, alias="from", description="Earliest start time (inclusive)"),
+    end: Optional[datetime] = Query(None, alias="to", description="Latest start time (exclusive)"),
+    db: AsyncSession = Depends(get_db_session)
+) -> List[InterviewResponse]:
+    """List an interviewer's interviews starting within [from, to)"""
+    
+    if start is not None and end is not None and end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must be after 'from'"
+        )
+    
+    interviewer_id = await lookup_id(db, Interviewer, interviewer)
+    if interviewer_id is None:
+        return []
+    
+    # Range scan on the (interviewer_id, scheduled_at) index, already in order
+    params = {"interviewer_id": interviewer_id}
+    if start is not None:
+        params["start"] = start
+    if end is not None:
+        params["end"] = end
+    query = queries.INTERVIEWER_SCHEDULE[(start is not None, end is not None)]
+    result = await db.execute(query, params)
+    interviews = result.scalars().all()
+    
+    return interviews
@@ -7,48 +7,111 @@ Endpoints:
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
-from typing import List
+from datetime import datetime, timedelta
+from typing import List, Optional
 import uuid
 
+from app import config, queries
+from app.admission import WRITE, admission
 from app.db import get_db_session
-from app.models.candidate import Candidate
+from app.changes import record_change
+from app.dimensions import resolve_id
+from app.existence import CANDIDATES, candidate_exists, forget, is_foreign_key_violation, record_created
+from app.idempotency import Idempotency, get_idempotency
+from app.models.dimension import Interviewer
 from app.models.interview import Interview
 from app.models.feedback import Feedback
 from app.schemas.interview import InterviewCreate, InterviewResponse
+from app.timeline import record_interview_scheduled
+from app.write_queue import WriteQueue, get_write_queue, submit_write
 
 router = APIRouter(prefix="/candidates", tags=["interviews"])
 
 
-@router.post("/{candidate_id}/interviews", response_model=InterviewResponse, status_code=status.HTTP_201_CREATED)
-async def schedule_interview(
-    candidate_id: uuid.UUID,
-    interview_data: InterviewCreate,
-    db: AsyncSession = Depends(get_db_session)
-) -> InterviewResponse:
-    """Schedule a new interview for a candidate"""
+def _candidate_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Candidate not found"
+    )
+
+
+async def _find_conflict(db: AsyncSession, interviewer_id: int, scheduled_at: datetime) -> Optional[int]:
+    """Id of an interview of the interviewer overlapping one starting at ``scheduled_at``"""
+    duration = timedelta(minutes=config.INTERVIEW_DURATION_MINUTES)
+    if not duration:
+        return None
     
-    # Check if candidate exists
-    result = await db.execute(select(Candidate).where(Candidate.id == candidate_id))
-    candidate = result.scalar_one_or_none()
+    # All interviews last the same, so two overlap iff they start less than one
+    # duration apart: a single seek on (interviewer_id, scheduled_at)
+    result = await db.execute(queries.INTERVIEWER_CONFLICT, {
+        "interviewer_id": interviewer_id,
+        "after": scheduled_at - duration,
+        "before": scheduled_at + duration
+    })
+    return result.scalar_one_or_none()
+
+
+async def _insert_interview(db: AsyncSession, candidate_id: uuid.UUID, interview_data: InterviewCreate) -> Interview:
+    """Insert an interview inside the caller's transaction"""
     
-    if not candidate:
+    # Check if candidate exists (usually answered from the existence cache)
+    if not await candidate_exists(db, candidate_id):
+        raise _candidate_not_found()
+    
+    interviewer_id = await resolve_id(db, Interviewer, interview_data.interviewer)
+    if await _find_conflict(db, interviewer_id, interview_data.scheduled_at) is not None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate not found"
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Interviewer is already booked at this time"
         )
     
     # Create new interview
     interview = Interview(
         candidate_id=candidate_id,
+        interviewer_id=interviewer_id,
         interviewer=interview_data.interviewer,
         scheduled_at=interview_data.scheduled_at
     )
     
     db.add(interview)
-    await db.commit()
-    await db.refresh(interview)
+    try:
+        await db.flush()
+    except IntegrityError as exc:
+        if not is_foreign_key_violation(exc):
+            raise
+        # Deleted by another process since it was cached
+        forget(db, CANDIDATES, candidate_id)
+        raise _candidate_not_found()
+    record_created(db, interview)
+    await record_interview_scheduled(db, interview)
+    record_change(db, "interview.scheduled", interview.id, InterviewResponse.model_validate(interview).model_dump(mode="json"))
+    
+    return interview
+
+
+@router.post("/{candidate_id}/interviews", response_model=InterviewResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(admission("schedule_interview", WRITE))])
+async def schedule_interview(
+    candidate_id: uuid.UUID,
+    interview_data: InterviewCreate,
+    db: AsyncSession = Depends(get_db_session),
+    write_queue: Optional[WriteQueue] = Depends(get_write_queue),
+    idempotency: Idempotency = Depends(get_idempotency)
+) -> InterviewResponse:
+    """Schedule a new interview for a candidate"""
+    
+    # Retry of a request that already succeeded
+    if idempotency.replay is not None:
+        return idempotency.replay
+    
+    # Commits on its own or as part of a group commit when the write queue is on
+    interview = await submit_write(db, write_queue, idempotency.wrap(
+        lambda session: _insert_interview(session, candidate_id, interview_data),
+        InterviewResponse,
+        status.HTTP_201_CREATED
+    ))
     
     return interview
 
@@ -60,22 +123,16 @@ async def list_candidate_interviews(
 ) -> List[InterviewResponse]:
     """List all interviews for a candidate"""
     
-    # Check if candidate exists
-    result = await db.execute(select(Candidate).where(Candidate.id == candidate_id))
-    candidate = result.scalar_one_or_none()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate not found"
-        )
+    # Check if candidate exists (usually answered from the existence cache)
+    if not await candidate_exists(db, candidate_id):
+        raise _candidate_not_found()
     
     # Get all interviews for this candidate
-    result = await db.execute(
-        select(Interview)
-        .where(Interview.candidate_id == candidate_id)
-        .order_by(Interview.scheduled_at)
-    )
+    result = await db.execute(queries.INTERVIEWS_OF_CANDIDATE, {"candidate_id": candidate_id})
     interviews = result.scalars().all()
     
+    # No interviews could also mean the cached candidate was deleted meanwhile
+    if not interviews and not await candidate_exists(db, candidate_id, fresh=True):
+        raise _candidate_not_found()
+    
     return interviews
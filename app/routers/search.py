@@ -0,0 +1,80 @@
+"""
+Feedback search API Router - Job Interview Management System
+
+Endpoints:
+- GET /feedback/search?q=<query>&min_rating=&max_rating=: Full-text search over feedback comments
+
+Comments are indexed with SQLite FTS5 (``feedback_fts``, kept in sync by
+triggers), so a search reads only matching rows instead of every
+interview's feedback. ``q`` uses FTS5 query syntax: words are ANDed,
+``"system design"`` is a phrase, ``design*`` a prefix, and ``OR``/``NOT``
+combine terms. Words are stemmed, so ``design`` also finds ``designs``.
+Hits are ranked by BM25 and paginated with ``limit``/``offset``.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import queries
+from app.admission import READ, admission
+from app.db import get_db_session
+from app.schemas.feedback import FeedbackSearchHit, FeedbackSearchPage
+
+router = APIRouter(prefix="/feedback", tags=["feedback"])
+
+
+# Errors SQLite reports for a malformed MATCH expression (the user's input)
+_QUERY_ERRORS = (
+    "fts5: syntax error",
+    "no such column",  # column filter on an unknown column, e.g. "foo:bar"
+    "unterminated string",
+    "unknown special query",
+    "expected integer",  # NEAR(...) distance
+)
+
+
+def _is_query_error(exc: OperationalError) -> bool:
+    message = str(exc.orig).lower()
+    return any(message.startswith(prefix) for prefix in _QUERY_ERRORS)
+
+
+@router.get("/search", response_model=FeedbackSearchPage,
+            dependencies=[Depends(admission("search_feedback", READ))])
+async def search_feedback(
+    q: str = Query(..., min_length=1, max_length=200, description="FTS5 query"),
+    min_rating: int = Query(1, ge=1, le=5),
+    max_rating: int = Query(5, ge=1, le=5),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db_session)
+) -> FeedbackSearchPage:
+    """Feedback whose comment matches `q`, best matches first"""
+    
+    if min_rating > max_rating:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_rating must not be greater than max_rating"
+        )
+    
+    try:
+        # One extra row tells whether another page follows
+        result = await db.execute(queries.FEEDBACK_SEARCH, {
+            "q": q,
+            "min_rating": min_rating,
+            "max_rating": max_rating,
+            "limit": limit + 1,
+            "offset": offset
+        })
+    except OperationalError as exc:
+        if not _is_query_error(exc):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid search query"
+        )
+    rows = result.all()
+    
+    return FeedbackSearchPage(
+        hits=[FeedbackSearchHit.model_validate(row) for row in rows[:limit]],
+        next_offset=offset + limit if len(rows) > limit else None
+    )
@@ -1,16 +1,34 @@
 """
-Schema resolver to handle forward references in Pydantic models
+Schema helpers shared by the Pydantic models
 """
+from typing import Iterator, Type
 
-def resolve_all_references():
-    """Resolve all forward references in schemas"""
-    # Import all schemas first to make them available
-    from app.schemas import candidate, interview, feedback
-    
-    # Then import the resolver functions
-    from app.schemas.candidate import resolve_candidate_references
-    from app.schemas.interview import resolve_interview_references
-    
-    # Resolve in order
-    resolve_interview_references()
-    resolve_candidate_references()
+from pydantic import BaseModel
+
+
+def iter_schema_models() -> Iterator[Type[BaseModel]]:
+    """Yield every Pydantic model defined in the schema modules"""
+    from app.schemas import admin, candidate, change, interview, feedback
+
+    for module in (candidate, interview, feedback, change, admin):
+        for value in vars(module).values():
+            if (
+                isinstance(value, type)
+                and issubclass(value, BaseModel)
+                and value.__module__ == module.__name__
+            ):
+                yield value
+
+
+def build_all_schemas() -> int:
+    """Make sure every schema has its core schema and validator built
+
+    Models with unresolved forward references are rebuilt here instead of on
+    their first request. Returns the number of models checked.
+    """
+    count = 0
+    for model in iter_schema_models():
+        if not model.__pydantic_complete__:
+            model.model_rebuild()
+        count += 1
+    return count
@@ -0,0 +1,104 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+# Schema for GET /admin/admission
+class AdmissionStats(BaseModel):
+    route: str
+    kind: str
+    max_concurrency: int
+    max_queue: int
+    active: int
+    queued: int
+    admitted: int
+    rejected: int
+
+
+# Schema for POST /admin/archive
+class ArchiveResult(BaseModel):
+    archived: int
+
+
+# Schema for GET /admin/tenants
+class TenantStats(BaseModel):
+    tenant: str
+    open: bool
+    candidates: int
+    interviews: int
+
+
+# Schema for /admin/backups
+class BackupJobResponse(BaseModel):
+    id: str
+    kind: str
+    file: str
+    status: str
+    pages_total: int
+    pages_remaining: int
+    progress: float
+    started_at: datetime
+    finished_at: Optional[datetime]
+    error: Optional[str]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Schema for GET /admin/profiles
+class ProfileSummary(BaseModel):
+    id: str
+    method: str
+    path: str
+    status_code: int
+    started_at: datetime
+    duration_ms: float
+    samples: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Schema for GET /admin/slow-queries
+class SlowQueryStats(BaseModel):
+    fingerprint: str
+    statement: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    routes: Dict[str, int]
+    last_parameters: List[Any]
+    plan: List[str]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Schema for GET /admin/query-cache
+class QueryCacheStats(BaseModel):
+    entries: int
+    capacity: int
+    hits: int
+    misses: int
+    uncached: int
+    hit_ratio: float
+
+
+# Schema for the jobs in GET /ready
+class MaintenanceJobStatus(BaseModel):
+    name: str
+    runs: int
+    failures: int
+    last_started_at: Optional[datetime]
+    last_duration_ms: Optional[float]
+    last_error: Optional[str]
+    results: Dict[str, str]
+    next_run_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Schema for GET /ready
+class ReadinessResponse(BaseModel):
+    status: str
+    database: Dict[str, Any]
+    maintenance: List[MaintenanceJobStatus]
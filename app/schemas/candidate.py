@@ -1,9 +1,18 @@
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
-from typing import List, Optional
+from pydantic import AfterValidator, BaseModel, EmailStr, Field, ConfigDict
+from typing import Annotated, List, Optional
+from enum import Enum
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from app.models.candidate import CandidateStatus
 
+
+def _as_utc(value: datetime) -> datetime:
+    # Timestamps are written in UTC but SQLite returns them naive
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+# Server-set timestamp, serialized the same way whether it was just written or read back
+UTCDateTime = Annotated[datetime, AfterValidator(_as_utc)]
+
 # Basic feedback schema (to avoid circular imports)
 class FeedbackInCandidate(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -43,11 +52,45 @@ class CandidateResponseBase(BaseModel):
     email: str
     position: str
     status: CandidateStatus
-    created_at: datetime
-    updated_at: datetime
+    created_at: UTCDateTime
+    updated_at: UTCDateTime
 
 # Schema for GET /candidates (with interviews and feedback)
 class CandidateResponse(CandidateResponseBase):
     model_config = ConfigDict(from_attributes=True)
     
     interviews: List[InterviewInCandidate] = []
+
+# Schema for GET /candidates/ranked
+class RankedCandidate(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: uuid.UUID
+    name: str
+    email: str
+    position: str
+    status: CandidateStatus
+    avg_rating: float
+    rating_count: int
+
+# Kinds of entries in a candidate's timeline
+class TimelineEventType(str, Enum):
+    CANDIDATE_CREATED = "CANDIDATE_CREATED"
+    STATUS_CHANGED = "STATUS_CHANGED"
+    INTERVIEW_SCHEDULED = "INTERVIEW_SCHEDULED"
+    FEEDBACK_ADDED = "FEEDBACK_ADDED"
+
+class TimelineEvent(BaseModel):
+    type: TimelineEventType
+    # None for entries reconstructed from data recorded before timelines existed
+    at: Optional[UTCDateTime] = None
+    status: Optional[CandidateStatus] = None
+    interview_id: Optional[int] = None
+    interviewer: Optional[str] = None
+    scheduled_at: Optional[datetime] = None
+    feedback_id: Optional[int] = None
+    rating: Optional[int] = None
+
+# Schema for GET /candidates/{id} (candidate, interviews, feedback and history)
+class CandidateDetailResponse(CandidateResponse):
+    timeline: List[TimelineEvent] = []
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Dict, List
+from datetime import datetime
+
+# One entry of GET /changes
+class ChangeResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    seq: int
+    type: str
+    entity_id: str
+    payload: Dict[str, Any]
+    created_at: datetime
+
+# Schema for GET /changes
+class ChangesPage(BaseModel):
+    changes: List[ChangeResponse] = []
+    next_since: int = Field(..., description="Pass as `since` to fetch the following page")
+    has_more: bool
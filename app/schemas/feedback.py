@@ -1,4 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
+from typing import Dict, List, Optional
+import uuid
 
 # Schema for POST /interviews/{id}/feedback
 class FeedbackCreate(BaseModel):
@@ -12,4 +14,20 @@ class FeedbackResponse(BaseModel):
     id: int
     interview_id: int
     rating: int
-    comment: str  
+    comment: str
+
+# Schema for GET /feedback?interview_id=... (grouped by interview)
+class FeedbackByInterview(BaseModel):
+    feedback: Dict[int, List[FeedbackResponse]]
+    missing: List[int] = []
+
+# One hit of GET /feedback/search
+class FeedbackSearchHit(FeedbackResponse):
+    candidate_id: uuid.UUID
+    snippet: str = Field(..., description="Matching part of the comment, terms in [brackets]")
+    score: float = Field(..., description="BM25 relevance; lower is better")
+
+# Schema for GET /feedback/search
+class FeedbackSearchPage(BaseModel):
+    hits: List[FeedbackSearchHit] = []
+    next_offset: Optional[int] = Field(None, description="Pass as `offset` for the next page; null on the last one")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 import uuid
 
@@ -30,4 +30,9 @@ class InterviewWithFeedback(BaseModel):
     interviewer: str
     scheduled_at: datetime
     result: Optional[str] = None
-    feedback: List[FeedbackResponse] = []
\ No newline at end of file
+    feedback: List[FeedbackResponse] = []
+
+# Schema for GET /interviews?candidate_id=... (grouped by candidate)
+class InterviewsByCandidate(BaseModel):
+    interviews: Dict[uuid.UUID, List[InterviewResponse]]
+    missing: List[uuid.UUID] = []
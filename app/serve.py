@@ -0,0 +1,160 @@
+"""
+Production entry point - Job Interview Management System
+
+Usage:
+    python -m app.serve --workers 4 --host 0.0.0.0 --port 8000
+
+The parent process imports and warms up the app, creates the tables once,
+binds the listening socket and then forks the workers, so each worker starts
+with everything preloaded. Every worker builds its own database engine after
+the fork and serves with uvloop/httptools when they are installed. Workers
+that die are restarted; SIGINT/SIGTERM are forwarded for a graceful stop.
+Worker 0 (``APP_WORKER_ID=0``) also runs the scheduled backups and maintenance.
+
+On platforms without fork() it falls back to uvicorn's own multi-process mode,
+where those only run with a single worker.
+"""
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("app.serve")
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    from app.config import HOST, PORT, WEB_CONCURRENCY
+
+    parser = argparse.ArgumentParser(description="Run the API with several preloaded worker processes")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=WEB_CONCURRENCY)
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args(argv)
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+async def _prepare_database() -> None:
+    """Create tables once, then drop the parent's pooled connections before forking"""
+    from app import db
+
+    await db.create_tables()
+    await db.engine.dispose()
+
+
+def _run_worker(worker_id: int, sock: socket.socket, log_level: str) -> None:
+    import uvicorn
+
+    from app import db
+    from app.main import app
+
+    os.environ["APP_WORKER_ID"] = str(worker_id)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, signal.SIG_DFL)
+
+    # A fresh engine per process: no pooled connection crosses the fork
+    db.init_engine()
+
+    # "auto" picks uvloop and httptools whenever they are installed
+    config = uvicorn.Config(app, loop="auto", http="auto", lifespan="on", log_level=log_level)
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+
+
+def _spawn(worker_id: int, sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(worker_id, sock, log_level)
+        except BaseException:
+            logger.exception("Worker %s crashed", worker_id)
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def _supervise(workers: int, sock: socket.socket, log_level: str) -> None:
+    children: Dict[int, int] = {}
+    stopping = False
+
+    def _stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    for worker_id in range(workers):
+        children[_spawn(worker_id, sock, log_level)] = worker_id
+    logger.info("Started %s workers on %s", workers, sock.getsockname())
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        worker_id = children.pop(pid, None)
+        if worker_id is None or stopping:
+            continue
+        logger.warning("Worker %s (pid %s) exited with status %s, restarting", worker_id, pid, status)
+        children[_spawn(worker_id, sock, log_level)] = worker_id
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = _parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s:     %(message)s")
+
+    if not hasattr(os, "fork"):
+        import uvicorn
+
+        if args.workers == 1:
+            os.environ["APP_WORKER_ID"] = "0"
+        else:
+            # uvicorn's workers can't be told apart, so none of them may run the jobs
+            logger.warning("Without fork() backups and maintenance only run with --workers 1")
+        uvicorn.run("app.main:app", host=args.host, port=args.port, workers=args.workers, log_level=args.log_level)
+        return
+
+    from app import config
+    from app.main import app
+    from app.warmup import warm_up
+
+    warm_up(app)
+    asyncio.run(_prepare_database())
+    # The parent created the tables; workers must not race on create_all()
+    config.CREATE_TABLES_ON_STARTUP = False
+    sock = _bind_socket(args.host, args.port)
+
+    # Keep the preloaded heap out of the collector so workers share its pages
+    gc.collect()
+    gc.freeze()
+
+    _supervise(args.workers, sock, args.log_level)
+    sock.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
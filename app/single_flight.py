@@ -0,0 +1,59 @@
+"""
+Request coalescing for read routes - Job Interview Management System
+
+When many identical reads arrive at once (a dashboard refresh fanning out),
+only the first one runs the queries and serialization. Requests with the
+same key that arrive while it is in flight wait for it and share its
+serialized result, so a stampede costs one database execution instead of N.
+
+Only concurrent requests are coalesced; nothing is cached once the
+computation finishes. A request that joins a computation sees data as of
+that computation's start, the same as if it had arrived a moment earlier.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share one in-flight computation between concurrent callers with the same key"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        while key in self._inflight:
+            future = self._inflight[key]
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The caller that ran it went away; run it ourselves
+                if future.cancelled():
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.executions += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark as retrieved; the error is raised in this request anyway
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+
+read_flights = SingleFlight()
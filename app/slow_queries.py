@@ -0,0 +1,165 @@
+"""
+Slow-query log - Job Interview Management System
+
+``echo=True`` prints every statement. The slow-query log only keeps those
+that take ``SLOW_QUERY_MS`` or longer, timed with the engines'
+before/after_cursor_execute events:
+
+- Each slow statement is logged (logger ``app.slow_queries``) with its
+  duration, the route that ran it and its parameters. String parameters
+  (names, emails, ids) are redacted.
+- Statements are grouped by fingerprint: the SQL text with whitespace
+  collapsed and IN-lists of any length folded into one. GET
+  /admin/slow-queries lists the fingerprints with the highest total time.
+- The first time a SELECT, UPDATE or DELETE fingerprint is slow, its
+  ``EXPLAIN QUERY PLAN`` is captured on the same connection. A ``SCAN``
+  line in it means the statement has no index to use.
+"""
+import hashlib
+import logging
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app import config
+
+logger = logging.getLogger("app.slow_queries")
+
+_START = "slow_query_start"
+
+# ASGI scope of the request running the statement
+current_scope: ContextVar[Optional[Scope]] = ContextVar("current_scope", default=None)
+
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+
+@dataclass
+class QueryStats:
+    fingerprint: str
+    statement: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    routes: Dict[str, int] = field(default_factory=dict)
+    last_parameters: List[Any] = field(default_factory=list)
+    plan: List[str] = field(default_factory=list)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+# Fingerprint -> stats of its slow executions
+stats: Dict[str, QueryStats] = {}
+
+
+def normalize(statement: str) -> str:
+    """Statement text with whitespace collapsed and IN-lists folded"""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return _IN_LIST.sub("(?, ...)", statement)
+
+
+def _redact(parameters: Any) -> List[Any]:
+    if isinstance(parameters, dict):
+        parameters = list(parameters.values())
+    return [
+        value if value is None or isinstance(value, (bool, int, float)) else f"<{type(value).__name__}>"
+        for value in parameters or ()
+    ]
+
+
+def _route() -> str:
+    scope = current_scope.get()
+    if scope is None:
+        return "-"
+    route = scope.get("route")
+    return f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+
+
+def _explain(conn, statement: str, parameters: Any) -> List[str]:
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        return [row[3] for row in cursor.fetchall()]
+    except Exception as exc:
+        return [f"(no plan: {exc})"]
+    finally:
+        cursor.close()
+
+
+def _record(conn, statement: str, parameters: Any, executemany: bool, elapsed_ms: float) -> None:
+    text = normalize(statement)
+    fingerprint = hashlib.blake2b(text.encode(), digest_size=6).hexdigest()
+    route = _route()
+    redacted = [] if executemany else _redact(parameters)
+
+    entry = stats.get(fingerprint)
+    if entry is None:
+        if len(stats) >= config.SLOW_QUERY_MAX_FINGERPRINTS:
+            # Make room by forgetting the fingerprint that cost the least
+            del stats[min(stats.values(), key=lambda entry: entry.total_ms).fingerprint]
+        entry = stats[fingerprint] = QueryStats(fingerprint=fingerprint, statement=text)
+        if not executemany and text.upper().startswith(_EXPLAINABLE):
+            entry.plan = _explain(conn, statement, parameters)
+
+    entry.count += 1
+    entry.total_ms += elapsed_ms
+    entry.max_ms = max(entry.max_ms, elapsed_ms)
+    entry.routes[route] = entry.routes.get(route, 0) + 1
+    entry.last_parameters = redacted
+
+    logger.warning("Slow query (%.1f ms) on %s: %s %s", elapsed_ms, route, text, redacted)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    if config.SLOW_QUERY_ENABLED:
+        conn.info.setdefault(_START, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _check_duration(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get(_START)
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+    if elapsed_ms >= config.SLOW_QUERY_MS:
+        _record(conn, statement, parameters, executemany, elapsed_ms)
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_timer(context) -> None:
+    # after_cursor_execute doesn't run for a failed statement
+    starts = context.connection.info.get(_START) if context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def top_queries(limit: int) -> List[QueryStats]:
+    """Fingerprints with the highest total time first"""
+    return sorted(stats.values(), key=lambda entry: entry.total_ms, reverse=True)[:limit]
+
+
+class QueryContextMiddleware:
+    """Make the request's scope, and so its matched route, visible to the query log"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
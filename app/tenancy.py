@@ -0,0 +1,318 @@
+"""
+Per-tenant databases - Job Interview Management System
+
+Every hiring organization (tenant) can have its own SQLite database, so one
+tenant's bulk import only holds its own write lock. With
+``TENANCY_ENABLED=1`` a request selects its tenant with the ``X-Tenant-ID``
+header or a ``/t/<tenant>/...`` path prefix. Requests without a tenant use
+the default database (``DATABASE_URL``).
+
+- Tenant databases are opened lazily from ``TENANT_DATABASE_URL`` (a
+  template with ``{tenant}``) and get their schema on first use. Only tenants
+  with a database file or listed in ``TENANT_ALLOWLIST`` are opened; others
+  get 404 until ``POST /admin/tenants/{tenant}`` creates them. Each tenant is
+  opened under its own lock, so a slow migration only delays requests for
+  that tenant.
+- At most ``TENANT_MAX_OPEN_ENGINES`` engines stay open. Beyond that the
+  least recently used idle engines are evicted: the write queue is drained
+  and the engine disposed. A database is in use while a request holds it
+  (from the middleware until the response is sent) or a connection is
+  checked out; such engines stay open (over the limit) until a later request
+  finds them idle.
+- Sessions carry their tenant in ``session.info["tenant"]``. Per-database
+  caches (interned ids, idempotency keys) and the event hubs are keyed by it;
+  a tenant's hub is dropped when its engine is closed.
+- ``fan_out`` runs a query against every tenant concurrently, for admin
+  reports. Tenants that aren't open are migrated and read through a
+  temporary engine, closed afterwards, so the report doesn't evict the hot
+  tenants.
+"""
+import asyncio
+import glob
+import os
+import re
+from collections import OrderedDict
+from contextlib import AsyncExitStack, asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Set, TypeVar
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app import config
+from app.db import apply_schema, make_engine
+from app.events import discard_hub
+
+T = TypeVar("T")
+
+TENANT_HEADER = "x-tenant-id"
+TENANT_PATH_PREFIX = "/t/"
+TENANT_ID = re.compile(r"^[a-z0-9][a-z0-9_-]{0,62}$")
+
+# Tenant of the current request; None means the default database
+current_tenant: ContextVar[Optional[str]] = ContextVar("current_tenant", default=None)
+
+
+def session_tenant(session: Session) -> Optional[str]:
+    """Tenant whose database ``session`` is bound to"""
+    return session.info.get("tenant")
+
+
+class TenantDatabase:
+    """Engine, session factory and write queue of one tenant"""
+
+    def __init__(self, tenant: str, engine: AsyncEngine):
+        self.tenant = tenant
+        self.engine = engine
+        self.session_maker = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False, info={"tenant": tenant}
+        )
+        # Created on first use by app.write_queue.get_write_queue
+        self.write_queue: Optional[Any] = None
+        # Requests (and background tasks) currently using the database
+        self.users = 0
+
+    @property
+    def in_use(self) -> bool:
+        """Whether a request holds the database or one of the engine's connections"""
+        if self.users:
+            return True
+        checkedout = getattr(self.engine.sync_engine.pool, "checkedout", None)
+        return checkedout is not None and checkedout() > 0
+
+    async def close(self) -> None:
+        if self.write_queue is not None:
+            await self.write_queue.drain()
+        await self.engine.dispose()
+
+
+class UnknownTenant(Exception):
+    """The tenant has no database and isn't allowed to get one implicitly"""
+
+
+class EngineRegistry:
+    """Lazily opened tenant databases, with LRU eviction of idle ones"""
+
+    def __init__(self, url_template: str, max_open: int, allowed: Iterable[str] = ()):
+        self.url_template = url_template
+        self.max_open = max_open
+        # Tenants whose database is created on first use
+        self.allowed: Set[str] = set(allowed)
+        self._open: "OrderedDict[str, TenantDatabase]" = OrderedDict()
+        # Tenant -> lock held while it is being opened
+        self._opening: Dict[str, asyncio.Lock] = {}
+
+    def url_for(self, tenant: str) -> str:
+        return self.url_template.format(tenant=tenant)
+
+    def _path_for(self, tenant: str) -> Optional[str]:
+        path = make_url(self.url_for(tenant)).database
+        return path if path and path != ":memory:" else None
+
+    def exists(self, tenant: str) -> bool:
+        """Whether the tenant is open, has a database file or is on the allowlist"""
+        if tenant in self._open or tenant in self.allowed:
+            return True
+        path = self._path_for(tenant)
+        return path is not None and os.path.exists(path)
+
+    @asynccontextmanager
+    async def _lock(self, tenant: str) -> AsyncIterator[None]:
+        lock = self._opening.setdefault(tenant, asyncio.Lock())
+        try:
+            async with lock:
+                yield
+        finally:
+            # Waiters still holding the lock find the database in _open
+            if not lock.locked() and self._opening.get(tenant) is lock:
+                del self._opening[tenant]
+
+    async def _ensure_open(self, tenant: str, create: bool = False) -> TenantDatabase:
+        database = self._open.get(tenant)
+        if database is None:
+            if not create and not self.exists(tenant):
+                raise UnknownTenant(tenant)
+            async with self._lock(tenant):
+                # Another request may have opened it while we waited
+                database = self._open.get(tenant)
+                if database is None:
+                    database = await self._open_database(tenant)
+                    self._open[tenant] = database
+        self._open.move_to_end(tenant)
+        return database
+
+    async def get(self, tenant: str) -> TenantDatabase:
+        """The tenant's database, opened if needed; raises UnknownTenant"""
+        database = await self._ensure_open(tenant)
+        await self._close_evicted(tenant)
+        return database
+
+    async def create(self, tenant: str) -> TenantDatabase:
+        """Open the tenant's database, creating it if it doesn't exist yet"""
+        database = await self._ensure_open(tenant, create=True)
+        await self._close_evicted(tenant)
+        return database
+
+    @asynccontextmanager
+    async def using(self, tenant: str) -> AsyncIterator[TenantDatabase]:
+        """The tenant's database, kept open until the block exits; raises UnknownTenant"""
+        database = await self._ensure_open(tenant)
+        # Counted before anything can be evicted, so it can't be closed under us
+        database.users += 1
+        try:
+            await self._close_evicted(tenant)
+            yield database
+        finally:
+            database.users -= 1
+
+    @asynccontextmanager
+    async def borrow(self, tenant: str) -> AsyncIterator[TenantDatabase]:
+        """The tenant's database for a background task, without moving it in the LRU
+
+        A closed tenant is opened with a temporary engine (migrated like any
+        other), which is disposed afterwards.
+        """
+        database = self._open.get(tenant)
+        if database is not None:
+            database.users += 1
+            try:
+                yield database
+            finally:
+                database.users -= 1
+            return
+        async with self._lock(tenant):
+            database = await self._open_database(tenant)
+        try:
+            yield database
+        finally:
+            await database.close()
+
+    def peek(self, tenant: str) -> Optional[TenantDatabase]:
+        """The tenant's database if it is open, without touching the LRU order"""
+        return self._open.get(tenant)
+
+    async def _close_evicted(self, keep: str) -> None:
+        for old in self._evict_idle(keep):
+            await old.close()
+            discard_hub(old.tenant)
+
+    def _evict_idle(self, keep: str) -> List[TenantDatabase]:
+        """Remove least recently used engines beyond max_open that nothing is using"""
+        evicted = []
+        for tenant in list(self._open):
+            if len(self._open) <= self.max_open:
+                break
+            database = self._open[tenant]
+            if tenant != keep and not database.in_use:
+                evicted.append(self._open.pop(tenant))
+        return evicted
+
+    async def _open_database(self, tenant: str) -> TenantDatabase:
+        url = self.url_for(tenant)
+        path = self._path_for(tenant)
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        engine = make_engine(url, foreign_keys=config.SQLITE_FOREIGN_KEYS)
+        await apply_schema(engine)
+        return TenantDatabase(tenant, engine)
+
+    def known_tenants(self) -> List[str]:
+        """Open tenants plus those with a database file on disk"""
+        tenants = set(self._open)
+        path = make_url(self.url_for("*")).database
+        if path and "*" in path:
+            prefix, suffix = path.split("*", 1)
+            for match in glob.glob(path):
+                tenant = match[len(prefix):len(match) - len(suffix)]
+                if TENANT_ID.match(tenant):
+                    tenants.add(tenant)
+        return sorted(tenants)
+
+    @property
+    def open_tenants(self) -> List[str]:
+        return list(self._open)
+
+    @property
+    def open_databases(self) -> List[TenantDatabase]:
+        return list(self._open.values())
+
+    async def close_all(self) -> None:
+        while self._open:
+            tenant, database = self._open.popitem(last=False)
+            await database.close()
+            discard_hub(tenant)
+
+
+tenant_registry = EngineRegistry(config.TENANT_DATABASE_URL, config.TENANT_MAX_OPEN_ENGINES, config.TENANT_ALLOWLIST)
+
+
+async def session_maker_for_request() -> async_sessionmaker:
+    """Session factory of the current request's database"""
+    from app.db import async_session_maker
+
+    tenant = current_tenant.get()
+    if tenant is None:
+        return async_session_maker
+    # Already held open by TenantMiddleware for the whole request
+    return (await tenant_registry.get(tenant)).session_maker
+
+
+async def fan_out(query: Callable[[AsyncSession], Awaitable[T]]) -> Dict[str, T]:
+    """Run ``query`` against every known tenant database concurrently"""
+    tenants = tenant_registry.known_tenants()
+
+    async def run(tenant: str) -> T:
+        # Closed tenants are read outside the registry, so the LRU keeps the hot ones
+        async with tenant_registry.borrow(tenant) as database:
+            async with database.session_maker() as session:
+                return await query(session)
+
+    results = await asyncio.gather(*[run(tenant) for tenant in tenants])
+    return dict(zip(tenants, results))
+
+
+class TenantMiddleware:
+    """Select the request's tenant from X-Tenant-ID or a /t/<tenant>/ path prefix"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not config.TENANCY_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        tenant = Headers(scope=scope).get(TENANT_HEADER)
+        path = scope["path"]
+        if path.startswith(TENANT_PATH_PREFIX):
+            path_tenant, _, rest = path[len(TENANT_PATH_PREFIX):].partition("/")
+            if tenant is not None and tenant != path_tenant:
+                await JSONResponse({"detail": "Tenant header and path prefix disagree"}, 400)(scope, receive, send)
+                return
+            tenant = path_tenant
+            scope = dict(scope, path="/" + rest, raw_path=("/" + rest).encode())
+
+        if tenant is not None and not TENANT_ID.match(tenant):
+            await JSONResponse({"detail": "Invalid tenant id"}, 400)(scope, receive, send)
+            return
+
+        if tenant is None:
+            await self.app(scope, receive, send)
+            return
+
+        async with AsyncExitStack() as stack:
+            try:
+                # Held for the whole request, streamed responses included
+                await stack.enter_async_context(tenant_registry.using(tenant))
+            except UnknownTenant:
+                await JSONResponse({"detail": "Unknown tenant"}, 404)(scope, receive, send)
+                return
+            token = current_tenant.set(tenant)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                current_tenant.reset(token)
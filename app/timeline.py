@@ -0,0 +1,175 @@
+"""
+Candidate timeline read model - Job Interview Management System
+
+GET /candidates/{id} is served from one JSON document per candidate, stored
+in ``candidate_timelines`` and returned without joins or re-serialization.
+The write routes keep the document current inside their own transaction:
+- create_candidate: creates the document
+- update_candidate_status: updates the status and records the change
+- schedule_interview: appends the interview
+- add_feedback: attaches the feedback to its interview
+- delete_candidate: removes the document
+
+Candidates created before timelines existed get their document built from
+the normalized tables the first time it is read. Concurrent readers (in any
+worker) may build the same document; the first insert wins and the others
+keep it.
+"""
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import queries
+from app.db import run_write
+from app.models.candidate import Candidate, CandidateStatus
+from app.models.interview import Interview
+from app.models.feedback import Feedback
+from app.models.timeline import CandidateTimeline
+from app.schemas.candidate import (
+    CandidateResponseBase,
+    FeedbackInCandidate,
+    InterviewInCandidate,
+    TimelineEvent,
+    TimelineEventType,
+)
+from app.schemas.interview import InterviewResponse
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _event(event_type: TimelineEventType, at: Optional[datetime], **fields: Any) -> Dict[str, Any]:
+    event = TimelineEvent(type=event_type, at=at, **fields)
+    return event.model_dump(mode="json", exclude_none=True)
+
+
+def _interview_entry(interview: Interview) -> Dict[str, Any]:
+    entry = InterviewResponse.model_validate(interview).model_dump(mode="json")
+    entry["feedback"] = []
+    return entry
+
+
+async def _load(db: AsyncSession, candidate_id: uuid.UUID) -> Optional[CandidateTimeline]:
+    return await db.get(CandidateTimeline, candidate_id)
+
+
+def _save(timeline: CandidateTimeline, document: Dict[str, Any]) -> None:
+    timeline.document = json.dumps(document)
+
+
+async def record_candidate_created(db: AsyncSession, candidate: Candidate) -> None:
+    document = CandidateResponseBase.model_validate(candidate).model_dump(mode="json")
+    document["interviews"] = []
+    document["timeline"] = [
+        _event(TimelineEventType.CANDIDATE_CREATED, candidate.created_at, status=candidate.status)
+    ]
+    timeline = CandidateTimeline(candidate_id=candidate.id)
+    _save(timeline, document)
+    db.add(timeline)
+
+
+async def record_status_changed(db: AsyncSession, candidate: Candidate) -> None:
+    timeline = await _load(db, candidate.id)
+    if timeline is None:
+        return
+    document = json.loads(timeline.document)
+    # Same serialization as the PATCH response and GET /candidates
+    document.update(CandidateResponseBase.model_validate(candidate).model_dump(mode="json"))
+    document["timeline"].append(
+        _event(TimelineEventType.STATUS_CHANGED, candidate.updated_at, status=candidate.status)
+    )
+    _save(timeline, document)
+
+
+async def record_interview_scheduled(db: AsyncSession, interview: Interview) -> None:
+    timeline = await _load(db, interview.candidate_id)
+    if timeline is None:
+        return
+    document = json.loads(timeline.document)
+    document["interviews"].append(_interview_entry(interview))
+    # Same order as GET /candidates/{id}/interviews
+    document["interviews"].sort(key=lambda entry: entry["scheduled_at"])
+    document["timeline"].append(_event(
+        TimelineEventType.INTERVIEW_SCHEDULED,
+        _now(),
+        interview_id=interview.id,
+        interviewer=interview.interviewer,
+        scheduled_at=interview.scheduled_at,
+    ))
+    _save(timeline, document)
+
+
+async def record_feedback_added(db: AsyncSession, candidate_id: uuid.UUID, feedback: Feedback) -> None:
+    timeline = await _load(db, candidate_id)
+    if timeline is None:
+        return
+    document = json.loads(timeline.document)
+    entry = FeedbackInCandidate.model_validate(feedback).model_dump(mode="json")
+    for interview in document["interviews"]:
+        if interview["id"] == feedback.interview_id:
+            interview["feedback"].append(entry)
+    document["timeline"].append(_event(
+        TimelineEventType.FEEDBACK_ADDED,
+        _now(),
+        interview_id=feedback.interview_id,
+        feedback_id=feedback.id,
+        rating=feedback.rating,
+    ))
+    _save(timeline, document)
+
+
+async def _rebuild(db: AsyncSession, candidate_id: uuid.UUID) -> Optional[str]:
+    """Build and store the document of a candidate from the normalized tables"""
+    result = await db.execute(queries.CANDIDATE_WITH_INTERVIEWS, {"candidate_id": candidate_id})
+    candidate = result.scalar_one_or_none()
+    if candidate is None:
+        return None
+
+    document = CandidateResponseBase.model_validate(candidate).model_dump(mode="json")
+    interviews = sorted(candidate.interviews, key=lambda interview: interview.scheduled_at)
+    document["interviews"] = [
+        InterviewInCandidate.model_validate(interview).model_dump(mode="json")
+        for interview in interviews
+    ]
+
+    # Only creation and the latest status change have known timestamps
+    events = [_event(TimelineEventType.CANDIDATE_CREATED, candidate.created_at, status=CandidateStatus.APPLIED)]
+    if candidate.status != CandidateStatus.APPLIED:
+        events.append(_event(TimelineEventType.STATUS_CHANGED, candidate.updated_at, status=candidate.status))
+    for interview in interviews:
+        events.append(_event(
+            TimelineEventType.INTERVIEW_SCHEDULED,
+            None,
+            interview_id=interview.id,
+            interviewer=interview.interviewer,
+            scheduled_at=interview.scheduled_at,
+        ))
+        for feedback in interview.feedback:
+            events.append(_event(
+                TimelineEventType.FEEDBACK_ADDED,
+                None,
+                interview_id=interview.id,
+                feedback_id=feedback.id,
+                rating=feedback.rating,
+            ))
+    document["timeline"] = events
+
+    serialized = json.dumps(document)
+    upsert = insert(CandidateTimeline).values(candidate_id=candidate.id, document=serialized)
+    await run_write(db, lambda session: session.execute(
+        upsert.on_conflict_do_nothing(index_elements=[CandidateTimeline.candidate_id])
+    ))
+    return serialized
+
+
+async def load_timeline(db: AsyncSession, candidate_id: uuid.UUID) -> Optional[str]:
+    """Return the serialized detail document, or None if the candidate doesn't exist"""
+    timeline = await _load(db, candidate_id)
+    if timeline is not None:
+        return timeline.document
+    return await _rebuild(db, candidate_id)
@@ -0,0 +1,23 @@
+"""
+Process warm-up - Job Interview Management System
+
+Work done here is paid once per process instead of on the first requests.
+When serving with several workers it should run in the parent before the
+workers fork, so they inherit mappers, validators and the OpenAPI document.
+"""
+from fastapi import FastAPI
+from sqlalchemy.orm import configure_mappers
+
+from app.schemas import build_all_schemas
+
+
+def warm_up(application: FastAPI) -> None:
+    """Configure SQLAlchemy mappers, build Pydantic schemas and cache OpenAPI"""
+    # Importing the models registers them on Base before mappers are configured
+    from app.models import candidate, dimension, interview, feedback, timeline, change, idempotency, archive  # noqa: F401
+
+    configure_mappers()
+    build_all_schemas()
+
+    # FastAPI caches the generated document on the app instance
+    application.openapi()
@@ -0,0 +1,135 @@
+"""
+Group commit for high-rate inserts - Job Interview Management System
+
+Every commit on SQLite costs a sync to disk and takes the database write
+lock. When enabled, the write queue collects the write operations submitted
+by concurrent requests for a few milliseconds and applies them in a single
+transaction, each one inside its own SAVEPOINT. A failing operation (404,
+409, IntegrityError, ...) only rolls back its own savepoint and its error is
+raised in the request that submitted it; the others still commit.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import WRITE_QUEUE_ENABLED, WRITE_QUEUE_WINDOW_MS, WRITE_QUEUE_MAX_BATCH
+from app.db import async_session_maker, run_write
+from app.tenancy import current_tenant, tenant_registry
+
+T = TypeVar("T")
+WriteOp = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class WriteQueue:
+    """Coalesce write operations from concurrent requests into group commits"""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        window_seconds: float = 0.002,
+        max_batch: int = 100,
+    ):
+        self.session_factory = session_factory
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self._pending: List[Tuple[WriteOp, asyncio.Future]] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self._batch_full: Optional[asyncio.Event] = None
+        self.batches = 0
+        self.operations = 0
+
+    async def submit(self, op: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """Queue ``op`` for the next group commit and wait for its own outcome"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((op, future))
+        if self._flusher is None or self._flusher.done():
+            # Created per flusher so the queue is not tied to one event loop
+            self._batch_full = asyncio.Event()
+            self._flusher = loop.create_task(self._run())
+        if len(self._pending) >= self.max_batch:
+            self._batch_full.set()
+        return await future
+
+    async def drain(self) -> None:
+        """Wait until everything submitted so far has been committed"""
+        while self._flusher is not None and not self._flusher.done():
+            await asyncio.shield(self._flusher)
+
+    async def _run(self) -> None:
+        while self._pending:
+            # Give concurrent requests a moment to join the batch
+            if len(self._pending) < self.max_batch:
+                self._batch_full.clear()
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.window_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            await self._commit_batch(batch)
+
+    async def _commit_batch(self, batch: List[Tuple[WriteOp, asyncio.Future]]) -> None:
+        async def apply(session: AsyncSession) -> List[Tuple[Any, Optional[BaseException]]]:
+            outcomes = []
+            for op, _ in batch:
+                try:
+                    async with session.begin_nested():
+                        outcomes.append((await op(session), None))
+                except Exception as exc:
+                    outcomes.append((None, exc))
+            return outcomes
+
+        try:
+            async with self.session_factory() as session:
+                outcomes = await run_write(session, apply)
+        except Exception as exc:
+            # The shared commit failed, so none of the operations took effect
+            outcomes = [(None, exc)] * len(batch)
+
+        self.batches += 1
+        self.operations += len(batch)
+        for (_, future), (result, error) in zip(batch, outcomes):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+write_queue = WriteQueue(
+    async_session_maker,
+    window_seconds=WRITE_QUEUE_WINDOW_MS / 1000,
+    max_batch=WRITE_QUEUE_MAX_BATCH,
+)
+
+
+# Dependency for FastAPI endpoints: None means "commit in the request's own session"
+async def get_write_queue() -> Optional[WriteQueue]:
+    if not WRITE_QUEUE_ENABLED:
+        return None
+    tenant = current_tenant.get()
+    if tenant is None:
+        return write_queue
+    # Each tenant database gets its own queue, drained when it is evicted
+    database = await tenant_registry.get(tenant)
+    if database.write_queue is None:
+        database.write_queue = WriteQueue(
+            database.session_maker,
+            window_seconds=WRITE_QUEUE_WINDOW_MS / 1000,
+            max_batch=WRITE_QUEUE_MAX_BATCH,
+        )
+    return database.write_queue
+
+
+async def submit_write(
+    db: AsyncSession,
+    queue: Optional[WriteQueue],
+    op: Callable[[AsyncSession], Awaitable[T]],
+) -> T:
+    """Run ``op`` through the write queue when it is enabled, else in ``db``"""
+    if queue is None:
+        return await run_write(db, op)
+    return await queue.submit(op)
@@ -0,0 +1,137 @@
+"""
+Per-request Python overhead of inline statements vs the shared ones in app.queries
+
+Usage:
+    python -m benchmarks.queries [--iterations 20000] [--executions 2000]
+
+Two measurements for the statements of the nested routes:
+
+- Statement overhead: building ``select(...)`` and computing its cache key
+  (what every execute() does before the compiled-cache lookup), against the
+  cache key of a shared statement, which is memoized.
+- Execution: ``session.execute()`` of each statement against a throwaway
+  SQLite file, inline against shared, so the saving can be compared with the
+  whole cost of a query. The compiled-cache hit ratio of the run is printed
+  too.
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import queries
+from app.db import make_engine
+from app.models import Base
+from app.models.candidate import Candidate
+from app.models.dimension import Interviewer, Position
+from app.models.feedback import Feedback
+from app.models.interview import Interview
+
+CANDIDATE_ID = uuid.uuid4()
+SCHEDULED_AT = datetime(2025, 1, 1, 10)
+HOUR = timedelta(hours=1)
+
+# (name, statement built inline, shared statement, its parameters)
+Case = Tuple[str, Callable[[], Any], Any, Dict[str, Any]]
+
+CASES: List[Case] = [
+    (
+        "candidate by id",
+        lambda: select(Candidate).where(Candidate.id == CANDIDATE_ID),
+        queries.CANDIDATE_BY_ID,
+        {"candidate_id": CANDIDATE_ID},
+    ),
+    (
+        "interviews of candidate",
+        lambda: select(Interview).where(Interview.candidate_id == CANDIDATE_ID).order_by(Interview.scheduled_at),
+        queries.INTERVIEWS_OF_CANDIDATE,
+        {"candidate_id": CANDIDATE_ID},
+    ),
+    (
+        "interviewer conflict",
+        lambda: select(Interview.id).where(
+            Interview.interviewer_id == 1,
+            Interview.scheduled_at > SCHEDULED_AT - HOUR,
+            Interview.scheduled_at < SCHEDULED_AT + HOUR
+        ).limit(1),
+        queries.INTERVIEWER_CONFLICT,
+        {"interviewer_id": 1, "after": SCHEDULED_AT - HOUR, "before": SCHEDULED_AT + HOUR},
+    ),
+    (
+        "feedback of interview",
+        lambda: select(Feedback).where(Feedback.interview_id == 1),
+        queries.FEEDBACK_OF_INTERVIEW,
+        {"interview_id": 1},
+    ),
+]
+
+
+def _statement_overhead(iterations: int) -> None:
+    print("Statement construction + cache key (us per execute):")
+    for name, inline, shared, _ in CASES:
+        built = timeit.timeit(lambda: inline()._generate_cache_key(), number=iterations) / iterations
+        reused = timeit.timeit(lambda: shared._generate_cache_key(), number=iterations) / iterations
+        print(f"  {name:24} inline {built * 1e6:7.1f}   shared {reused * 1e6:7.2f}")
+
+
+async def _seed(session_factory: async_sessionmaker) -> None:
+    async with session_factory() as session:
+        position = Position(name="Engineer")
+        interviewer = Interviewer(name="Bench")
+        session.add_all([position, interviewer])
+        await session.flush()
+        session.add(Candidate(id=CANDIDATE_ID, name="Bench", email="bench@example.com", position_id=position.id))
+        await session.flush()
+        interview = Interview(candidate_id=CANDIDATE_ID, interviewer_id=interviewer.id, scheduled_at=SCHEDULED_AT)
+        session.add(interview)
+        await session.flush()
+        session.add(Feedback(interview_id=interview.id, rating=4, comment="Benchmark feedback"))
+        await session.commit()
+
+
+async def _execution(executions: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        await _seed(session_factory)
+
+        print("session.execute() (us per execute):")
+        async with session_factory() as session:
+            for name, inline, shared, params in CASES:
+                timings = []
+                for run in (lambda: session.execute(inline()), lambda: session.execute(shared, params)):
+                    await run()
+                    start = time.perf_counter()
+                    for _ in range(executions):
+                        (await run()).all()
+                    timings.append((time.perf_counter() - start) / executions)
+                inline_time, shared_time = timings
+                print(f"  {name:24} inline {inline_time * 1e6:7.1f}   shared {shared_time * 1e6:7.1f}"
+                      f"   saved {(inline_time - shared_time) * 1e6:5.1f}")
+        await engine.dispose()
+
+    hits, misses = queries.cache_stats["hits"], queries.cache_stats["misses"]
+    print(f"Compiled cache: {hits} hits, {misses} misses ({hits / max(hits + misses, 1):.1%} hit ratio)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--executions", type=int, default=2000)
+    args = parser.parse_args()
+
+    _statement_overhead(args.iterations)
+    asyncio.run(_execution(args.executions))
+
+
+if __name__ == "__main__":
+    main()
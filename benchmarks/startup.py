@@ -0,0 +1,143 @@
+"""
+Cold-start report for the API
+
+Usage:
+    python -m benchmarks.startup [--top 15] [--workers 4]
+
+Prints:
+1. The slowest imports of ``app.main`` (from ``python -X importtime``)
+2. The time a cold worker needs to import, start up and answer ``/health``
+3. The same for workers forked from a warmed-up parent (preloaded app)
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+READY_SNIPPET = """
+import asyncio, time
+start = time.perf_counter()
+from app.main import app
+from benchmarks.startup import call_health
+asyncio.run(call_health(app))
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def import_time_report(top: int) -> None:
+    """Run ``-X importtime`` in a fresh interpreter and print the heaviest modules"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_part, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_part), int(cumulative_us), name.strip()))
+
+    total_ms = sum(row[0] for row in rows) / 1000
+    print(f"Import of app.main: {total_ms:.1f} ms across {len(rows)} modules")
+    print(f"\nTop {top} modules by self time:")
+    for self_us, cumulative_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.1f} ms  (cumulative {cumulative_us / 1000:8.1f} ms)  {name}")
+
+
+async def call_health(application) -> None:
+    """Run the lifespan startup and serve one ``/health`` request over raw ASGI"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/health",
+        "raw_path": b"/health",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 8000),
+    }
+    async with application.router.lifespan_context(application):
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        await application(scope, receive, send)
+    assert sent[0]["status"] == 200
+
+
+def cold_worker_ms(database_url: str) -> float:
+    env = dict(os.environ, DATABASE_URL=database_url)
+    proc = subprocess.run(
+        [sys.executable, "-c", READY_SNIPPET],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def forked_worker_ms(workers: int) -> list:
+    """Warm up in this process, then time how fast forked children become ready"""
+    from app.main import app
+    from app.warmup import warm_up
+
+    warm_up(app)
+    results = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        start = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            asyncio.run(call_health(app))
+            os.write(write_fd, repr((time.perf_counter() - start) * 1000).encode())
+            os._exit(0)
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+        with os.fdopen(read_fd) as pipe:
+            results.append(float(pipe.read()))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite+aiosqlite:///{tmp}/startup.db"
+        os.environ["DATABASE_URL"] = database_url
+
+        import_time_report(args.top)
+
+        cold = cold_worker_ms(database_url)
+        print(f"\nCold worker ready (import + startup + /health): {cold:.1f} ms")
+
+        # Tables exist now; forked workers skip create_all like the launcher's do
+        os.environ["CREATE_TABLES_ON_STARTUP"] = "0"
+        if hasattr(os, "fork"):
+            forked = forked_worker_ms(args.workers)
+            print(
+                "Forked worker ready from preloaded parent: "
+                + ", ".join(f"{ms:.1f}" for ms in forked)
+                + " ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Feedback insert throughput with and without the group-commit write queue
+
+Usage:
+    python -m benchmarks.write_queue [--writes 2000] [--concurrency 200] [--snapshot seed.db]
+
+Each write is the same operation ``add_feedback`` runs (existence check,
+duplicate check, insert) against a throwaway SQLite file in WAL mode.
+
+With ``--snapshot`` the seeded database is saved there (VACUUM INTO) the
+first time and copied from it afterwards, so large datasets are seeded once.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.backup import snapshot_database
+from app.db import make_engine, run_write
+from app.models import Base
+from app.models.candidate import Candidate
+from app.models.dimension import Interviewer, Position
+from app.models.interview import Interview
+from app.routers.feedback import _insert_feedback
+from app.schemas.feedback import FeedbackCreate
+from app.write_queue import WriteQueue
+
+
+async def _seed(session_factory: async_sessionmaker, interviews: int) -> list:
+    async with session_factory() as session:
+        position = Position(name="Engineer")
+        interviewer = Interviewer(name="Bench")
+        session.add_all([position, interviewer])
+        await session.flush()
+        candidate = Candidate(name="Bench", email="bench@example.com", position_id=position.id)
+        session.add(candidate)
+        await session.flush()
+        rows = [
+            Interview(candidate_id=candidate.id, interviewer_id=interviewer.id, scheduled_at=datetime(2025, 1, 1))
+            for _ in range(interviews)
+        ]
+        session.add_all(rows)
+        await session.commit()
+        return [row.id for row in rows]
+
+
+async def _run(writes: int, concurrency: int, queued: bool, snapshot: Optional[str] = None) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        if snapshot and os.path.exists(snapshot):
+            shutil.copyfile(snapshot, f"{tmp}/bench.db")
+        engine = make_engine(f"sqlite+aiosqlite:///{tmp}/bench.db", pool_size=concurrency, max_overflow=0)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        if snapshot and os.path.exists(snapshot):
+            async with session_factory() as session:
+                result = await session.execute(select(Interview.id).order_by(Interview.id).limit(writes))
+                interview_ids = list(result.scalars())
+        else:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            interview_ids = await _seed(session_factory, writes)
+            if snapshot:
+                await snapshot_database(engine, snapshot)
+
+        queue = WriteQueue(session_factory)
+        feedback = FeedbackCreate(rating=4, comment="Benchmark feedback")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def write(interview_id: int) -> None:
+            async with semaphore:
+                op = lambda session: _insert_feedback(session, interview_id, feedback)
+                if queued:
+                    await queue.submit(op)
+                else:
+                    async with session_factory() as session:
+                        await run_write(session, op)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[write(interview_id) for interview_id in interview_ids])
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+        return len(interview_ids) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--snapshot", help="Seed from this snapshot file, creating it on first use")
+    args = parser.parse_args()
+
+    direct = asyncio.run(_run(args.writes, args.concurrency, queued=False, snapshot=args.snapshot))
+    queued = asyncio.run(_run(args.writes, args.concurrency, queued=True, snapshot=args.snapshot))
+    print(f"Commit per request: {direct:8.0f} writes/s")
+    print(f"Group commit:       {queued:8.0f} writes/s  ({queued / direct:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
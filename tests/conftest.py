@@ -7,8 +7,12 @@ from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.pool import StaticPool
 
+from app import config
 from app.main import app
 from app.db import get_db_session
+from app import existence
+from app.dimensions import clear_cache
+from app.idempotency import response_cache
 from app.models import Base
 
 
@@ -47,6 +51,9 @@ async def db_session():
     # Drop tables after test
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    clear_cache()
+    existence.clear_cache()
+    response_cache.clear()
 
 
 @pytest_asyncio.fixture
@@ -68,6 +75,13 @@ async def test_client(db_session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def admin_headers(monkeypatch):
+    """Configure an admin token and return the headers that send it"""
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "admin-secret")
+    return {"X-Admin-Token": "admin-secret"}
+
+
 @pytest.fixture
 def sample_candidate_data():
     """Sample candidate data for testing"""
@@ -0,0 +1,69 @@
+"""
+Unit tests for admission control
+"""
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.admission import Limiter, Overloaded, limiters
+
+
+@pytest.fixture
+def saturated_listing():
+    """No slots and no queue for GET /candidates"""
+    limiter = limiters["list_candidates"]
+    limits = limiter.max_concurrency, limiter.max_queue
+    limiter.max_concurrency, limiter.max_queue = 0, 0
+    yield limiter
+    limiter.max_concurrency, limiter.max_queue = limits
+
+
+@pytest.mark.asyncio
+async def test_overloaded_route_sheds_load(test_client: AsyncClient, saturated_listing, sample_candidate_data):
+    """A full route answers 503 at once while other routes keep working"""
+    rejected = saturated_listing.rejected
+    
+    response = await test_client.get("/candidates/")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    
+    assert (await test_client.get("/health")).status_code == 200
+    assert (await test_client.post("/candidates/", json=sample_candidate_data)).status_code == 201
+    
+    response = await test_client.get("/admin/admission")
+    stats = {route["route"]: route for route in response.json()}
+    assert stats["list_candidates"]["rejected"] == rejected + 1
+    assert stats["create_candidate"]["kind"] == "write"
+    assert stats["create_candidate"]["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_then_rejects():
+    """Requests beyond the limit wait in order; beyond the queue they are rejected"""
+    limiter = Limiter("test", "read", max_concurrency=1, max_queue=1)
+    await limiter.acquire(timeout=1)
+    
+    waiter = asyncio.create_task(limiter.acquire(timeout=1))
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+    
+    with pytest.raises(Overloaded):
+        await limiter.acquire(timeout=1)
+    
+    limiter.release()
+    await waiter
+    assert (limiter.active, limiter.queued, limiter.admitted, limiter.rejected) == (1, 0, 2, 1)
+
+
+@pytest.mark.asyncio
+async def test_limiter_wait_is_bounded():
+    limiter = Limiter("test", "read", max_concurrency=1, max_queue=10)
+    await limiter.acquire(timeout=1)
+    
+    with pytest.raises(Overloaded):
+        await limiter.acquire(timeout=0.01)
+    
+    assert limiter.queued == 0
+    limiter.release()
+    assert limiter.active == 0
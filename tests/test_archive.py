@@ -0,0 +1,90 @@
+"""
+Unit tests for archiving closed candidates
+"""
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app import db
+from app.archive import archive_closed_candidates
+from app.maintenance import jobs, run_job
+from app.models.interview import Interview
+from tests.conftest import TestSessionLocal, test_engine
+
+
+@pytest_asyncio.fixture
+async def hired_candidate(test_client: AsyncClient, sample_interview, sample_feedback_data):
+    """A HIRED candidate with one interview and its feedback"""
+    await test_client.post(f"/interviews/{sample_interview['id']}/feedback", json=sample_feedback_data)
+    response = await test_client.patch(f"/candidates/{sample_interview['candidate_id']}", json={"status": "HIRED"})
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_closed_candidates_move_to_archive(test_client: AsyncClient, db_session, hired_candidate):
+    """Archived candidates leave the hot tables but remain readable"""
+    active = (await test_client.post(
+        "/candidates/",
+        json={"name": "Jane Roe", "email": "jane.roe@example.com", "position": "Designer"}
+    )).json()
+    
+    assert await archive_closed_candidates(db_session, older_than_days=0) == 1
+    
+    response = await test_client.get("/candidates/")
+    assert [candidate["id"] for candidate in response.json()] == [active["id"]]
+    assert await db_session.scalar(select(func.count()).select_from(Interview)) == 0
+    
+    response = await test_client.get("/candidates/", params={"include_archived": "true"})
+    candidates = response.json()
+    assert [candidate["id"] for candidate in candidates] == [hired_candidate["id"], active["id"]]
+    assert candidates[0]["status"] == "HIRED"
+    assert candidates[0]["interviews"][0]["feedback"][0]["rating"] == 5
+    assert "timeline" not in candidates[0]
+    
+    response = await test_client.get(f"/candidates/{hired_candidate['id']}")
+    assert response.status_code == 200
+    assert response.json()["timeline"][-1]["status"] == "HIRED"
+    
+    response = await test_client.patch(f"/candidates/{hired_candidate['id']}", json={"status": "REJECTED"})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_recently_closed_candidates_stay_hot(test_client: AsyncClient, db_session, hired_candidate):
+    assert await archive_closed_candidates(db_session, older_than_days=30) == 0
+    
+    response = await test_client.get("/candidates/")
+    assert [candidate["id"] for candidate in response.json()] == [hired_candidate["id"]]
+
+
+@pytest.mark.asyncio
+async def test_archived_email_stays_taken(test_client: AsyncClient, db_session, hired_candidate, sample_candidate_data):
+    assert await archive_closed_candidates(db_session, older_than_days=0) == 1
+
+    response = await test_client.post("/candidates/", json=sample_candidate_data)
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_archive_runs_as_maintenance_job(test_client: AsyncClient, hired_candidate, monkeypatch):
+    monkeypatch.setattr(db, "engine", test_engine)
+    monkeypatch.setattr(db, "async_session_maker", TestSessionLocal)
+    monkeypatch.setattr("app.config.ARCHIVE_AFTER_DAYS", 0)
+    job = next(job for job in jobs if job.name == "archive")
+    monkeypatch.setattr(job, "results", {})
+
+    await run_job(job)
+
+    assert job.results == {"default": "archived 1 candidates"}
+    response = await test_client.get("/candidates/")
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_manual_archive_needs_admin_token(test_client: AsyncClient, hired_candidate, admin_headers):
+    assert (await test_client.post("/admin/archive")).status_code == 403
+
+    response = await test_client.post("/admin/archive", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json() == {"archived": 0}
@@ -0,0 +1,116 @@
+"""
+Tests for online backups and snapshots
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+from httpx import AsyncClient
+
+from app import config
+from app.backup import BACKUP, DONE, BackupJob, backup_database
+from app.db import make_engine
+
+
+async def _wait_for(test_client: AsyncClient, job_id: str, headers: dict) -> dict:
+    for _ in range(200):
+        job = (await test_client.get(f"/admin/backups/{job_id}", headers=headers)).json()
+        if job["status"] != "running":
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("backup did not finish")
+
+
+def _emails(path: str) -> list:
+    with sqlite3.connect(path) as conn:
+        return [email for email, in conn.execute("SELECT email FROM candidates")]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("snapshot", [False, True])
+async def test_backup_job(test_client: AsyncClient, sample_candidate, tmp_path, monkeypatch, admin_headers, snapshot):
+    monkeypatch.setattr(config, "BACKUP_DIR", str(tmp_path))
+
+    response = await test_client.post("/admin/backups", params={"snapshot": snapshot}, headers=admin_headers)
+    assert response.status_code == 202
+    job = await _wait_for(test_client, response.json()["id"], admin_headers)
+
+    assert job["status"] == DONE
+    assert job["progress"] == 1.0
+    # Only the file name, not the server's directory
+    assert sorted(os.listdir(tmp_path)) == [job["file"], "jobs"]
+    assert _emails(os.path.join(tmp_path, job["file"])) == [sample_candidate["email"]]
+
+    response = await test_client.get("/admin/backups", headers=admin_headers)
+    assert response.json()[0]["id"] == job["id"]
+
+
+@pytest.mark.asyncio
+async def test_backup_lock_is_shared_by_workers(test_client: AsyncClient, tmp_path, monkeypatch, admin_headers):
+    """Another live worker's lock blocks a second backup; a dead one's doesn't"""
+    monkeypatch.setattr(config, "BACKUP_DIR", str(tmp_path))
+    lock = tmp_path / "backup.lock"
+
+    lock.write_text(f"{os.getpid()} 0000abcd")
+    response = await test_client.post("/admin/backups", headers=admin_headers)
+    assert response.status_code == 409
+
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    lock.write_text(f"{exited.pid} 0000abcd")
+    response = await test_client.post("/admin/backups", headers=admin_headers)
+    assert response.status_code == 202
+    job = await _wait_for(test_client, response.json()["id"], admin_headers)
+    assert job["status"] == DONE
+    assert not lock.exists()
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_read_from_their_state_files(test_client: AsyncClient, tmp_path, monkeypatch, admin_headers):
+    """Any worker reports a job, and one whose worker died as failed"""
+    monkeypatch.setattr(config, "BACKUP_DIR", str(tmp_path))
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    (tmp_path / "jobs").mkdir()
+    (tmp_path / "jobs" / "0000abcd.json").write_text(json.dumps({
+        "kind": BACKUP, "path": "/srv/backups/candidates-1.db", "id": "0000abcd", "status": "running",
+        "pages_total": 10, "pages_remaining": 5, "started_at": "2025-07-01T10:00:00+00:00",
+        "finished_at": None, "error": None, "pid": exited.pid,
+    }))
+
+    response = await test_client.get("/admin/backups/0000abcd", headers=admin_headers)
+
+    assert response.status_code == 200
+    assert (response.json()["status"], response.json()["file"]) == ("failed", "candidates-1.db")
+    response = await test_client.get("/admin/backups/..%2Fjobs", headers=admin_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_backup_routes_need_admin_token(test_client: AsyncClient, admin_headers):
+    for headers in ({}, {"X-Admin-Token": "wrong"}):
+        assert (await test_client.post("/admin/backups", headers=headers)).status_code == 403
+        assert (await test_client.get("/admin/backups", headers=headers)).status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_backup_copies_in_steps(tmp_path):
+    """The page copy runs in several steps and reports its progress"""
+    source = tmp_path / "source.db"
+    with sqlite3.connect(source) as conn:
+        conn.execute("CREATE TABLE t (value TEXT)")
+        conn.executemany("INSERT INTO t VALUES (?)", [("x" * 500,)] * 200)
+    engine = make_engine(f"sqlite+aiosqlite:///{source}")
+    job = BackupJob(kind=BACKUP, path=str(tmp_path / "copy.db"))
+
+    await backup_database(engine, job.path, job, pages_per_step=4, pause_seconds=0)
+    await engine.dispose()
+
+    assert job.pages_total > 4
+    assert job.pages_remaining == 0
+    with sqlite3.connect(job.path) as conn:
+        assert conn.execute("SELECT count(*) FROM t").fetchone() == (200,)
@@ -0,0 +1,51 @@
+"""
+Unit tests for batch lookup endpoints
+"""
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_interviews_grouped_by_candidate(test_client: AsyncClient, sample_candidate, sample_interview):
+    """All candidates are resolved at once; unknown ids are reported as missing"""
+    other = (await test_client.post(
+        "/candidates/",
+        json={"name": "Jane Roe", "email": "jane.roe@example.com", "position": "Designer"}
+    )).json()
+    unknown = str(uuid.uuid4())
+    
+    response = await test_client.get(
+        "/interviews",
+        params=[("candidate_id", sample_candidate["id"]), ("candidate_id", other["id"]), ("candidate_id", unknown)]
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert [interview["id"] for interview in data["interviews"][sample_candidate["id"]]] == [sample_interview["id"]]
+    assert data["interviews"][other["id"]] == []
+    assert data["missing"] == [unknown]
+
+
+@pytest.mark.asyncio
+async def test_feedback_grouped_by_interview(test_client: AsyncClient, sample_interview, sample_feedback_data):
+    feedback = (await test_client.post(f"/interviews/{sample_interview['id']}/feedback", json=sample_feedback_data)).json()
+    
+    response = await test_client.get(
+        "/feedback",
+        params=[("interview_id", sample_interview["id"]), ("interview_id", 99999)]
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data["feedback"][str(sample_interview["id"])]] == [feedback["id"]]
+    assert data["missing"] == [99999]
+
+
+@pytest.mark.asyncio
+async def test_batch_requires_ids(test_client: AsyncClient):
+    assert (await test_client.get("/interviews")).status_code == 422
+    
+    params = [("interview_id", i) for i in range(101)]
+    assert (await test_client.get("/feedback", params=params)).status_code == 422
@@ -80,6 +80,85 @@ class TestCandidateListing:
         assert candidates[0]["interviews"] == []  # No interviews yet
 
 
+class TestCandidateDetail:
+    """Test candidate detail and timeline endpoint"""
+    
+    @pytest.mark.asyncio
+    async def test_get_candidate_with_history(self, test_client: AsyncClient, sample_interview):
+        """Detail includes interviews, feedback and every change in order"""
+        candidate_id = sample_interview["candidate_id"]
+        await test_client.patch(f"/candidates/{candidate_id}", json={"status": "INTERVIEWING"})
+        feedback_response = await test_client.post(
+            f"/interviews/{sample_interview['id']}/feedback",
+            json={"rating": 4, "comment": "Strong system design"}
+        )
+        
+        response = await test_client.get(f"/candidates/{candidate_id}")
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["id"] == candidate_id
+        assert data["status"] == "INTERVIEWING"
+        assert data["interviews"][0]["id"] == sample_interview["id"]
+        assert data["interviews"][0]["feedback"] == [feedback_response.json()]
+        assert [event["type"] for event in data["timeline"]] == [
+            "CANDIDATE_CREATED", "INTERVIEW_SCHEDULED", "STATUS_CHANGED", "FEEDBACK_ADDED"
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_get_candidate_rebuilds_missing_timeline(self, test_client: AsyncClient, sample_interview, db_session):
+        """Candidates without a stored document get one built from the tables"""
+        from sqlalchemy import delete
+        from app.models.timeline import CandidateTimeline
+        
+        await db_session.execute(delete(CandidateTimeline))
+        await db_session.commit()
+        
+        response = await test_client.get(f"/candidates/{sample_interview['candidate_id']}")
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["interviews"][0]["interviewer"] == sample_interview["interviewer"]
+        assert [event["type"] for event in data["timeline"]] == ["CANDIDATE_CREATED", "INTERVIEW_SCHEDULED"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_rebuilds_keep_one_document(self, sample_candidate, db_session):
+        """A document built by another reader in the meantime is not inserted twice"""
+        from sqlalchemy import delete
+        from app.models.timeline import CandidateTimeline
+        from app.timeline import _rebuild
+
+        await db_session.execute(delete(CandidateTimeline))
+        await db_session.commit()
+
+        candidate_id = uuid.UUID(sample_candidate["id"])
+        first = await _rebuild(db_session, candidate_id)
+        second = await _rebuild(db_session, candidate_id)
+
+        assert first == second
+        assert (await db_session.get(CandidateTimeline, candidate_id)).document == first
+
+    @pytest.mark.asyncio
+    async def test_timestamps_match_across_endpoints(self, test_client: AsyncClient, sample_candidate):
+        """Detail, list and PATCH serialize the same timestamps identically"""
+        candidate_id = sample_candidate["id"]
+        patched = (await test_client.patch(f"/candidates/{candidate_id}", json={"status": "HIRED"})).json()
+
+        detail = (await test_client.get(f"/candidates/{candidate_id}")).json()
+        listed = (await test_client.get("/candidates/")).json()[0]
+
+        for field in ("created_at", "updated_at"):
+            assert detail[field] == listed[field] == patched[field]
+        assert detail["timeline"][-1]["at"] == patched["updated_at"]
+        assert patched["updated_at"].endswith("Z")
+
+    @pytest.mark.asyncio
+    async def test_get_nonexistent_candidate(self, test_client: AsyncClient):
+        """Test getting non-existent candidate"""
+        response = await test_client.get(f"/candidates/{uuid.uuid4()}")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 class TestCandidateStatusUpdate:
     """Test candidate status update endpoint"""
     
@@ -140,6 +219,23 @@ class TestCandidateDeletion:
         response = await test_client.get("/candidates/")
         assert response.json() == []
     
+    @pytest.mark.asyncio
+    async def test_delete_candidate_with_interviews_and_feedback(self, test_client: AsyncClient, sample_interview):
+        """Deleting a candidate removes its interviews, feedback and timeline"""
+        candidate_id = sample_interview["candidate_id"]
+        await test_client.post(
+            f"/interviews/{sample_interview['id']}/feedback",
+            json={"rating": 3, "comment": "Average"}
+        )
+        
+        response = await test_client.delete(f"/candidates/{candidate_id}")
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        
+        response = await test_client.get(f"/candidates/{candidate_id}")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = await test_client.get(f"/interviews/{sample_interview['id']}/feedback")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
     @pytest.mark.asyncio
     async def test_delete_nonexistent_candidate(self, test_client: AsyncClient):
         """Test deleting non-existent candidate"""
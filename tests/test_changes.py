@@ -0,0 +1,98 @@
+"""
+Unit tests for the change log endpoint
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from app import config, db
+from app.changes import compact_changes
+from app.maintenance import jobs, run_job
+from app.models.change import Change
+from tests.conftest import TestSessionLocal, test_engine
+
+
+@pytest.mark.asyncio
+async def test_changes_are_listed_in_commit_order(test_client: AsyncClient, sample_interview):
+    """Every write appears once, in order, with its delta"""
+    await test_client.post(f"/interviews/{sample_interview['id']}/feedback", json={"rating": 4, "comment": "Good"})
+    
+    response = await test_client.get("/changes", params={"since": 0})
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert [change["type"] for change in data["changes"]] == [
+        "candidate.created", "interview.scheduled", "feedback.added"
+    ]
+    assert [change["seq"] for change in data["changes"]] == [1, 2, 3]
+    assert data["changes"][1]["payload"] == sample_interview
+    assert data["next_since"] == 3
+    assert data["has_more"] is False
+
+
+@pytest.mark.asyncio
+async def test_changes_pagination(test_client: AsyncClient, sample_candidate):
+    """A sync resumes from next_since"""
+    for new_status in ["INTERVIEWING", "HIRED"]:
+        await test_client.patch(f"/candidates/{sample_candidate['id']}", json={"status": new_status})
+    
+    first = (await test_client.get("/changes", params={"since": 0, "limit": 2})).json()
+    second = (await test_client.get("/changes", params={"since": first["next_since"], "limit": 2})).json()
+    
+    assert first["has_more"] is True
+    assert [change["seq"] for change in first["changes"]] == [1, 2]
+    assert second["has_more"] is False
+    assert [change["payload"]["status"] for change in second["changes"]] == ["HIRED"]
+    
+    # Nothing new since the last page
+    response = await test_client.get("/changes", params={"since": second["next_since"]})
+    assert response.json() == {"changes": [], "next_since": 3, "has_more": False}
+
+
+@pytest.mark.asyncio
+async def test_failed_writes_leave_no_change(test_client: AsyncClient, sample_candidate_data):
+    """A rejected write does not reach the log"""
+    await test_client.post("/candidates/", json=sample_candidate_data)
+    response = await test_client.post("/candidates/", json=sample_candidate_data)
+    assert response.status_code == 409
+    
+    data = (await test_client.get("/changes")).json()
+    assert len(data["changes"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_compacted_cursor_returns_gone(test_client: AsyncClient, sample_candidate, db_session):
+    """Cursors into the compacted range must resync from a snapshot"""
+    await test_client.patch(f"/candidates/{sample_candidate['id']}", json={"status": "INTERVIEWING"})
+    await test_client.patch(f"/candidates/{sample_candidate['id']}", json={"status": "HIRED"})
+    old = datetime.now(timezone.utc) - timedelta(days=60)
+    await db_session.execute(update(Change).values(created_at=old))
+    await db_session.commit()
+    
+    # The newest change is kept even when it is past retention
+    assert await compact_changes(db_session, retention_days=30) == 2
+    
+    response = await test_client.get("/changes", params={"since": 1})
+    assert response.status_code == 410
+    response = await test_client.get("/changes", params={"since": 2})
+    assert [change["seq"] for change in response.json()["changes"]] == [3]
+
+
+@pytest.mark.asyncio
+async def test_compaction_runs_as_maintenance_job(test_client: AsyncClient, sample_candidate, db_session, monkeypatch):
+    """Long-running processes keep compacting, not only at startup"""
+    await test_client.patch(f"/candidates/{sample_candidate['id']}", json={"status": "HIRED"})
+    old = datetime.now(timezone.utc) - timedelta(days=60)
+    await db_session.execute(update(Change).values(created_at=old))
+    await db_session.commit()
+    monkeypatch.setattr(db, "engine", test_engine)
+    monkeypatch.setattr(db, "async_session_maker", TestSessionLocal)
+    monkeypatch.setattr(config, "CHANGES_RETENTION_DAYS", 30)
+    job = next(job for job in jobs if job.name == "compact_changes")
+    monkeypatch.setattr(job, "results", {})
+
+    await run_job(job)
+
+    assert job.results == {"default": "removed 1 changes"}
@@ -0,0 +1,83 @@
+"""
+Unit tests for response compression
+"""
+import gzip
+
+import pytest
+from httpx import AsyncClient
+
+from app.compression import CompressedBodyCache, choose_encoding, compressed_body_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    compressed_body_cache.clear()
+    yield
+
+
+async def _create_candidates(test_client: AsyncClient, count: int) -> None:
+    for i in range(count):
+        response = await test_client.post(
+            "/candidates/",
+            json={"name": f"Candidate {i}", "email": f"candidate{i}@example.com", "position": "Software Engineer"}
+        )
+        assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_large_listing_is_gzipped(test_client: AsyncClient):
+    """Large JSON responses are compressed and decode to the same data"""
+    await _create_candidates(test_client, 10)
+    
+    response = await test_client.get("/candidates/", headers={"Accept-Encoding": "gzip"})
+    
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert len(response.json()) == 10
+
+
+@pytest.mark.asyncio
+async def test_small_or_unaccepted_responses_are_not_compressed(test_client: AsyncClient):
+    """Bodies under the threshold and clients without gzip get identity"""
+    response = await test_client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    
+    await _create_candidates(test_client, 10)
+    response = await test_client.get("/candidates/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert len(response.json()) == 10
+
+
+@pytest.mark.asyncio
+async def test_repeated_response_is_compressed_once(test_client: AsyncClient):
+    """An unchanged body is served from the compressed-body cache"""
+    await _create_candidates(test_client, 10)
+    
+    for _ in range(3):
+        response = await test_client.get("/candidates/", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+    
+    assert compressed_body_cache.misses == 1
+    assert compressed_body_cache.hits == 2
+
+
+def test_encoding_negotiation():
+    """The server's preferred encoding among those the client accepts wins"""
+    encodings = {"zstd": bytes, "br": bytes, "gzip": bytes}
+    
+    assert choose_encoding("gzip, br", encodings) == "br"
+    assert choose_encoding("gzip, br;q=0", encodings) == "gzip"
+    assert choose_encoding("*", encodings) == "zstd"
+    assert choose_encoding("identity", encodings) is None
+    assert choose_encoding("", encodings) is None
+
+
+def test_cache_evicts_least_recently_used():
+    cache = CompressedBodyCache(max_entries=2)
+    for body in [b"a", b"b", b"a", b"c", b"a"]:
+        assert gzip.decompress(cache.compress(body, "gzip", gzip.compress)) == body
+    
+    assert cache.misses == 3
+    assert cache.hits == 2
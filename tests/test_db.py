@@ -0,0 +1,56 @@
+"""
+Unit tests for database helpers
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.db import make_engine, run_write
+
+
+def _locked_error() -> OperationalError:
+    return OperationalError("COMMIT", {}, Exception("database is locked"))
+
+
+@pytest.mark.asyncio
+async def test_run_write_retries_when_database_is_busy(db_session):
+    """SQLITE_BUSY replays the whole operation"""
+    calls = []
+
+    async def op(session):
+        calls.append(1)
+        if len(calls) < 3:
+            raise _locked_error()
+        return "done"
+
+    assert await run_write(db_session, op) == "done"
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_run_write_does_not_retry_other_errors(db_session):
+    """Errors other than SQLITE_BUSY propagate on the first attempt"""
+    calls = []
+
+    async def op(session):
+        calls.append(1)
+        raise OperationalError("SELECT", {}, Exception("no such table: missing"))
+
+    with pytest.raises(OperationalError):
+        await run_write(db_session, op)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_make_engine_enables_wal_for_file_databases(tmp_path):
+    """File databases get WAL journaling and a busy timeout"""
+    engine = make_engine(f"sqlite+aiosqlite:///{tmp_path}/wal.db")
+    try:
+        async with engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+    finally:
+        await engine.dispose()
+
+    assert journal_mode == "wal"
+    assert busy_timeout > 0
@@ -0,0 +1,71 @@
+"""
+Unit tests for interned interviewer and position names
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app import dimensions
+from app.dimensions import lookup_id, resolve_id
+from app.models.dimension import Interviewer, Position
+from app.models.interview import Interview
+from tests.conftest import TestSessionLocal
+
+
+@pytest.mark.asyncio
+async def test_names_are_stored_once(test_client: AsyncClient, db_session, sample_candidate):
+    """Repeated names share one lookup row and are returned unchanged"""
+    for scheduled_at in ["2025-07-01T09:00:00", "2025-07-02T09:00:00"]:
+        response = await test_client.post(
+            f"/candidates/{sample_candidate['id']}/interviews",
+            json={"interviewer": "Alice Johnson", "scheduled_at": scheduled_at}
+        )
+        assert response.status_code == 201
+        assert response.json()["interviewer"] == "Alice Johnson"
+    
+    interviewers = (await db_session.execute(select(Interviewer))).scalars().all()
+    assert [interviewer.name for interviewer in interviewers] == ["Alice Johnson"]
+    interview_ids = (await db_session.execute(select(Interview.interviewer_id))).scalars().all()
+    assert interview_ids == [interviewers[0].id] * 2
+    
+    response = await test_client.get("/candidates/")
+    assert response.json()[0]["position"] == sample_candidate["position"]
+    assert [interview["interviewer"] for interview in response.json()[0]["interviews"]] == ["Alice Johnson"] * 2
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_ids_are_not_cached(db_session):
+    """An id inserted by a transaction that rolled back is never reused from the cache"""
+    await resolve_id(db_session, Position, "Designer")
+    await db_session.rollback()
+    
+    assert await lookup_id(db_session, Position, "Designer") is None
+    
+    id = await resolve_id(db_session, Position, "Designer")
+    await db_session.commit()
+    assert await lookup_id(db_session, Position, "Designer") == id
+
+
+@pytest.mark.asyncio
+async def test_name_inserted_concurrently_is_reused(db_session, monkeypatch):
+    """Losing the insert race to another request returns the winner's id"""
+    original = dimensions.lookup_id
+    calls = []
+
+    async def lookup_after_other_insert(db, model, name):
+        calls.append(name)
+        if len(calls) == 1:
+            # Another request commits the name between our lookup and insert
+            async with TestSessionLocal() as other:
+                other.add(Position(name=name))
+                await other.commit()
+            return None
+        return await original(db, model, name)
+
+    monkeypatch.setattr(dimensions, "lookup_id", lookup_after_other_insert)
+
+    id = await resolve_id(db_session, Position, "Designer")
+    await db_session.commit()
+
+    positions = (await db_session.execute(select(Position))).scalars().all()
+    assert [(position.id, position.name) for position in positions] == [(id, "Designer")]
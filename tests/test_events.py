@@ -0,0 +1,217 @@
+"""
+Unit tests for the change feed
+"""
+import asyncio
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import config
+from app import db
+from app import existence
+from app.changes import subscribe_changes
+from app.db import apply_schema, make_engine
+from app.dimensions import clear_cache
+from app.events import RESYNC, EventHub, event_hub
+from app.idempotency import response_cache
+from app.main import app
+from app.routers.events import _stream
+
+
+@pytest_asyncio.fixture
+async def file_sessions(tmp_path, monkeypatch):
+    """App sessions on a file database, which the outbox tail reads on its own connections"""
+    engine = make_engine(f"sqlite+aiosqlite:///{tmp_path}/events.db")
+    await apply_schema(engine)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(db, "async_session_maker", session_maker)
+    monkeypatch.setattr(config, "EVENTS_POLL_SECONDS", 0.05)
+    yield session_maker
+    if event_hub.feed is not None:
+        event_hub.feed.cancel()
+    await engine.dispose()
+    clear_cache()
+    existence.clear_cache()
+    response_cache.clear()
+
+
+@pytest_asyncio.fixture
+async def file_client(file_sessions):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest_asyncio.fixture
+async def subscription(file_sessions):
+    """Subscribe to the app's hub for the duration of a test"""
+    subscription = await subscribe_changes(event_hub, file_sessions)
+    yield subscription
+    event_hub.unsubscribe(subscription)
+
+
+def _drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+async def _receive(subscription, count):
+    return [await asyncio.wait_for(subscription.get(), timeout=5) for _ in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_write_routes_publish_events(file_client: AsyncClient, sample_candidate_data, subscription):
+    """Committed writes reach subscribers as small deltas"""
+    response = await file_client.post("/candidates/", json=sample_candidate_data)
+    candidate_id = response.json()["id"]
+    response = await file_client.post(
+        f"/candidates/{candidate_id}/interviews",
+        json={"interviewer": "Alice Johnson", "scheduled_at": "2025-06-30T14:00:00"}
+    )
+    interview_id = response.json()["id"]
+    await file_client.post(f"/interviews/{interview_id}/feedback", json={"rating": 5, "comment": "Great"})
+    await file_client.patch(f"/candidates/{candidate_id}", json={"status": "HIRED"})
+    await file_client.delete(f"/candidates/{candidate_id}")
+    
+    events = await _receive(subscription, 5)
+    
+    assert [event.type for event in events] == [
+        "candidate.created",
+        "interview.scheduled",
+        "feedback.added",
+        "candidate.status_changed",
+        "candidate.deleted",
+    ]
+    assert events[3].data == {
+        "id": candidate_id,
+        "status": "HIRED",
+        "updated_at": events[3].data["updated_at"],
+    }
+    assert [event.id for event in events] == ["1", "2", "3", "4", "5"]
+
+
+@pytest.mark.asyncio
+async def test_failed_writes_publish_nothing(file_client: AsyncClient, subscription):
+    """Only committed changes are published"""
+    response = await file_client.post("/interviews/99999/feedback", json={"rating": 5, "comment": "Great"})
+    
+    assert response.status_code == 404
+    await asyncio.sleep(0.2)
+    assert _drain(subscription) == []
+
+
+@pytest.mark.asyncio
+async def test_other_workers_changes_are_streamed(file_sessions, subscription):
+    """Changes committed outside this process are read from the outbox"""
+    async with file_sessions() as session:
+        # A plain connection, as another worker's commit doesn't wake this one
+        conn = await session.connection()
+        await conn.execute(text(
+            "INSERT INTO changes (type, entity_id, payload, created_at) "
+            "VALUES ('candidate.deleted', 'a', '{\"id\": \"a\"}', CURRENT_TIMESTAMP)"
+        ))
+        await conn.commit()
+
+    events = await _receive(subscription, 1)
+
+    assert [(event.id, event.type, event.data) for event in events] == [("1", "candidate.deleted", {"id": "a"})]
+
+
+@pytest.mark.asyncio
+async def test_resume_on_another_worker_reads_the_outbox(file_client: AsyncClient, file_sessions, sample_candidate_data):
+    """A hub that never saw the client's last event replays from the changes table"""
+    response = await file_client.post("/candidates/", json=sample_candidate_data)
+    candidate_id = response.json()["id"]
+    await file_client.patch(f"/candidates/{candidate_id}", json={"status": "HIRED"})
+    await file_client.delete(f"/candidates/{candidate_id}")
+
+    other_worker = EventHub(history_size=10, buffer_size=10)
+    subscription = await subscribe_changes(other_worker, file_sessions, "1")
+    try:
+        assert [(event.id, event.type) for event in _drain(subscription)] == [
+            ("2", "candidate.status_changed"), ("3", "candidate.deleted")
+        ]
+    finally:
+        other_worker.unsubscribe(subscription)
+        other_worker.feed.cancel()
+
+    # Ids compacted out of the outbox can only resync
+    async with file_sessions() as session:
+        await session.execute(text("DELETE FROM changes WHERE seq < 3"))
+        await session.commit()
+    other_worker = EventHub(history_size=10, buffer_size=10)
+    subscription = await subscribe_changes(other_worker, file_sessions, "1")
+    try:
+        assert [event.type for event in _drain(subscription)] == [RESYNC]
+    finally:
+        other_worker.unsubscribe(subscription)
+        other_worker.feed.cancel()
+
+
+@pytest.mark.asyncio
+async def test_resume_replays_only_missed_events():
+    """A known Last-Event-ID resumes right after that event"""
+    hub = EventHub(history_size=10, buffer_size=10)
+    first = hub.publish(1, "candidate.created", {"id": "a"})
+    hub.publish(2, "candidate.created", {"id": "b"})
+    hub.publish(3, "candidate.deleted", {"id": "a"})
+    
+    events = _drain(hub.subscribe(first.id))
+    
+    assert [event.data["id"] for event in events] == ["b", "a"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_or_expired_event_id_requests_resync():
+    """Malformed ids, ids ahead of the feed or older than the history trigger a resync"""
+    hub = EventHub(history_size=2, buffer_size=10)
+    first = hub.publish(1, "candidate.created", {"id": "a"})
+    for sequence in range(2, 5):
+        hub.publish(sequence, "candidate.created", {"id": "b"})
+    
+    assert [event.type for event in _drain(hub.subscribe(first.id))] == [RESYNC]
+    assert [event.type for event in _drain(hub.subscribe("9"))] == [RESYNC]
+    assert [event.type for event in _drain(hub.subscribe("epoch-3"))] == [RESYNC]
+    assert [event.data for event in _drain(hub.subscribe("3"))] == [{"id": "b"}]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_dropped_with_resync():
+    """A full buffer drops the subscriber instead of blocking publishers"""
+    hub = EventHub(history_size=10, buffer_size=2)
+    slow = hub.subscribe()
+    for index in range(3):
+        last = hub.publish(index + 1, "candidate.created", {"id": str(index)})
+    
+    events = _drain(slow)
+    
+    assert slow.overflowed
+    assert hub.subscriber_count == 0
+    assert [event.type for event in events] == [RESYNC]
+    # Reconnecting from the resync id continues with new events only
+    assert events[0].id == last.id
+
+
+class _ConnectedRequest:
+    async def is_disconnected(self):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_stream_formats_server_sent_events(monkeypatch):
+    """The stream ends after an overflow resync so the client reconnects"""
+    hub = EventHub(history_size=10, buffer_size=1)
+    subscription = hub.subscribe()
+    hub.publish(1, "candidate.created", {"id": "a"})
+    hub.publish(2, "candidate.created", {"id": "b"})
+    
+    monkeypatch.setattr("app.routers.events.event_hub", hub)
+    
+    chunks = [chunk async for chunk in _stream(_ConnectedRequest(), subscription)]
+    
+    assert chunks[0] == "retry: 3000\n\n"
+    assert chunks[1].startswith("id: 2\nevent: resync\n")
@@ -0,0 +1,149 @@
+"""
+Tests for the parent-existence cache of the nested routes
+"""
+import uuid
+from typing import List
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, text
+
+from app import existence
+from app.db import apply_schema, make_engine
+from tests.conftest import test_engine
+
+
+@pytest.fixture
+def parent_lookups():
+    """Statements that look up a candidate or interview by id"""
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT") and ("FROM candidates" in statement or "FROM interviews" in statement):
+            statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_known_parents_skip_the_lookup(test_client: AsyncClient, sample_interview, sample_feedback_data, parent_lookups):
+    candidate_id = sample_interview["candidate_id"]
+
+    response = await test_client.get(f"/candidates/{candidate_id}/interviews")
+    assert len(response.json()) == 1
+    response = await test_client.post(f"/interviews/{sample_interview['id']}/feedback", json=sample_feedback_data)
+    assert response.status_code == 201
+    response = await test_client.get(f"/interviews/{sample_interview['id']}/feedback")
+    assert response.json()[0]["rating"] == 5
+
+    # Only the interview list itself reads the interviews table
+    assert len(parent_lookups) == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_parents_are_remembered(test_client: AsyncClient, sample_candidate, sample_interview_data,
+                                              sample_feedback_data, parent_lookups):
+    for _ in range(3):
+        response = await test_client.get("/interviews/1/feedback")
+        assert response.status_code == 404
+    assert len(parent_lookups) == 1
+
+    # Creating the interview replaces the negative entry
+    response = await test_client.post(f"/candidates/{sample_candidate['id']}/interviews", json=sample_interview_data)
+    assert response.json()["id"] == 1
+    response = await test_client.post("/interviews/1/feedback", json=sample_feedback_data)
+    assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_deleted_candidate_is_evicted(test_client: AsyncClient, sample_interview, sample_feedback_data):
+    candidate_id = sample_interview["candidate_id"]
+    await test_client.delete(f"/candidates/{candidate_id}")
+
+    response = await test_client.get(f"/candidates/{candidate_id}/interviews")
+    assert response.status_code == 404
+    response = await test_client.post(f"/interviews/{sample_interview['id']}/feedback", json=sample_feedback_data)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_foreign_key_catches_a_stale_entry(test_client: AsyncClient, db_session, sample_candidate,
+                                                 sample_interview_data):
+    """A candidate deleted behind the cache's back (another worker) still answers 404"""
+    candidate_id = sample_candidate["id"]
+    response = await test_client.get(f"/candidates/{candidate_id}/interviews")
+    assert response.json() == []
+
+    hex_id = uuid.UUID(candidate_id).hex
+    await db_session.execute(text("DELETE FROM candidate_timelines WHERE candidate_id = :id"), {"id": hex_id})
+    await db_session.execute(text("DELETE FROM candidates WHERE id = :id"), {"id": hex_id})
+    await db_session.commit()
+    await db_session.execute(text("PRAGMA foreign_keys=ON"))
+    try:
+        response = await test_client.post(f"/candidates/{candidate_id}/interviews", json=sample_interview_data)
+        assert response.status_code == 404
+        response = await test_client.get(f"/candidates/{candidate_id}/interviews")
+        assert response.status_code == 404
+    finally:
+        await db_session.execute(text("PRAGMA foreign_keys=OFF"))
+
+
+def test_evicting_a_candidate_drops_only_its_interviews():
+    """Candidate eviction goes through the per-candidate index, not the whole cache"""
+    ann, ben = uuid.uuid4(), uuid.uuid4()
+    for candidate_id in (ann, ben):
+        existence._remember((None, existence.CANDIDATES, candidate_id), True)
+    existence._remember((None, existence.INTERVIEWS, 1), ann)
+    existence._remember((None, existence.INTERVIEWS, 2), ann)
+    existence._remember((None, existence.INTERVIEWS, 3), ben)
+    try:
+        existence._evict((None, existence.CANDIDATES, ann))
+
+        assert set(existence._known) == {(None, existence.CANDIDATES, ben), (None, existence.INTERVIEWS, 3)}
+        assert existence._interviews_of == {(None, existence.CANDIDATES, ben): {(None, existence.INTERVIEWS, 3)}}
+    finally:
+        existence.clear_cache()
+
+
+@pytest.mark.asyncio
+async def test_migrations_run_without_foreign_keys(tmp_path):
+    """Schema changes don't enforce foreign keys, request connections still do"""
+    engine = make_engine(f"sqlite+aiosqlite:///{tmp_path}/fk.db", foreign_keys=True)
+    try:
+        await apply_schema(engine)
+        async with engine.connect() as conn:
+            assert (await conn.exec_driver_sql("PRAGMA foreign_keys")).scalar() == 1
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reused_interview_id_rates_its_new_candidate(test_client: AsyncClient, db_session, sample_interview,
+                                                           sample_feedback_data):
+    """Another worker deleted the cached interview and SQLite gave its id to a new one"""
+    interview_id = sample_interview["id"]
+    response = await test_client.get(f"/interviews/{interview_id}/feedback")
+    assert response.json() == []
+
+    other = (await test_client.post("/candidates/", json={
+        "name": "Jane Roe", "email": "jane.roe@example.com", "position": "Software Engineer"
+    })).json()
+    await db_session.execute(text("DELETE FROM interviews WHERE id = :id"), {"id": interview_id})
+    await db_session.execute(
+        text("INSERT INTO interviews (id, candidate_id, interviewer_id, scheduled_at) "
+             "VALUES (:id, :candidate_id, 1, '2025-07-01 10:00:00')"),
+        {"id": interview_id, "candidate_id": uuid.UUID(other["id"]).hex}
+    )
+    await db_session.commit()
+
+    response = await test_client.post(f"/interviews/{interview_id}/feedback", json=sample_feedback_data)
+    assert response.status_code == 201
+
+    response = await test_client.get("/candidates/ranked", params={"position": "Software Engineer"})
+    assert [(candidate["id"], candidate["rating_count"]) for candidate in response.json()] == [(other["id"], 1)]
+    response = await test_client.get(f"/candidates/{other['id']}")
+    assert response.json()["timeline"][-1]["type"] == "FEEDBACK_ADDED"
+    response = await test_client.get(f"/candidates/{sample_interview['candidate_id']}")
+    assert response.json()["timeline"][-1]["type"] != "FEEDBACK_ADDED"
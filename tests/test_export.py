@@ -0,0 +1,102 @@
+"""
+Tests for columnar exports
+"""
+import csv
+import io
+import subprocess
+import sys
+
+import pytest
+from httpx import AsyncClient
+
+from app import config
+from app.archive import archive_closed_candidates
+
+
+@pytest.mark.asyncio
+async def test_export_candidates_csv(test_client: AsyncClient, sample_candidate, monkeypatch):
+    """Rows are streamed in batches with a single header"""
+    monkeypatch.setattr(config, "EXPORT_BATCH_SIZE", 1)
+    second = await test_client.post("/candidates/", json={
+        "name": "Jane Roe", "email": "jane.roe@example.com", "position": "Designer"
+    })
+    assert second.status_code == 201
+
+    response = await test_client.get("/export/candidates")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="candidates.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["email"] for row in rows] == ["john.doe@example.com", "jane.roe@example.com"]
+    assert rows[0]["id"] == sample_candidate["id"]
+    assert rows[0]["position"] == "Software Engineer"
+    assert rows[0]["status"] == "APPLIED"
+
+
+@pytest.mark.asyncio
+async def test_export_empty_table_has_header(test_client: AsyncClient):
+    response = await test_client.get("/export/feedback")
+
+    assert response.status_code == 200
+    assert response.text.strip() == "id,interview_id,rating,comment"
+
+
+@pytest.mark.asyncio
+async def test_export_interviews_arrow(test_client: AsyncClient, sample_interview):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+
+    response = await test_client.get("/export/interviews", params={"format": "arrow"})
+
+    assert response.status_code == 200
+    table = pyarrow.ipc.open_stream(response.content).read_all()
+    assert table.column_names == ["id", "candidate_id", "interviewer", "scheduled_at", "result"]
+    assert table.column("interviewer").to_pylist() == ["Alice Johnson"]
+    assert table.column("candidate_id").to_pylist() == [sample_interview["candidate_id"]]
+
+
+@pytest.mark.asyncio
+async def test_export_parquet(test_client: AsyncClient, sample_candidate):
+    pytest.importorskip("pyarrow")
+    parquet = pytest.importorskip("pyarrow.parquet")
+
+    response = await test_client.get("/export/candidates", params={"format": "parquet"})
+
+    assert response.status_code == 200
+    table = parquet.read_table(io.BytesIO(response.content))
+    assert table.column("email").to_pylist() == ["john.doe@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_export_format_without_pyarrow(test_client: AsyncClient, monkeypatch):
+    monkeypatch.setattr("app.export._has_pyarrow", lambda: False)
+
+    response = await test_client.get("/export/candidates", params={"format": "parquet"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_includes_archived_candidates(test_client: AsyncClient, db_session, sample_candidate):
+    await test_client.patch(f"/candidates/{sample_candidate['id']}", json={"status": "REJECTED"})
+    assert await archive_closed_candidates(db_session, older_than_days=0) == 1
+
+    response = await test_client.get("/export/candidates")
+    assert list(csv.DictReader(io.StringIO(response.text))) == []
+
+    response = await test_client.get("/export/candidates", params={"include_archived": "true"})
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["id"], row["status"]) for row in rows] == [(sample_candidate["id"], "REJECTED")]
+    # Same timestamp form as the hot rows
+    assert sample_candidate["created_at"].startswith(rows[0]["created_at"])
+    assert "+" not in rows[0]["created_at"]
+
+
+@pytest.mark.asyncio
+async def test_pyarrow_is_imported_on_first_use():
+    """Importing the app doesn't load the optional dependency"""
+    code = "import sys, app.main; print('pyarrow' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,132 @@
+"""
+Unit tests for Idempotency-Key support
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import Response
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import db
+from app import existence
+from app.db import apply_schema, make_engine, run_write
+from app.dimensions import clear_cache
+from app.idempotency import Idempotency, response_cache
+from app.maintenance import jobs, run_job
+from app.models.idempotency import IdempotencyRecord
+from app.models.candidate import Candidate
+from app.models.interview import Interview
+from app.routers.candidates import _insert_candidate
+from app.schemas.candidate import CandidateCreate, CandidateResponseBase
+from tests.conftest import TestSessionLocal, test_engine
+
+
+@pytest.mark.asyncio
+async def test_retry_replays_stored_response(test_client: AsyncClient, db_session, sample_candidate):
+    """A retried POST returns the first response and creates nothing new"""
+    url = f"/candidates/{sample_candidate['id']}/interviews"
+    interview_data = {"interviewer": "Alice Johnson", "scheduled_at": "2025-06-30T14:00:00"}
+    headers = {"Idempotency-Key": "retry-1"}
+    
+    first = await test_client.post(url, json=interview_data, headers=headers)
+    retry = await test_client.post(url, json=interview_data, headers=headers)
+    
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    count = await db_session.scalar(select(func.count()).select_from(Interview))
+    assert count == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_survives_cache_eviction(test_client: AsyncClient, sample_candidate_data):
+    """Stored responses are also found in the database"""
+    headers = {"Idempotency-Key": "retry-2"}
+    first = await test_client.post("/candidates/", json=sample_candidate_data, headers=headers)
+    
+    response_cache.clear()
+    retry = await test_client.post("/candidates/", json=sample_candidate_data, headers=headers)
+    
+    assert retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+
+
+@pytest.mark.asyncio
+async def test_key_reuse_with_different_request_is_rejected(test_client: AsyncClient, sample_candidate_data):
+    headers = {"Idempotency-Key": "retry-3"}
+    await test_client.post("/candidates/", json=sample_candidate_data, headers=headers)
+    
+    other = dict(sample_candidate_data, email="other@example.com")
+    response = await test_client.post("/candidates/", json=other, headers=headers)
+    
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_failed_requests_are_not_stored(test_client: AsyncClient, sample_candidate, sample_candidate_data):
+    """Errors roll back with the write, so a retry runs the handler again"""
+    headers = {"Idempotency-Key": "retry-4"}
+    
+    response = await test_client.post("/candidates/", json=sample_candidate_data, headers=headers)
+    assert response.status_code == 409
+    
+    await test_client.delete(f"/candidates/{sample_candidate['id']}")
+    response = await test_client.post("/candidates/", json=sample_candidate_data, headers=headers)
+    assert response.status_code == 201
+    assert "idempotent-replayed" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_expired_keys_are_purged_by_maintenance(test_client: AsyncClient, db_session, sample_candidate_data, monkeypatch):
+    """The store keeps evicting expired keys while the process runs"""
+    await test_client.post("/candidates/", json=sample_candidate_data, headers={"Idempotency-Key": "old"})
+    old = datetime.now(timezone.utc) - timedelta(days=30)
+    await db_session.execute(update(IdempotencyRecord).values(created_at=old))
+    await db_session.commit()
+    monkeypatch.setattr(db, "engine", test_engine)
+    monkeypatch.setattr(db, "async_session_maker", TestSessionLocal)
+    job = next(job for job in jobs if job.name == "purge_idempotency_keys")
+    monkeypatch.setattr(job, "results", {})
+
+    await run_job(job)
+
+    assert job.results == {"default": "removed 1 keys"}
+    assert await db_session.scalar(select(func.count()).select_from(IdempotencyRecord)) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_with_one_key_write_once(tmp_path, sample_candidate_data):
+    """The second request waits for the first and replays its response"""
+    engine = make_engine(f"sqlite+aiosqlite:///{tmp_path}/idempotency.db")
+    await apply_schema(engine)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    candidate_data = CandidateCreate(**sample_candidate_data)
+    idempotency = Idempotency("concurrent-1", "same-request")
+
+    async def post() -> object:
+        async with session_maker() as session:
+            return await run_write(session, idempotency.wrap(
+                lambda db: _insert_candidate(db, candidate_data), CandidateResponseBase, 201
+            ))
+
+    try:
+        results = await asyncio.gather(post(), post())
+        async with session_maker() as session:
+            count = await session.scalar(select(func.count()).select_from(Candidate))
+    finally:
+        await engine.dispose()
+        clear_cache()
+        existence.clear_cache()
+        response_cache.clear()
+
+    created = [result for result in results if isinstance(result, Candidate)]
+    replayed = [result for result in results if isinstance(result, Response)]
+    assert len(created) == len(replayed) == 1
+    assert replayed[0].status_code == 201
+    assert replayed[0].headers["idempotent-replayed"] == "true"
+    assert count == 1
@@ -0,0 +1,46 @@
+"""
+Unit tests for Interviewer API endpoints
+"""
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_interviewer_schedule(test_client: AsyncClient, sample_candidate):
+    """Only the interviewer's interviews within [from, to) are listed, in order"""
+    for interviewer, scheduled_at in [
+        ("Alice Johnson", "2025-07-08T09:00:00"),
+        ("Alice Johnson", "2025-07-01T09:00:00"),
+        ("Alice Johnson", "2025-07-14T09:00:00"),
+        ("Bob Wilson", "2025-07-02T09:00:00"),
+    ]:
+        response = await test_client.post(
+            f"/candidates/{sample_candidate['id']}/interviews",
+            json={"interviewer": interviewer, "scheduled_at": scheduled_at}
+        )
+        assert response.status_code == 201
+    
+    response = await test_client.get(
+        "/interviewers/Alice Johnson/schedule",
+        params={"from": "2025-07-01T00:00:00", "to": "2025-07-14T09:00:00"}
+    )
+    
+    assert response.status_code == 200
+    assert [interview["scheduled_at"] for interview in response.json()] == [
+        "2025-07-01T09:00:00",
+        "2025-07-08T09:00:00",
+    ]
+    
+    response = await test_client.get("/interviewers/Alice Johnson/schedule")
+    assert len(response.json()) == 3
+
+
+@pytest.mark.asyncio
+async def test_interviewer_schedule_invalid_range(test_client: AsyncClient):
+    """An empty or reversed range is rejected"""
+    response = await test_client.get(
+        "/interviewers/Alice Johnson/schedule",
+        params={"from": "2025-07-08T00:00:00", "to": "2025-07-01T00:00:00"}
+    )
+    
+    assert response.status_code == 400
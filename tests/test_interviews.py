@@ -167,3 +167,30 @@ async def test_schedule_multiple_interviews_same_candidate(test_client: AsyncCli
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 3
+
+
+@pytest.mark.asyncio
+async def test_schedule_interview_double_booking(test_client: AsyncClient, sample_candidate, sample_interview):
+    """An interviewer can't have two overlapping interviews"""
+    response = await test_client.post(
+        f"/candidates/{sample_candidate['id']}/interviews",
+        json={"interviewer": "Alice Johnson", "scheduled_at": "2025-06-30T14:30:00"}
+    )
+    
+    assert response.status_code == 409
+    assert "already booked" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_schedule_interview_adjacent_slots(test_client: AsyncClient, sample_candidate, sample_interview):
+    """Back-to-back interviews and other interviewers don't conflict"""
+    for interview_data in [
+        {"interviewer": "Alice Johnson", "scheduled_at": "2025-06-30T13:00:00"},
+        {"interviewer": "Alice Johnson", "scheduled_at": "2025-06-30T15:00:00"},
+        {"interviewer": "Bob Wilson", "scheduled_at": "2025-06-30T14:00:00"},
+    ]:
+        response = await test_client.post(
+            f"/candidates/{sample_candidate['id']}/interviews",
+            json=interview_data
+        )
+        assert response.status_code == 201
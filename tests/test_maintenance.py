@@ -0,0 +1,127 @@
+"""
+Tests for background database maintenance and the readiness check
+"""
+import os
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app import config, db
+from app.db import make_engine
+from app.main import app
+from app.maintenance import checkpoint, incremental_vacuum, is_maintenance_worker, jobs, run_job
+from app.tenancy import tenant_registry
+
+
+@pytest_asyncio.fixture
+async def churned_engine(tmp_path):
+    """A WAL database with many pages freed by a delete"""
+    engine = make_engine(f"sqlite+aiosqlite:///{tmp_path}/maintain.db")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE t (value TEXT)"))
+        await conn.execute(text(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 500) "
+            "INSERT INTO t SELECT printf('%.2000c', 'x') FROM n"
+        ))
+        await conn.execute(text("DELETE FROM t"))
+    yield engine
+    await engine.dispose()
+
+
+async def _run(engine, task):
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        return await task(conn, engine.url.database)
+
+
+@pytest.mark.asyncio
+async def test_incremental_vacuum_frees_pages(churned_engine, monkeypatch):
+    monkeypatch.setattr(config, "MAINTENANCE_VACUUM_PAGES", 16)
+    monkeypatch.setattr(config, "MAINTENANCE_VACUUM_PAUSE_MS", 0)
+
+    result = await _run(churned_engine, incremental_vacuum)
+
+    assert result.startswith("freed")
+    async with churned_engine.connect() as conn:
+        assert (await conn.exec_driver_sql("PRAGMA freelist_count")).scalar_one() <= 16
+
+
+@pytest.mark.asyncio
+async def test_large_wal_is_truncated(churned_engine, monkeypatch):
+    wal = churned_engine.url.database + "-wal"
+    assert os.path.getsize(wal) > 0
+
+    assert (await _run(churned_engine, checkpoint)).startswith("passive")
+    monkeypatch.setattr(config, "MAINTENANCE_WAL_TRUNCATE_MB", 0)
+    assert (await _run(churned_engine, checkpoint)).startswith("truncate")
+    assert os.path.getsize(wal) == 0
+
+
+@pytest.mark.asyncio
+async def test_optimize_job_records_its_runs(churned_engine, monkeypatch):
+    monkeypatch.setattr(db, "engine", churned_engine)
+    job = next(job for job in jobs if job.name == "optimize")
+    monkeypatch.setattr(job, "results", {})
+    monkeypatch.setattr(job, "runs", 0)
+
+    await run_job(job)
+    await run_job(job)
+
+    assert job.runs == 2
+    assert job.last_error is None
+    assert job.results == {"default": "optimized"}
+
+
+@pytest.mark.asyncio
+async def test_jobs_cover_closed_tenants(churned_engine, tmp_path, monkeypatch):
+    """Tenants no worker has open are opened for the run and closed again"""
+    monkeypatch.setattr(db, "engine", churned_engine)
+    monkeypatch.setattr(config, "TENANCY_ENABLED", True)
+    (tmp_path / "tenants").mkdir()
+    monkeypatch.setattr(tenant_registry, "url_template", f"sqlite+aiosqlite:///{tmp_path}/tenants/{{tenant}}.db")
+    optimize = next(job for job in jobs if job.name == "optimize")
+    wal = next(job for job in jobs if job.name == "checkpoint")
+    for job in (optimize, wal):
+        monkeypatch.setattr(job, "results", {})
+    try:
+        await tenant_registry.create("acme")
+        await tenant_registry.close_all()
+        await tenant_registry.create("globex")
+
+        await run_job(optimize)
+        await run_job(wal)
+
+        assert set(optimize.results) == {"default", "acme", "globex"}
+        assert set(wal.results) == {"default", "globex"}
+        assert tenant_registry.open_tenants == ["globex"]
+    finally:
+        await tenant_registry.close_all()
+
+
+def test_maintenance_worker_is_explicit(monkeypatch):
+    """Plain uvicorn workers don't all run the jobs"""
+    monkeypatch.delenv("APP_WORKER_ID", raising=False)
+    assert not is_maintenance_worker()
+    monkeypatch.setenv("APP_WORKER_ID", "0")
+    assert is_maintenance_worker()
+
+
+@pytest.mark.asyncio
+async def test_readiness(test_client: AsyncClient, monkeypatch):
+    response = await test_client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert response.json()["database"]["reachable"] is True
+    assert [job["name"] for job in response.json()["maintenance"]] == [
+        "checkpoint", "optimize", "vacuum", "archive", "compact_changes", "purge_idempotency_keys"
+    ]
+
+    monkeypatch.setattr(jobs[0], "last_error", "default: disk I/O error")
+    assert (await test_client.get("/ready")).json()["status"] == "degraded"
+
+    monkeypatch.setattr(app.state, "shutting_down", True, raising=False)
+    response = await test_client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "unavailable"
@@ -0,0 +1,168 @@
+"""
+Unit tests for schema migrations
+"""
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import make_engine
+from app.migrations import MIGRATIONS, get_version, prepare_schema
+from app.models import Base
+from app.models.interview import Interview
+
+
+@pytest_asyncio.fixture
+async def file_engine(tmp_path):
+    """A throwaway SQLite file, like a production database"""
+    engine = make_engine(f"sqlite+aiosqlite:///{tmp_path}/migrate.db")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_new_database_is_stamped_with_latest_version(file_engine):
+    """A database created from scratch skips the migration steps"""
+    async with file_engine.begin() as conn:
+        await conn.run_sync(prepare_schema)
+        assert await conn.run_sync(get_version) == len(MIGRATIONS)
+
+
+@pytest.mark.asyncio
+async def test_duplicate_feedback_is_removed_before_unique_index(file_engine):
+    """Existing duplicates are repaired, keeping the first feedback"""
+    async with file_engine.begin() as conn:
+        # Schema as it was before feedback.interview_id became unique
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("DROP INDEX ix_feedback_interview_id"))
+        await conn.execute(text(
+            "INSERT INTO feedback (id, interview_id, rating, comment) VALUES "
+            "(1, 7, 4, 'first'), (2, 7, 2, 'duplicate'), (3, 8, 5, 'other')"
+        ))
+
+    async with file_engine.begin() as conn:
+        await conn.run_sync(prepare_schema)
+
+        rows = (await conn.execute(text("SELECT id FROM feedback ORDER BY id"))).scalars().all()
+        assert rows == [1, 3]
+        assert await conn.run_sync(get_version) == len(MIGRATIONS)
+
+        with pytest.raises(Exception, match="UNIQUE constraint failed"):
+            await conn.execute(text(
+                "INSERT INTO feedback (interview_id, rating, comment) VALUES (7, 1, 'again')"
+            ))
+
+
+@pytest.mark.asyncio
+async def test_interviewer_and_position_names_are_interned(file_engine):
+    """Free-text names are moved into lookup tables without changing the API"""
+    async with file_engine.begin() as conn:
+        # Tables as they were before names were interned
+        await conn.execute(text(
+            "CREATE TABLE candidates (id CHAR(32) PRIMARY KEY, name VARCHAR(100) NOT NULL, "
+            "email VARCHAR(100) NOT NULL UNIQUE, position VARCHAR(100) NOT NULL, status VARCHAR(12), "
+            "created_at DATETIME, updated_at DATETIME)"
+        ))
+        await conn.execute(text(
+            "CREATE TABLE interviews (id INTEGER PRIMARY KEY, candidate_id CHAR(32) NOT NULL "
+            "REFERENCES candidates (id), interviewer VARCHAR(100) NOT NULL, "
+            "scheduled_at DATETIME NOT NULL, result TEXT)"
+        ))
+        await conn.execute(text(
+            "INSERT INTO candidates VALUES "
+            "('aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa', 'Ann', 'ann@example.com', 'Engineer', 'APPLIED', '2025-01-01', '2025-01-01'), "
+            "('bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb', 'Ben', 'ben@example.com', 'Engineer', 'APPLIED', '2025-01-01', '2025-01-01')"
+        ))
+        await conn.execute(text(
+            "INSERT INTO interviews (candidate_id, interviewer, scheduled_at) VALUES "
+            "('aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa', 'Alice', '2025-06-30 14:00:00'), ('bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb', 'Alice', '2025-07-01 14:00:00')"
+        ))
+
+    async with file_engine.begin() as conn:
+        await conn.run_sync(prepare_schema)
+
+        assert (await conn.execute(text("SELECT name FROM positions"))).scalars().all() == ["Engineer"]
+        assert (await conn.execute(text("SELECT name FROM interviewers"))).scalars().all() == ["Alice"]
+        rows = (await conn.execute(text(
+            "SELECT DISTINCT interviewer_id FROM interviews"
+        ))).scalars().all()
+        assert rows == [1]
+        assert await conn.run_sync(get_version) == len(MIGRATIONS)
+
+    async with AsyncSession(file_engine) as session:
+        interviews = (await session.execute(select(Interview).order_by(Interview.id))).scalars().all()
+        assert [interview.interviewer for interview in interviews] == ["Alice", "Alice"]
+
+
+@pytest.mark.asyncio
+async def test_existing_feedback_is_indexed_for_search(file_engine):
+    """The full-text index is created for old databases and filled from existing comments"""
+    async with file_engine.begin() as conn:
+        # Schema as it was before feedback search
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("DROP TABLE feedback_fts"))
+        for trigger in ("insert", "delete", "update"):
+            await conn.execute(text(f"DROP TRIGGER feedback_fts_{trigger}"))
+        await conn.execute(text(
+            "INSERT INTO feedback (interview_id, rating, comment) VALUES (1, 2, 'Weak system design')"
+        ))
+
+    async with file_engine.begin() as conn:
+        await conn.run_sync(prepare_schema)
+
+        rows = (await conn.execute(text(
+            "SELECT rowid FROM feedback_fts WHERE feedback_fts MATCH 'design'"
+        ))).scalars().all()
+        assert rows == [1]
+
+
+@pytest.mark.asyncio
+async def test_candidate_scores_are_backfilled(file_engine):
+    """Existing feedback is summed into the new candidate score columns"""
+    async with file_engine.begin() as conn:
+        # Schema as it was before candidates kept their feedback score
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("DROP INDEX ix_candidates_position_id_avg_rating"))
+        for column in ("rating_sum", "rating_count", "avg_rating"):
+            await conn.execute(text(f"ALTER TABLE candidates DROP COLUMN {column}"))
+        await conn.execute(text(
+            "INSERT INTO candidates (id, name, email, position_id, status, created_at, updated_at) VALUES "
+            "('aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa', 'Ann', 'ann@example.com', 1, 'APPLIED', '2025-01-01', '2025-01-01'), "
+            "('bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb', 'Ben', 'ben@example.com', 1, 'APPLIED', '2025-01-01', '2025-01-01')"
+        ))
+        await conn.execute(text(
+            "INSERT INTO interviews (id, candidate_id, interviewer_id, scheduled_at) VALUES "
+            "(1, 'aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa', 1, '2025-06-30 14:00:00'), "
+            "(2, 'aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa', 1, '2025-07-01 14:00:00')"
+        ))
+        await conn.execute(text(
+            "INSERT INTO feedback (interview_id, rating, comment) VALUES (1, 4, 'Good'), (2, 5, 'Great')"
+        ))
+
+    async with file_engine.begin() as conn:
+        await conn.run_sync(prepare_schema)
+
+        rows = (await conn.execute(text(
+            "SELECT name, rating_sum, rating_count, avg_rating FROM candidates ORDER BY name"
+        ))).all()
+        assert [tuple(row) for row in rows] == [("Ann", 9, 2, 4.5), ("Ben", 0, 0, None)]
+
+
+@pytest.mark.asyncio
+async def test_archived_emails_are_copied_from_documents(file_engine):
+    """Archived candidates get the email column filled from their documents"""
+    async with file_engine.begin() as conn:
+        # Schema as it was before archived emails had their own column
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("DROP INDEX ix_archived_candidates_email"))
+        await conn.execute(text("ALTER TABLE archived_candidates DROP COLUMN email"))
+        await conn.execute(text(
+            "INSERT INTO archived_candidates (candidate_id, status, created_at, archived_at, document) VALUES "
+            "('aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa', 'HIRED', '2025-01-01', '2025-06-01', '{\"email\": \"ann@example.com\"}')"
+        ))
+
+    async with file_engine.begin() as conn:
+        await conn.run_sync(prepare_schema)
+
+        rows = (await conn.execute(text("SELECT email FROM archived_candidates"))).scalars().all()
+        assert rows == ["ann@example.com"]
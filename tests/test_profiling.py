@@ -0,0 +1,108 @@
+"""
+Tests for on-demand request profiling
+"""
+import asyncio
+import time
+
+import pytest
+from httpx import AsyncClient
+
+from app import config
+from app.profiling import AWAIT_FRAME, Profile, ProfilingMiddleware, Sampler, profiles
+
+
+@pytest.fixture
+def profiling(monkeypatch):
+    monkeypatch.setattr(config, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(config, "PROFILING_TOKEN", "secret")
+    monkeypatch.setattr(config, "PROFILING_INTERVAL_MS", 1.0)
+    yield
+    profiles.clear()
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_sampler_follows_the_task_across_awaits():
+    """Running code shows its own frames; suspended code ends in [await]"""
+    async def handler():
+        _busy(0.05)
+        await asyncio.sleep(0.05)
+
+    profile = Profile(method="GET", path="/", interval_ms=1.0)
+    task = asyncio.create_task(handler())
+    sampler = Sampler(task, profile)
+    sampler.start()
+    await task
+    await sampler.stop()
+
+    leaves = {stack[-1][0] for stack in profile.stacks}
+    assert "_busy" in leaves
+    assert AWAIT_FRAME[0] in leaves
+    assert all(stack[0][0] == "handler" for stack in profile.stacks)
+
+
+@pytest.mark.asyncio
+async def test_profile_requested_by_header(test_client: AsyncClient, profiling):
+    token = {"X-Profile-Token": "secret"}
+
+    response = await test_client.get("/candidates/", headers={"X-Profile": "1", **token})
+    profile_id = response.headers["X-Profile-Id"]
+
+    response = await test_client.get("/admin/profiles", headers=token)
+    assert [profile["id"] for profile in response.json()] == [profile_id]
+    assert response.json()[0]["path"] == "/candidates/"
+
+    response = await test_client.get(f"/admin/profiles/{profile_id}", headers=token)
+    assert response.json()["profiles"][0]["type"] == "sampled"
+
+    response = await test_client.get(f"/admin/profiles/{profile_id}", params={"format": "folded"}, headers=token)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+
+@pytest.mark.asyncio
+async def test_profiling_needs_the_token(test_client: AsyncClient, profiling):
+    response = await test_client.get("/candidates/", headers={"X-Profile": "1", "X-Profile-Token": "wrong"})
+    assert "X-Profile-Id" not in response.headers
+
+    response = await test_client.get("/admin/profiles")
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_event_streams_are_not_sampled(profiling, monkeypatch):
+    monkeypatch.setattr(config, "PROFILING_SAMPLE_RATE", 1.0)
+    middleware = ProfilingMiddleware(app=None)
+
+    assert middleware._wanted({"type": "http", "path": "/candidates/", "headers": []})
+    assert not middleware._wanted({"type": "http", "path": "/events", "headers": []})
+
+
+@pytest.mark.asyncio
+async def test_stopping_the_sampler_leaves_the_loop_running(monkeypatch):
+    """Waiting for the sampler thread doesn't block other tasks"""
+    profile = Profile(method="GET", path="/", interval_ms=1.0)
+    sampler = Sampler(asyncio.current_task(), profile)
+    sampler.start()
+    original_join = sampler.join
+    monkeypatch.setattr(sampler, "join", lambda: (time.sleep(0.2), original_join()))
+
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(tick())
+    await sampler.stop()
+    ticker.cancel()
+
+    assert not sampler.is_alive()
+    assert ticks > 5
@@ -0,0 +1,36 @@
+"""
+Tests for the shared statements and compiled-cache statistics
+"""
+import pytest
+from httpx import AsyncClient
+
+from app import queries
+from app.queries import cache_stats, compiled_cache_usage
+from tests.conftest import test_engine
+
+
+@pytest.mark.asyncio
+async def test_in_lists_of_any_length_share_one_compiled_statement(db_session, sample_interview):
+    await db_session.execute(queries.INTERVIEW_IDS_IN, {"interview_ids": [1]})
+    entries, _ = compiled_cache_usage(test_engine.sync_engine)
+    hits = cache_stats["hits"]
+
+    for length in (2, 5, 50):
+        result = await db_session.execute(queries.INTERVIEW_IDS_IN, {"interview_ids": list(range(1, length + 1))})
+        assert result.scalars().all() == [sample_interview["id"]]
+
+    assert compiled_cache_usage(test_engine.sync_engine)[0] == entries
+    assert cache_stats["hits"] == hits + 3
+
+
+@pytest.mark.asyncio
+async def test_query_cache_stats(test_client: AsyncClient, sample_candidate):
+    for _ in range(2):
+        await test_client.get(f"/candidates/{sample_candidate['id']}/interviews")
+
+    response = await test_client.get("/admin/query-cache")
+    stats = response.json()
+    assert stats["entries"] > 0
+    assert stats["capacity"] >= stats["entries"]
+    assert stats["hits"] > 0
+    assert 0 < stats["hit_ratio"] <= 1
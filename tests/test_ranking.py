@@ -0,0 +1,67 @@
+"""
+Tests for candidate ranking by feedback score
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.dialects import sqlite
+
+from app import queries
+
+
+async def _candidate_with_ratings(test_client: AsyncClient, name: str, position: str, ratings: list) -> dict:
+    response = await test_client.post("/candidates/", json={
+        "name": name,
+        "email": f"{name.lower()}@example.com",
+        "position": position
+    })
+    candidate = response.json()
+    for day, rating in enumerate(ratings, start=1):
+        response = await test_client.post(f"/candidates/{candidate['id']}/interviews", json={
+            "interviewer": f"{name} interviewer {day}",
+            "scheduled_at": f"2025-07-0{day}T10:00:00"
+        })
+        response = await test_client.post(f"/interviews/{response.json()['id']}/feedback", json={
+            "rating": rating,
+            "comment": "Ranked"
+        })
+        assert response.status_code == 201
+    return candidate
+
+
+@pytest.mark.asyncio
+async def test_ranked_by_average_then_count(test_client: AsyncClient):
+    single = await _candidate_with_ratings(test_client, "Single", "Engineer", [5])
+    mixed = await _candidate_with_ratings(test_client, "Mixed", "Engineer", [4, 5])
+    best = await _candidate_with_ratings(test_client, "Best", "Engineer", [5, 5])
+    await _candidate_with_ratings(test_client, "Unrated", "Engineer", [])
+    await _candidate_with_ratings(test_client, "Other", "Designer", [5, 5, 5])
+
+    response = await test_client.get("/candidates/ranked", params={"position": "Engineer"})
+    assert response.status_code == 200
+    ranked = response.json()
+    assert [candidate["id"] for candidate in ranked] == [best["id"], single["id"], mixed["id"]]
+    assert (ranked[2]["avg_rating"], ranked[2]["rating_count"]) == (4.5, 2)
+
+    response = await test_client.get("/candidates/ranked", params={"position": "Engineer", "limit": 1})
+    assert [candidate["id"] for candidate in response.json()] == [best["id"]]
+
+    response = await test_client.get("/candidates/ranked", params={"position": "Nobody"})
+    assert response.json() == []
+
+    # A new score is not a status change
+    response = await test_client.get(f"/candidates/{best['id']}")
+    assert response.json()["updated_at"] == best["updated_at"]
+
+
+@pytest.mark.asyncio
+async def test_ranking_reads_the_index_in_order(db_session):
+    compiled = queries.RANKED_CANDIDATES.compile(dialect=sqlite.dialect())
+    params = compiled.construct_params({"position_id": 1, "limit": 10})
+    conn = await db_session.connection()
+    result = await conn.exec_driver_sql(
+        "EXPLAIN QUERY PLAN " + str(compiled), tuple(params[name] for name in compiled.positiontup)
+    )
+    plan = " ".join(row[3] for row in result)
+
+    assert "USING INDEX ix_candidates_position_id_avg_rating" in plan
+    assert "TEMP B-TREE" not in plan
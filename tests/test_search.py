@@ -0,0 +1,87 @@
+"""
+Tests for full-text feedback search
+"""
+import sqlite3
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.exc import OperationalError
+
+
+@pytest_asyncio.fixture
+async def reviewed_interviews(test_client: AsyncClient):
+    """Three candidates, each with one interview and one feedback"""
+    reviews = [
+        (2, "Struggled with system design, scaling questions and the coding exercise"),
+        (1, "Weak system design; system design needs work"),
+        (5, "Excellent system design, clear communication"),
+    ]
+    hits = []
+    for number, (rating, comment) in enumerate(reviews):
+        candidate = (await test_client.post("/candidates/", json={
+            "name": f"Candidate {number}", "email": f"candidate{number}@example.com", "position": "Engineer"
+        })).json()
+        interview = (await test_client.post(f"/candidates/{candidate['id']}/interviews", json={
+            "interviewer": "Alice Johnson", "scheduled_at": f"2025-07-0{number + 1}T10:00:00"
+        })).json()
+        feedback = (await test_client.post(f"/interviews/{interview['id']}/feedback", json={
+            "rating": rating, "comment": comment
+        })).json()
+        hits.append({**feedback, "candidate_id": candidate["id"]})
+    return hits
+
+
+@pytest.mark.asyncio
+async def test_search_filters_by_rating_and_ranks(test_client: AsyncClient, reviewed_interviews):
+    response = await test_client.get("/feedback/search", params={"q": '"system design"', "max_rating": 2})
+
+    assert response.status_code == 200
+    hits = response.json()["hits"]
+    # The comment that mentions the phrase twice ranks first
+    assert [hit["id"] for hit in hits] == [reviewed_interviews[1]["id"], reviewed_interviews[0]["id"]]
+    assert hits[0]["candidate_id"] == reviewed_interviews[1]["candidate_id"]
+    assert hits[0]["snippet"] == "Weak [system design]; [system design] needs work"
+    assert response.json()["next_offset"] is None
+
+
+@pytest.mark.asyncio
+async def test_search_pages(test_client: AsyncClient, reviewed_interviews):
+    first = (await test_client.get("/feedback/search", params={"q": "designs", "limit": 2})).json()
+    assert len(first["hits"]) == 2
+    assert first["next_offset"] == 2
+
+    second = (await test_client.get("/feedback/search", params={"q": "designs", "limit": 2, "offset": 2})).json()
+    assert len(second["hits"]) == 1
+    assert second["next_offset"] is None
+
+
+@pytest.mark.asyncio
+async def test_deleted_feedback_leaves_the_index(test_client: AsyncClient, reviewed_interviews):
+    await test_client.delete(f"/candidates/{reviewed_interviews[2]['candidate_id']}")
+
+    response = await test_client.get("/feedback/search", params={"q": "excellent"})
+
+    assert response.json()["hits"] == []
+
+
+@pytest.mark.asyncio
+async def test_invalid_search_query(test_client: AsyncClient):
+    for q in ('"unbalanced', "design AND", "foo:bar"):
+        response = await test_client.get("/feedback/search", params={"q": q})
+        assert response.status_code == 400
+
+    response = await test_client.get("/feedback/search", params={"q": "design", "min_rating": 4, "max_rating": 2})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_database_errors_are_not_blamed_on_the_query(test_client: AsyncClient, db_session, monkeypatch):
+    """Only a malformed MATCH expression is a 400; other failures propagate"""
+    async def fail(*args, **kwargs):
+        raise OperationalError("SELECT", {}, sqlite3.OperationalError("disk I/O error"))
+
+    monkeypatch.setattr(db_session, "execute", fail)
+
+    with pytest.raises(OperationalError):
+        await test_client.get("/feedback/search", params={"q": "design"})
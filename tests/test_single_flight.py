@@ -0,0 +1,61 @@
+"""
+Unit tests for coalescing of concurrent identical reads
+"""
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.single_flight import SingleFlight, read_flights
+
+
+@pytest.mark.asyncio
+async def test_concurrent_listings_share_one_execution(test_client: AsyncClient, sample_interview):
+    """A burst of identical GET /candidates runs the queries once"""
+    executions = read_flights.executions
+    
+    responses = await asyncio.gather(*[test_client.get("/candidates/") for _ in range(20)])
+    
+    assert all(response.status_code == 200 for response in responses)
+    assert len({response.content for response in responses}) == 1
+    assert responses[0].json()[0]["interviews"][0]["id"] == sample_interview["id"]
+    assert read_flights.executions - executions < 20
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_not_cached():
+    """Waiting callers get the leader's error; the next call runs again"""
+    flights = SingleFlight()
+    calls = 0
+    
+    async def fail():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+    
+    results = await asyncio.gather(*[flights.do("key", fail) for _ in range(3)], return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert calls == 1
+    
+    with pytest.raises(ValueError):
+        await flights.do("key", fail)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_waiters_take_over_when_leader_is_cancelled():
+    flights = SingleFlight()
+    
+    async def compute():
+        await asyncio.sleep(0.01)
+        return "result"
+    
+    leader = asyncio.create_task(flights.do("key", compute))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do("key", compute))
+    await asyncio.sleep(0)
+    leader.cancel()
+    
+    assert await follower == "result"
+    assert flights.executions == 2
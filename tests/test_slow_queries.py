@@ -0,0 +1,38 @@
+"""
+Tests for the slow-query log
+"""
+import pytest
+from httpx import AsyncClient
+
+from app import config
+from app.slow_queries import normalize, stats
+
+
+@pytest.fixture
+def log_every_query(monkeypatch):
+    monkeypatch.setattr(config, "SLOW_QUERY_MS", 0.0)
+    stats.clear()
+    yield
+    stats.clear()
+
+
+def test_normalize_folds_in_lists():
+    assert normalize("SELECT a\n  FROM t WHERE id IN (?, ?,?)") == "SELECT a FROM t WHERE id IN (?, ...)"
+    assert normalize("SELECT a FROM t WHERE id IN (?)") == "SELECT a FROM t WHERE id IN (?, ...)"
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_grouped_with_plans(test_client: AsyncClient, sample_candidate, log_every_query):
+    for _ in range(2):
+        await test_client.get("/interviews", params={"candidate_id": sample_candidate["id"]})
+
+    response = await test_client.get("/admin/slow-queries", params={"limit": 200})
+
+    assert response.status_code == 200
+    queries = {query["statement"]: query for query in response.json()}
+    lookup = next(query for statement, query in queries.items()
+                  if statement.startswith("SELECT candidates.id") and "IN (?, ...)" in statement)
+    assert lookup["count"] == 2
+    assert lookup["routes"] == {"GET /interviews": 2}
+    assert lookup["last_parameters"] == ["<str>"]
+    assert any("candidates" in line for line in lookup["plan"])
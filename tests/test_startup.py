@@ -0,0 +1,33 @@
+"""
+Unit tests for process warm-up
+"""
+from fastapi import FastAPI
+from sqlalchemy.orm import Mapper
+from sqlalchemy import inspect
+
+from app.main import app
+from app.models.candidate import Candidate
+from app.schemas import build_all_schemas, iter_schema_models
+from app.schemas.candidate import CandidateResponse
+from app.warmup import warm_up
+
+
+def test_build_all_schemas_covers_response_models():
+    """All schema modules are discovered and built"""
+    models = list(iter_schema_models())
+
+    assert CandidateResponse in models
+    assert build_all_schemas() == len(models)
+    assert all(model.__pydantic_complete__ for model in models)
+
+
+def test_warm_up_configures_mappers_and_caches_openapi():
+    """Warm-up leaves nothing lazy for the first request"""
+    application = FastAPI(routes=app.routes)
+    assert application.openapi_schema is None
+
+    warm_up(application)
+
+    mapper: Mapper = inspect(Candidate)
+    assert mapper.configured
+    assert "/candidates/" in application.openapi_schema["paths"]
@@ -0,0 +1,197 @@
+"""
+Tests for per-tenant databases
+"""
+import asyncio
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import config
+from app import existence
+from app.dimensions import clear_cache
+from app.events import existing_hub, hub_for
+from app.idempotency import response_cache
+from app.main import app
+from app.tenancy import tenant_registry
+
+
+@pytest_asyncio.fixture
+async def tenant_client(tmp_path, monkeypatch):
+    """Client whose requests go through the real per-tenant session factories"""
+    monkeypatch.setattr(config, "TENANCY_ENABLED", True)
+    monkeypatch.setattr(tenant_registry, "url_template", f"sqlite+aiosqlite:///{tmp_path}/{{tenant}}.db")
+    monkeypatch.setattr(tenant_registry, "allowed", {"acme", "globex"})
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+    await tenant_registry.close_all()
+    clear_cache()
+    existence.clear_cache()
+    response_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_tenants_have_separate_databases(tenant_client: AsyncClient, sample_candidate_data):
+    """The header and the path prefix select the same tenant"""
+    response = await tenant_client.post(
+        "/candidates/", json=sample_candidate_data, headers={"X-Tenant-ID": "acme"}
+    )
+    assert response.status_code == 201
+
+    response = await tenant_client.get("/t/acme/candidates/")
+    assert [candidate["email"] for candidate in response.json()] == [sample_candidate_data["email"]]
+
+    response = await tenant_client.get("/t/globex/candidates/")
+    assert response.status_code == 200
+    assert response.json() == []
+
+    # The same email is free in another tenant's database
+    response = await tenant_client.post("/t/globex/candidates/", json=sample_candidate_data)
+    assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_invalid_tenant_is_rejected(tenant_client: AsyncClient):
+    response = await tenant_client.get("/candidates/", headers={"X-Tenant-ID": "../etc"})
+    assert response.status_code == 400
+
+    response = await tenant_client.get("/t/acme/candidates/", headers={"X-Tenant-ID": "globex"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_unknown_tenant_is_not_created(tenant_client: AsyncClient, tmp_path, admin_headers):
+    """Tenants off the allowlist need an admin to create them"""
+    response = await tenant_client.get("/t/initech/candidates/")
+    assert response.status_code == 404
+    assert not (tmp_path / "initech.db").exists()
+
+    response = await tenant_client.post("/admin/tenants/initech")
+    assert response.status_code == 403
+
+    response = await tenant_client.post("/admin/tenants/initech", headers=admin_headers)
+    assert response.status_code == 201
+    assert response.json() == {"tenant": "initech", "open": True, "candidates": 0, "interviews": 0}
+
+    # Its file is enough once the engine has been closed
+    await tenant_registry.close_all()
+    response = await tenant_client.get("/t/initech/candidates/")
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_idle_engines_are_evicted(tenant_client: AsyncClient, sample_candidate_data, monkeypatch, admin_headers):
+    """Evicted tenants are still counted by the fan-out, which leaves the open ones in place"""
+    monkeypatch.setattr(tenant_registry, "max_open", 1)
+
+    await tenant_client.post("/t/acme/candidates/", json=sample_candidate_data)
+    await tenant_client.get("/t/globex/candidates/")
+    assert tenant_registry.open_tenants == ["globex"]
+
+    response = await tenant_client.get("/t/globex/admin/tenants")
+    assert response.status_code == 403
+
+    response = await tenant_client.get("/t/globex/admin/tenants", headers=admin_headers)
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"tenant": "acme", "open": False, "candidates": 1, "interviews": 0},
+        {"tenant": "globex", "open": True, "candidates": 0, "interviews": 0},
+    ]
+    assert tenant_registry.open_tenants == ["globex"]
+
+
+@pytest.mark.asyncio
+async def test_engines_in_use_are_not_evicted(tmp_path, monkeypatch):
+    """An engine with a checked-out connection outlives its place in the LRU"""
+    monkeypatch.setattr(tenant_registry, "url_template", f"sqlite+aiosqlite:///{tmp_path}/{{tenant}}.db")
+    monkeypatch.setattr(tenant_registry, "max_open", 1)
+    try:
+        acme = await tenant_registry.create("acme")
+        async with acme.session_maker() as session:
+            await session.execute(text("SELECT 1"))
+            await tenant_registry.create("globex")
+            assert tenant_registry.open_tenants == ["acme", "globex"]
+            assert (await session.execute(text("SELECT count(*) FROM candidates"))).scalar() == 0
+
+        await tenant_registry.get("globex")
+        assert tenant_registry.open_tenants == ["globex"]
+    finally:
+        await tenant_registry.close_all()
+
+
+@pytest.mark.asyncio
+async def test_held_engines_are_not_evicted(tmp_path, monkeypatch):
+    """A request holds its database before it checks out a connection"""
+    monkeypatch.setattr(tenant_registry, "url_template", f"sqlite+aiosqlite:///{tmp_path}/{{tenant}}.db")
+    monkeypatch.setattr(tenant_registry, "allowed", {"acme", "globex"})
+    monkeypatch.setattr(tenant_registry, "max_open", 1)
+    try:
+        async with tenant_registry.using("acme") as acme:
+            await tenant_registry.get("globex")
+            assert tenant_registry.open_tenants == ["acme", "globex"]
+            async with acme.session_maker() as session:
+                assert (await session.execute(text("SELECT count(*) FROM candidates"))).scalar() == 0
+
+        await tenant_registry.get("globex")
+        assert tenant_registry.open_tenants == ["globex"]
+    finally:
+        await tenant_registry.close_all()
+
+
+@pytest.mark.asyncio
+async def test_fan_out_migrates_closed_tenants(tenant_client: AsyncClient, tmp_path, admin_headers):
+    """A tenant file from an older schema is migrated before it is counted"""
+    await tenant_client.post("/admin/tenants/acme", headers=admin_headers)
+    await tenant_registry.close_all()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/acme.db")
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP INDEX ix_archived_candidates_email"))
+        await conn.execute(text("ALTER TABLE archived_candidates DROP COLUMN email"))
+        await conn.execute(text("PRAGMA user_version = 5"))
+
+    response = await tenant_client.get("/admin/tenants", headers=admin_headers)
+
+    assert response.status_code == 200
+    assert response.json() == [{"tenant": "acme", "open": False, "candidates": 0, "interviews": 0}]
+    async with engine.connect() as conn:
+        assert (await conn.execute(text("PRAGMA user_version"))).scalar() == 6
+        columns = await conn.execute(text("SELECT name FROM pragma_table_info('archived_candidates')"))
+        assert "email" in columns.scalars().all()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_tenants_open_concurrently(tmp_path, monkeypatch):
+    """A slow schema setup of one tenant doesn't hold up opening another"""
+    monkeypatch.setattr(tenant_registry, "url_template", f"sqlite+aiosqlite:///{tmp_path}/{{tenant}}.db")
+    opened = []
+    slow_started = asyncio.Event()
+    release = asyncio.Event()
+    original = tenant_registry._open_database
+
+    async def open_database(tenant):
+        if tenant == "slow":
+            slow_started.set()
+            await release.wait()
+        database = await original(tenant)
+        opened.append(tenant)
+        return database
+
+    monkeypatch.setattr(tenant_registry, "_open_database", open_database)
+    try:
+        slow = asyncio.create_task(tenant_registry.create("slow"))
+        await slow_started.wait()
+        await asyncio.wait_for(tenant_registry.create("fast"), timeout=5)
+        assert opened == ["fast"]
+
+        release.set()
+        await slow
+        assert opened == ["fast", "slow"]
+    finally:
+        release.set()
+        await tenant_registry.close_all()
@@ -0,0 +1,60 @@
+"""
+Unit tests for the group-commit write queue
+"""
+import asyncio
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.main import app
+from app.write_queue import WriteQueue, get_write_queue
+from tests.conftest import TestSessionLocal
+
+
+@pytest_asyncio.fixture
+async def write_queue(test_client):
+    """Route interview and feedback inserts through a group-commit queue"""
+    queue = WriteQueue(TestSessionLocal, window_seconds=0.01, max_batch=50)
+    app.dependency_overrides[get_write_queue] = lambda: queue
+    yield queue
+    await queue.drain()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_interviews_share_one_commit(test_client: AsyncClient, sample_candidate, write_queue):
+    """Concurrent inserts are committed together and each gets its own row"""
+    responses = await asyncio.gather(*[
+        test_client.post(
+            f"/candidates/{sample_candidate['id']}/interviews",
+            json={"interviewer": f"Interviewer {i}", "scheduled_at": f"2025-07-01T{10 + i}:00:00"}
+        )
+        for i in range(5)
+    ])
+
+    assert [response.status_code for response in responses] == [201] * 5
+    assert len({response.json()["id"] for response in responses}) == 5
+    assert write_queue.operations == 5
+    assert write_queue.batches == 1
+
+    response = await test_client.get(f"/candidates/{sample_candidate['id']}/interviews")
+    assert len(response.json()) == 5
+
+
+@pytest.mark.asyncio
+async def test_errors_stay_with_their_own_request(test_client: AsyncClient, sample_interview, write_queue):
+    """A 409 or 404 in a batch does not fail the other operations"""
+    feedback_data = {"rating": 4, "comment": "Solid"}
+    first, second, missing = await asyncio.gather(
+        test_client.post(f"/interviews/{sample_interview['id']}/feedback", json=feedback_data),
+        test_client.post(f"/interviews/{sample_interview['id']}/feedback", json=feedback_data),
+        test_client.post("/interviews/99999/feedback", json=feedback_data),
+    )
+
+    # Whichever reaches the queue first wins; the other gets its own 409
+    assert sorted([first.status_code, second.status_code]) == [201, 409]
+    assert missing.status_code == 404
+    assert write_queue.batches == 1
+
+    response = await test_client.get(f"/interviews/{sample_interview['id']}/feedback")
+    assert len(response.json()) == 1